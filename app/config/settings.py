@@ -1,11 +1,12 @@
 from functools import lru_cache
-from typing import Literal
+from typing import Literal, Optional
 
 from enum import Enum
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-VectorStoreTypes = Literal["chroma", "pinecone", "qdrant"]
+VectorStoreTypes = Literal["chroma", "numpy", "pinecone", "qdrant"]
+ChunkerTypes = Literal["recursive", "sentence"]
 
 
 class ZoteroLibraryType(str, Enum):
@@ -20,6 +21,14 @@ class Settings(BaseSettings):
     vector_store_type: VectorStoreTypes = "chroma"
     chroma_collection: str = "readings"
     chroma_persist_dir: str = "/home/tg/Development/semantics/chroma_db"
+    chroma_upsert_batch_size: int = 1000
+    numpy_store_dir: str = "./data/numpy_store"
+    numpy_quantization: Optional[Literal["int8", "binary"]] = None
+    numpy_rescore_multiplier: int = 10
+    qdrant_path: str = "./data/qdrant"  # embedded on-disk mode
+    qdrant_url: Optional[str] = None  # use a Qdrant server instead of qdrant_path
+    qdrant_upsert_batch_size: int = 256
+    qdrant_quantization: Optional[Literal["int8", "binary"]] = None
 
     qwen_api_key: str
     qwen_api_endpoint: str = "https://dashscope-intl.aliyuncs.com/compatible-mode/v1"
@@ -34,24 +43,41 @@ class Settings(BaseSettings):
     zotero_api_key: str
     zotero_library_id: str
     zotero_library_type: ZoteroLibraryType = ZoteroLibraryType.user
+    zotero_cache_ttl: int = 24 * 60 * 60  # seconds
 
     # Embedding Services
     embedding_adaptor: str = "qwen"
     embedding_batch_size: int = 32
     embedding_max_retries: int = 3
     embedding_timeout: int = 60
+    embedding_max_concurrency: int = 8
+    embedding_requests_per_minute: int = 1200
+    embedding_tokens_per_minute: int = 1_000_000
+    embedding_cache_enabled: bool = True
+    embedding_cache_max_bytes: int = 256 * 1024 * 1024
+
+    # Search
+    query_cache_size: int = 1024
+    query_cache_ttl: Optional[int] = None  # seconds, None keeps entries until evicted
+    hybrid_search_enabled: bool = False
+    hybrid_candidates: int = 50  # results taken from each ranking before fusion
+    rrf_k: int = 60
 
     # Processing Parameters
     chunk_size: int = 1000
     chunk_overlap: int = 100
+    chunker: ChunkerTypes = "recursive"  # "sentence": native single-pass chunker
+    conversion_workers: Optional[int] = None  # default: one per CPU core
+    pdf_pages_per_task: int = 50
+    conversion_cache_enabled: bool = True
+    ingestion_window_size: int = 64  # chunks embedded and upserted together
+    ingestion_queue_size: int = 2  # windows buffered between pipeline stages
+    ingestion_workers: int = 4  # items fetched, chunked and embedded concurrently
 
-    database_url: str = "sqlite:///./data/app."
+    database_url: str = "sqlite:///./data/app.db"
 
 
 @lru_cache(maxsize=None)
 def get_settings() -> Settings:
     """Singleton configuration loader using LRU cache."""
     return Settings()
-
-
-settings = get_settings()
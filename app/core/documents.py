@@ -1,15 +1,10 @@
+import re
+import struct
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
 from hashlib import sha256
-from pydantic import (
-    BaseModel,
-    Field,
-    ValidationInfo,
-    field_validator,
-    ConfigDict,
-    PrivateAttr,
-)
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Set
 
 
 @dataclass(frozen=True)
@@ -28,29 +23,135 @@ class DocumentMetadata:
     language: str = "en"
 
 
-class DocumentChunk(BaseModel):
-    content: str = Field(..., min_length=1)
-    embedding: List[float] = Field(..., min_length=500)
+@dataclass(frozen=True)
+class ChunkDraft:
+    """Chunk produced by a document processor, before it has been embedded."""
+
+    content: str
     metadata: DocumentMetadata
-    source_id: str = Field(..., pattern=r"[A-Za-z0-9_-]+")
-    created_at: datetime = Field(default_factory=datetime.now)
+    source_id: str
+
+    @property
+    def content_hash(self) -> str:
+        return sha256(self.content.encode()).hexdigest()
 
-    _content_hash: str = PrivateAttr()
+    @property
+    def chunk_id(self) -> str:
+        return chunk_id(self.source_id, self.content)
 
-    # optimizations for higher performace
-    model_config = ConfigDict(
-        extra="forbid",
-        validate_default=True,
-        arbitrary_types_allowed=True,
-    )
+    def to_chunk(self, embedding: Sequence[float]) -> "DocumentChunk":
+        """Attach an embedding the caller has already checked.
 
-    def __init__(self, **data):
-        """
-        Custom initialization to automatically compute and set the internal content_hash.
+        Drafts come out of a document processor with validated content and
+        metadata, so the chunk is built through the trusted path.
         """
-        super().__init__(**data)
+        return DocumentChunk.trusted(
+            content=self.content,
+            embedding=embedding,
+            metadata=self.metadata,
+            source_id=self.source_id,
+        )
+
+
+def chunk_id(source_id: str, content: str) -> str:
+    """sha256 of the source id and the chunk text; a hex digest like `content_hash`."""
+    return sha256(f"{source_id}\0{content}".encode()).hexdigest()
+
+
+def _as_float32(values: Sequence[float]) -> array:
+    """Copy `values` into a float32 array.
+
+    Packing through `struct` converts a list of floats about twice as fast as
+    `array("f", values)`, which converts element by element.
+    """
+    if isinstance(values, array) and values.typecode == "f":
+        return values
+    packed = array("f")
+    packed.frombytes(struct.pack(f"{len(values)}f", *values))
+    return packed
+
+
+class DocumentChunk:
+    """Embedded chunk ready for storage.
+
+    The embedding is kept in a contiguous float32 `array` (4 bytes per
+    dimension instead of a boxed Python float), and `__slots__` drops the
+    per-instance dict. The constructor validates its input; `trusted` skips
+    validation for data that has already been checked.
+    """
+
+    __slots__ = (
+        "content",
+        "_embedding",
+        "metadata",
+        "source_id",
+        "created_at",
+        "_content_hash",
+        "_chunk_id",
+    )
+
+    MIN_EMBEDDING_DIMENSION = 500
+    SOURCE_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+    def __init__(
+        self,
+        content: str,
+        embedding: Sequence[float],
+        metadata: DocumentMetadata,
+        source_id: str,
+        created_at: Optional[datetime] = None,
+    ):
+        if not isinstance(content, str) or not content:
+            raise ValueError("Chunk content must be a non-empty string")
+        if len(embedding) < self.MIN_EMBEDDING_DIMENSION:
+            raise ValueError(
+                f"Chunk embedding must have at least {self.MIN_EMBEDDING_DIMENSION} dimensions, got {len(embedding)}"
+            )
+        if not isinstance(metadata, DocumentMetadata):
+            raise ValueError("Chunk metadata must be a DocumentMetadata")
+        if not isinstance(source_id, str) or not self.SOURCE_ID_PATTERN.search(
+            source_id
+        ):
+            raise ValueError(f"Invalid chunk source_id: {source_id!r}")
+
+        self.content = content
+        self.embedding = embedding
+        self.metadata = metadata
+        self.source_id = source_id
+        self.created_at = created_at or datetime.now()
         # Compute content_hash automatically and set to the private attribute
-        self._content_hash = sha256(self.content.encode()).hexdigest()
+        self._content_hash = sha256(content.encode()).hexdigest()
+        self._chunk_id = chunk_id(source_id, content)
+
+    @classmethod
+    def trusted(
+        cls,
+        content: str,
+        embedding: Sequence[float],
+        metadata: DocumentMetadata,
+        source_id: str,
+        created_at: Optional[datetime] = None,
+        content_hash: Optional[str] = None,
+    ) -> "DocumentChunk":
+        """Build a chunk from already-validated data without re-checking it."""
+        chunk = cls.__new__(cls)
+        chunk.content = content
+        chunk._embedding = _as_float32(embedding)
+        chunk.metadata = metadata
+        chunk.source_id = source_id
+        chunk.created_at = created_at or datetime.now()
+        chunk._content_hash = content_hash or sha256(content.encode()).hexdigest()
+        chunk._chunk_id = chunk_id(source_id, content)
+        return chunk
+
+    @property
+    def embedding(self) -> array:
+        """float32 embedding buffer; supports len(), indexing and the buffer protocol."""
+        return self._embedding
+
+    @embedding.setter
+    def embedding(self, value: Sequence[float]) -> None:
+        self._embedding = _as_float32(value)
 
     @property
     def content_hash(self) -> str:
@@ -59,27 +160,88 @@ class DocumentChunk(BaseModel):
         """
         return self._content_hash
 
-    @field_validator("source_id")
-    def validate_chunk_source_ids(cls, v, values: ValidationInfo):
-        """Validate that source_id matches parent document's ID"""
+    @property
+    def chunk_id(self) -> str:
+        """Id of the chunk in the vector stores, unique per source item.
 
-        parent_source_id = values.data.get("source_id")
-        if parent_source_id and v != parent_source_id:
-            raise ValueError(
-                f"Chunk source_id {v} mismatch with parent {parent_source_id}"
-            )
-        return v
+        Unlike `content_hash`, it includes `source_id`, so two items that share
+        a passage each keep their own copy and can be pruned independently.
+        """
+        return self._chunk_id
+
+    def __repr__(self) -> str:
+        return (
+            f"DocumentChunk(source_id={self.source_id!r}, content_hash={self._content_hash[:12]!r}, "
+            f"content={self.content[:50]!r}, dimensions={len(self._embedding)})"
+        )
 
 
 @dataclass
-class ProcessedDocument:
-    source_id: str = Field(..., pattern=r"[A-Za-z0-9_-]+")
-    chunks: List[DocumentChunk] = Field(..., min_length=1)
-    processed_at: datetime = Field(default_factory=datetime.now)
-
-    @field_validator("chunks")
-    def validate_chunk_source_ids(cls, v, values: ValidationInfo):
-        source_id = values.data.get("source_id")
-        if any(chunk.source_id != source_id for chunk in v):
-            raise ValueError("Chunk source ID mismatch")
-        return v
+class SearchHit:
+    """Lightweight search result; the embedding is only filled in on request."""
+
+    id: str  # chunk_id of the stored chunk
+    content: str
+    distance: float
+    metadata: DocumentMetadata
+    embedding: Optional[List[float]] = None
+    fused_score: Optional[float] = None  # set by hybrid search
+
+    @property
+    def score(self) -> float:
+        """Cosine similarity, for collections using cosine distance."""
+        return 1.0 - self.distance
+
+
+@dataclass
+class IngestionResult:
+    """Outcome of streaming one document into the vector store."""
+
+    source_id: str
+    stored_chunks: int = 0
+    failed_chunks: int = 0
+    windows: int = 0
+    processed_at: datetime = field(default_factory=datetime.now)
+    # chunk_ids of the stored chunks, so stale ones can be pruned
+    chunk_ids: Set[str] = field(default_factory=set, repr=False)
+
+
+@dataclass
+class CollectionIngestionReport:
+    """Per-item outcome and aggregate throughput of ingesting many library items."""
+
+    results: Dict[str, IngestionResult] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)  # item id -> reason
+    skipped: List[str] = field(default_factory=list)  # items without source content
+    seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> List[str]:
+        return list(self.results)
+
+    @property
+    def stored_chunks(self) -> int:
+        return sum(result.stored_chunks for result in self.results.values())
+
+    @property
+    def failed_chunks(self) -> int:
+        return sum(result.failed_chunks for result in self.results.values())
+
+    @property
+    def items_per_second(self) -> float:
+        processed = len(self.results) + len(self.errors) + len(self.skipped)
+        return processed / self.seconds if self.seconds else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.stored_chunks / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class LibraryChanges:
+    """Library items changed or deleted since the last sync watermark."""
+
+    since_version: int
+    library_version: int
+    changed_ids: List[str] = field(default_factory=list)
+    deleted_ids: List[str] = field(default_factory=list)
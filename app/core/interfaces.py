@@ -1,7 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
 
-from app.core.documents import DocumentChunk, DocumentMetadata
+from app.core.documents import (
+    ChunkDraft,
+    DocumentChunk,
+    DocumentMetadata,
+    LibraryChanges,
+    SearchHit,
+)
+
+if TYPE_CHECKING:
+    from app.infrastructure.document_conversion.document_converter import (
+        MarkdownPage,
+    )
 
 
 class IVectorStoreRepository(ABC):
@@ -13,13 +24,52 @@ class IVectorStoreRepository(ABC):
     def upsert_chunks(self, chunks: List[DocumentChunk]) -> None:
         pass
 
+    @abstractmethod
+    def delete_source(
+        self, source_id: str, keep: Optional[Iterable[str]] = None
+    ) -> None:
+        pass
+
     @abstractmethod
     def search(
         self,
         embedding: List[float],
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None,
-    ) -> List[DocumentChunk]:
+        include_embeddings: bool = False,
+    ) -> List[SearchHit]:
+        pass
+
+    @abstractmethod
+    def search_many(
+        self,
+        embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[List[SearchHit]]:
+        pass
+
+
+class IHybridSearchRepository(IVectorStoreRepository):
+    @abstractmethod
+    def hybrid_search(
+        self,
+        query: str,
+        embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchHit]:
+        pass
+
+    @abstractmethod
+    def hybrid_search_many(
+        self,
+        queries: List[str],
+        embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchHit]]:
         pass
 
 
@@ -30,18 +80,48 @@ class IMetadataRepository(ABC):
 
 
 class ILibraryManagerRepository(ABC):
+    @abstractmethod
+    def list_items(
+        self, collection_key: Optional[str] = None, query: Optional[str] = None
+    ) -> List[str]:
+        pass
+
     @abstractmethod
     def get_metadata(self, source_id: str) -> DocumentMetadata | None:
         pass
 
+    @abstractmethod
+    def get_metadata_many(self, source_ids: List[str]) -> Dict[str, DocumentMetadata]:
+        pass
+
     @abstractmethod
     def get_source_content(self, parent_id: str) -> str | None:
         pass
 
+    @abstractmethod
+    def get_changes(self) -> LibraryChanges:
+        pass
+
+    @abstractmethod
+    def commit_sync(self, library_version: int) -> None:
+        pass
+
 
 class IDocumentRepository(ABC):
     @abstractmethod
-    def process(self, content: str, metadata: DocumentMetadata) -> List[DocumentChunk]:
+    def process(self, content: str, metadata: DocumentMetadata) -> List[ChunkDraft]:
+        pass
+
+    @abstractmethod
+    def iter_process(
+        self, content: str, metadata: DocumentMetadata
+    ) -> Iterator[ChunkDraft]:
+        pass
+
+    @abstractmethod
+    def iter_process_pages(
+        self, pages: Iterable["MarkdownPage"], metadata: DocumentMetadata
+    ) -> Iterator[ChunkDraft]:
         pass
 
 
@@ -50,6 +130,10 @@ class IEmbeddedGenerator(ABC):
     def generate(self, text: str) -> List[float]:
         pass
 
+    @abstractmethod
+    def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        pass
+
     @abstractmethod
     def get_dimensions(self) -> int:
         pass
@@ -0,0 +1,92 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class IMetrics(ABC):
+    """Sink for timings and counters.
+
+    Timings are recorded in seconds under a stage name (`fetch`, `embedding`,
+    ...) with an `outcome` label of "ok" or "error"; exporters decide on
+    units and suffixes.
+    """
+
+    @abstractmethod
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        pass
+
+    @abstractmethod
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        pass
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Time the block, labelling the observation with its outcome."""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            self.observe(name, time.perf_counter() - started, outcome=outcome, **labels)
+
+    def timed_iter(
+        self, name: str, iterable: Iterable[T], **labels: str
+    ) -> Iterator[T]:
+        """Yield from `iterable`, observing the time spent producing items once at the end.
+
+        Time the consumer spends between items is not counted, so this measures
+        a lazy stage such as chunking without including the stages after it.
+        """
+        iterator = iter(iterable)
+        elapsed = 0.0
+        outcome = "error"
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - started
+                    outcome = "ok"
+                    return
+                elapsed += time.perf_counter() - started
+                yield item
+        finally:
+            self.observe(name, elapsed, outcome=outcome, **labels)
+
+
+class NoopMetrics(IMetrics):
+    """Default sink: records nothing."""
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        pass
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        pass
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        yield
+
+    def timed_iter(
+        self, name: str, iterable: Iterable[T], **labels: str
+    ) -> Iterator[T]:
+        return iter(iterable)
+
+
+_metrics: IMetrics = NoopMetrics()
+
+
+def get_metrics() -> IMetrics:
+    """The process-wide metrics sink."""
+    return _metrics
+
+
+def set_metrics(metrics: IMetrics) -> None:
+    """Install a process-wide metrics sink, e.g. an InMemoryMetrics collector."""
+    global _metrics
+    _metrics = metrics
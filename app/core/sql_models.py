@@ -1,13 +1,61 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from app.infrastructure.database.database import Base
 
 
 class MarkdownExtract(Base):
     __tablename__ = "markdowns"
+    __table_args__ = (UniqueConstraint("content_hash", "extract_method"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    content_hash = Column(String(64), unique=True, index=True)
-    extract_method = Column(String(50))
+    content_hash = Column(String(64), index=True)  # sha256 of the source file
+    extract_method = Column(String(50))  # converter name@version
     markdown_content = Column(Text)
     created_at = Column(DateTime, default=datetime.now)
+
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = "embedding_cache"
+
+    model = Column(String(100), primary_key=True)
+    dimension = Column(Integer, primary_key=True)
+    content_hash = Column(String(64), primary_key=True)
+    embedding = Column(LargeBinary)  # packed float32
+    size_bytes = Column(Integer)
+    last_accessed = Column(DateTime, default=datetime.now, index=True)
+
+
+class ZoteroSyncState(Base):
+    __tablename__ = "zotero_sync_state"
+
+    library = Column(String(100), primary_key=True)  # "<library type>:<library id>"
+    version = Column(Integer, default=0)  # Last-Modified-Version fully ingested
+    synced_at = Column(DateTime, default=datetime.now)
+
+
+class LexicalChunk(Base):
+    __tablename__ = "lexical_chunks"
+
+    id = Column(Integer, primary_key=True)  # rowid in the chunk_fts FTS5 table
+    chunk_id = Column(String(64), unique=True, index=True)  # DocumentChunk.chunk_id
+    source_id = Column(String(20), index=True)
+    content = Column(Text)
+    metadata_json = Column(Text)  # serialized DocumentMetadata
+
+
+class ZoteroItemRecord(Base):
+    __tablename__ = "zotero_items"
+
+    library = Column(String(100), primary_key=True)  # "<library type>:<library id>"
+    key = Column(String(20), primary_key=True)
+    version = Column(Integer)
+    payload = Column(Text)  # raw API item as JSON
+    fetched_at = Column(DateTime, default=datetime.now, index=True)
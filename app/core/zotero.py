@@ -1,6 +1,8 @@
 from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field, model_validator
 
+from app.core.documents import DocumentMetadata
+
 ZoteroLibraryType = Literal["user", "group"]
 
 
@@ -25,7 +27,9 @@ class ZoteroCreator(BaseModel):
 class ZoteroData(BaseModel):
     key: str = Field(description="The item key.")
     version: int = Field(1, description="The item version.")
-    parentItem: Optional[str] = Field(default="Key of the parent item, if any.")
+    parentItem: Optional[str] = Field(
+        default=None, description="Key of the parent item, if any."
+    )
     title: str = Field("The title of the item.")
     itemType: str = Field(
         "Type of item (e.g. 'attachment', 'book')"
@@ -58,3 +62,17 @@ class ZoteroItem(BaseModel):
         ).get("url"):
             raise ValueError("If linkMode is 'linked_url', a URL must be provided.")
         return values
+
+
+def convert_zotero_item(item: ZoteroItem) -> DocumentMetadata:
+    """Map Zotero API response to DocumentMetadata"""
+    return DocumentMetadata(
+        zotero_id=item.key,
+        title=item.data.title,
+        authors="; ".join(
+            f"{c.lastName}, {c.firstName}".strip() for c in item.data.creators
+        ),
+        tags=", ".join(tag.tag for tag in item.data.tags),
+        source_version=str(item.version),
+        language=item.data.language,
+    )
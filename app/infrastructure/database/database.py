@@ -1,18 +1,42 @@
-from app.config.settings import Settings
+from functools import lru_cache
+from pathlib import Path
+
+from app.config.settings import get_settings
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-engine = create_engine(Settings.database_url, pool_size=20, max_overflow=0)
+Base = declarative_base()
 
-SessionLocal = sessionmaker(autoflush=False, bind=engine)
 
-Base = declarative_base()
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """Engine for `database_url`, created on first use rather than at import."""
+    database_url = make_url(get_settings().database_url)
+    if database_url.get_backend_name() == "sqlite" and database_url.database:
+        # SQLite creates the file but not its parent directory
+        Path(database_url.database).parent.mkdir(parents=True, exist_ok=True)
+
+    return create_engine(database_url, pool_size=20, max_overflow=0)
+
+
+@lru_cache(maxsize=None)
+def get_session_factory() -> sessionmaker:
+    """Shared session factory bound to `get_engine()`."""
+    return sessionmaker(autoflush=False, bind=get_engine())
 
 
 def get_db():
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
 
     finally:
         db.close()
+
+
+def init_db() -> None:
+    """Create any missing tables for the registered models."""
+    import app.core.sql_models  # noqa: F401  register models on Base
+
+    Base.metadata.create_all(bind=get_engine())
@@ -0,0 +1,65 @@
+from hashlib import sha256
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.logger import logger
+from app.core.sql_models import MarkdownExtract
+from app.infrastructure.database.database import Base, get_session_factory
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path: str) -> str:
+    """sha256 of the file bytes, read in blocks."""
+    digest = sha256()
+    with open(file_path, "rb") as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Converted Markdown stored in the `markdowns` table.
+
+    Rows are keyed by the hash of the source file bytes plus the converter's
+    `extract_method` (name and version), so bumping a converter's version
+    invalidates only its own entries.
+    """
+
+    def __init__(self, session_factory: Optional[sessionmaker] = None):
+        self.session_factory = session_factory or get_session_factory()
+        Base.metadata.create_all(
+            bind=self.session_factory.kw["bind"], tables=[MarkdownExtract.__table__]
+        )
+
+    def get(self, content_hash: str, extract_method: str) -> Optional[str]:
+        with self.session_factory() as session:
+            return session.scalar(
+                select(MarkdownExtract.markdown_content).where(
+                    MarkdownExtract.content_hash == content_hash,
+                    MarkdownExtract.extract_method == extract_method,
+                )
+            )
+
+    def put(self, content_hash: str, extract_method: str, markdown: str) -> None:
+        with self.session_factory() as session:
+            extract = session.scalar(
+                select(MarkdownExtract).where(
+                    MarkdownExtract.content_hash == content_hash,
+                    MarkdownExtract.extract_method == extract_method,
+                )
+            )
+            if extract is None:
+                session.add(
+                    MarkdownExtract(
+                        content_hash=content_hash,
+                        extract_method=extract_method,
+                        markdown_content=markdown,
+                    )
+                )
+            else:
+                extract.markdown_content = markdown
+            session.commit()
+        logger.debug(f"Cached {extract_method} conversion of {content_hash[:12]}")
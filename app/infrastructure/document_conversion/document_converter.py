@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
 from pydantic import BaseModel
 
+from app.config.settings import get_settings
+from app.core.logger import logger
+
+if TYPE_CHECKING:
+    from app.infrastructure.document_conversion.conversion_cache import (
+        ConversionCache,
+    )
+
 
 class MarkdownPage(BaseModel):
     content: str
@@ -17,13 +26,70 @@ class ParagraphChunk(BaseModel):
     section: Optional[str] = None
 
 
+def collect_files(sources: Union[str, Sequence[str]], suffix: str) -> List[str]:
+    """Files under directory `sources` ending in `suffix`, or `sources` itself if a list."""
+    if isinstance(sources, str):
+        return sorted(
+            str(path)
+            for path in Path(sources).rglob("*")
+            if path.is_file() and path.suffix.lower() == suffix
+        )
+    return list(sources)
+
+
 class IDocumentConverter(ABC):
     """
     Abstract base class for document converters.
+
+    `convert` looks up the conversion cache before calling the converter's
+    `_convert`; subclasses set `name` and `version` to key their entries.
     """
 
-    @abstractmethod
+    name: str
+    version: str
+
+    def __init__(
+        self, cache: Optional["ConversionCache"] = None, use_cache: bool = True
+    ):
+        """
+        Args:
+            cache: Conversion cache to use; by default a shared one is opened
+                when `conversion_cache_enabled` is set
+            use_cache: False to convert without any cache, whatever the
+                settings say
+        """
+        if not use_cache:
+            cache = None
+        elif cache is None and get_settings().conversion_cache_enabled:
+            # Imported here: the cache pulls in SQLAlchemy and the database setup.
+            from app.infrastructure.document_conversion.conversion_cache import (
+                ConversionCache,
+            )
+
+            cache = ConversionCache()
+        self.cache = cache
+
+    @property
+    def extract_method(self) -> str:
+        return f"{self.name}@{self.version}"
+
     def convert(self, file_path: str) -> str:
+        if self.cache is None:
+            return self._convert(file_path)
+
+        from app.infrastructure.document_conversion.conversion_cache import hash_file
+
+        content_hash = hash_file(file_path)
+        if (cached := self.cache.get(content_hash, self.extract_method)) is not None:
+            logger.debug(f"Conversion cache hit for {file_path}")
+            return cached
+
+        markdown = self._convert(file_path)
+        self.cache.put(content_hash, self.extract_method, markdown)
+        return markdown
+
+    @abstractmethod
+    def _convert(self, file_path: str) -> str:
         pass
 
     @abstractmethod
@@ -0,0 +1,324 @@
+import posixpath
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote
+from xml.etree import ElementTree
+
+from app.config.settings import get_settings
+from app.core.exceptions import DocumentProcessingError
+from app.core.logger import logger
+from app.infrastructure.document_conversion.document_converter import (
+    IDocumentConverter,
+    MarkdownPage,
+    collect_files,
+)
+
+# Chapters are joined with a vertical tab on a line of its own: whitespace to
+# both chunkers, and distinct from the PDF page break so it never reads as a
+# page range.
+CHAPTER_BREAK = "\n\v\n"
+
+CONTAINER_PATH = "META-INF/container.xml"
+HTML_MEDIA_TYPES = {"application/xhtml+xml", "text/html"}
+FIRST_HEADING = re.compile(r"^#{1,3} +(.+)$", re.MULTILINE)
+INLINE_MARKUP = re.compile(r"[*`]")
+WHITESPACE = re.compile(r"\s+")
+
+
+class _MarkdownWriter(HTMLParser):
+    """Turns one XHTML chapter into Markdown blocks.
+
+    Covers what books actually use: headings, paragraphs, lists, emphasis,
+    block quotes, preformatted text and simple tables. Links keep only their
+    text; images, scripts and styles are dropped.
+    """
+
+    BLOCK_TAGS = {
+        "p", "div", "section", "article", "aside", "header", "footer",
+        "figure", "figcaption", "table", "dl", "dt", "dd", "body",
+    }  # fmt: skip
+    HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+    SKIP_TAGS = {"head", "script", "style", "svg", "math", "nav"}
+    INLINE_MARKS = {"em": "*", "i": "*", "strong": "**", "b": "**", "code": "`"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self.parts: List[str] = []  # inline text of the open block
+        self.prefix = ""  # heading marks, list bullet or quote marker
+        self.skip_depth = 0
+        self.pre_depth = 0
+        self.quote_depth = 0
+        self.lists: List[List[int]] = []  # [0] for <ul>, [count] for <ol>
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        if self.skip_depth:
+            return
+
+        if tag in self.HEADING_TAGS:
+            self._flush()
+            self.prefix = "#" * int(tag[1]) + " "
+        elif tag in self.BLOCK_TAGS or tag == "tr":
+            self._flush()
+        elif tag == "blockquote":
+            self._flush()
+            self.quote_depth += 1
+        elif tag in ("ul", "ol"):
+            self._flush()
+            self.lists.append([0] if tag == "ul" else [1])
+        elif tag == "li":
+            self._flush()
+            indent = "  " * max(len(self.lists) - 1, 0)
+            if self.lists and self.lists[-1][0]:
+                self.prefix = f"{indent}{self.lists[-1][0]}. "
+                self.lists[-1][0] += 1
+            else:
+                self.prefix = f"{indent}- "
+        elif tag == "pre":
+            self._flush()
+            self.pre_depth += 1
+        elif tag == "br":
+            self.parts.append("\n")
+        elif tag == "hr":
+            self._flush()
+            self.blocks.append("---")
+        elif tag in ("td", "th"):
+            if self.parts:
+                self.parts.append(" | ")
+        elif tag in self.INLINE_MARKS and not self.pre_depth:
+            self.parts.append(self.INLINE_MARKS[tag])
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+            return
+        if self.skip_depth:
+            return
+
+        if tag == "pre":
+            code = "".join(self.parts).strip("\n")
+            if code.strip():
+                self.blocks.append(f"```\n{code}\n```")
+            self.parts = []
+            self.pre_depth = max(self.pre_depth - 1, 0)
+        elif tag == "blockquote":
+            self._flush()
+            self.quote_depth = max(self.quote_depth - 1, 0)
+        elif tag in ("ul", "ol"):
+            self._flush()
+            if self.lists:
+                self.lists.pop()
+        elif tag in self.INLINE_MARKS and not self.pre_depth:
+            self.parts.append(self.INLINE_MARKS[tag])
+        elif tag in self.BLOCK_TAGS or tag in self.HEADING_TAGS or tag in ("tr", "li"):
+            self._flush()
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        self.parts.append(data if self.pre_depth else WHITESPACE.sub(" ", data))
+
+    def _flush(self) -> None:
+        if self.pre_depth:
+            return
+        lines = [line.strip() for line in "".join(self.parts).split("\n")]
+        text = "\n".join(line for line in lines if line)
+        if text:
+            quote = "> " * self.quote_depth
+            self.blocks.append(quote + self.prefix + text)
+        self.parts = []
+        self.prefix = ""
+
+    def markdown(self) -> str:
+        self.close()
+        self._flush()
+        return "\n\n".join(self.blocks)
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert one (X)HTML document to Markdown."""
+    writer = _MarkdownWriter()
+    writer.feed(html)
+    return writer.markdown()
+
+
+def chapter_title(markdown: str) -> Optional[str]:
+    """Plain text of the first `#`, `##` or `###` heading, if any."""
+    match = FIRST_HEADING.search(markdown)
+    return INLINE_MARKUP.sub("", match.group(1)).strip() if match else None
+
+
+def join_chapters(chapters: Sequence[str]) -> str:
+    return CHAPTER_BREAK.join(chapters)
+
+
+def _spine_paths(book: zipfile.ZipFile) -> List[str]:
+    """Zip member names of the spine's HTML documents, in reading order."""
+    container = ElementTree.fromstring(book.read(CONTAINER_PATH))
+    rootfile = container.find(".//{*}rootfile")
+    if rootfile is None or not rootfile.get("full-path"):
+        raise DocumentProcessingError("EPUB container has no rootfile")
+    opf_path = rootfile.get("full-path")
+    opf_dir = posixpath.dirname(opf_path)
+
+    package = ElementTree.fromstring(book.read(opf_path))
+    manifest: Dict[str, Tuple[str, str]] = {
+        item.get("id"): (item.get("href", ""), item.get("media-type", ""))
+        for item in package.iterfind(".//{*}manifest/{*}item")
+    }
+
+    paths = []
+    for itemref in package.iterfind(".//{*}spine/{*}itemref"):
+        href, media_type = manifest.get(itemref.get("idref"), ("", ""))
+        if href and media_type in HTML_MEDIA_TYPES:
+            paths.append(posixpath.normpath(posixpath.join(opf_dir, unquote(href))))
+    return paths
+
+
+def _convert_epub(file_path: str) -> str:
+    """Process-pool worker: convert one EPUB.
+
+    The parent process owns the cache, so the worker opts out of it and never
+    opens a database connection of its own.
+    """
+    return EpubToMarkdownConverter(use_cache=False)._convert(file_path)
+
+
+class EpubToMarkdownConverter(IDocumentConverter):
+    """
+    Convert EPUB books to Markdown, one spine document (chapter) at a time.
+
+    Only the chapter being converted is read from the zip, so memory does not
+    grow with the size of the book. Chapters are joined with `CHAPTER_BREAK`.
+    """
+
+    name = "epub-html"
+    version = "1.0"
+
+    def iter_chapters(self, file_path: str) -> Iterator[MarkdownPage]:
+        """
+        Yield the book chapter by chapter, converting each only when it is requested.
+
+        A book already in the conversion cache is replayed from its Markdown.
+        Otherwise chapters stream from the zip and are not cached, so only the
+        chapter being consumed is held in memory; `convert` or `convert_many`
+        fill the cache.
+
+        Args:
+            file_path: Path to the EPUB file.
+
+        Returns:
+            Iterator of MarkdownPage with `chapter` set from the chapter's first heading
+        """
+        if self.cache is not None:
+            from app.infrastructure.document_conversion.conversion_cache import (
+                hash_file,
+            )
+
+            cached = self.cache.get(hash_file(file_path), self.extract_method)
+            if cached is not None:
+                logger.debug(f"Conversion cache hit for {file_path}")
+                yield from self.chunk_by_page(cached)
+                return
+
+        yield from self._read_chapters(file_path)
+
+    def _read_chapters(self, file_path: str) -> Iterator[MarkdownPage]:
+        try:
+            with zipfile.ZipFile(file_path) as book:
+                for path in _spine_paths(book):
+                    try:
+                        html = book.read(path).decode("utf-8", errors="replace")
+                    except KeyError:
+                        logger.warning(
+                            f"Spine document {path} missing from {file_path}"
+                        )
+                        continue
+
+                    markdown = html_to_markdown(html)
+                    if markdown.strip():
+                        yield MarkdownPage(
+                            content=markdown, chapter=chapter_title(markdown)
+                        )
+
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+            logger.error(f"EPUB conversion failed: {e}")
+            raise DocumentProcessingError(f"EPUB conversion failed: {e}")
+
+    def _convert(self, file_path: str) -> str:
+        return join_chapters(
+            [chapter.content for chapter in self._read_chapters(file_path)]
+        )
+
+    def convert_many(
+        self,
+        sources: Union[str, Sequence[str]],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Convert many EPUBs in parallel over a process pool, one book per task.
+
+        Args:
+            sources: Directory to search for EPUBs, or a list of EPUB paths.
+            max_workers: Pool size (default from settings, else one per core).
+
+        Returns:
+            Mapping of file path to Markdown for every EPUB that converted.
+        """
+        file_paths = collect_files(sources, ".epub")
+
+        converted: Dict[str, str] = {}
+        content_hashes: Dict[str, str] = {}
+        if self.cache is not None:
+            from app.infrastructure.document_conversion.conversion_cache import (
+                hash_file,
+            )
+
+            for file_path in file_paths:
+                content_hashes[file_path] = hash_file(file_path)
+                cached = self.cache.get(content_hashes[file_path], self.extract_method)
+                if cached is not None:
+                    converted[file_path] = cached
+            logger.info(f"Conversion cache hits: {len(converted)}/{len(file_paths)}")
+
+        pending = [path for path in file_paths if path not in converted]
+        with ProcessPoolExecutor(
+            max_workers=max_workers or get_settings().conversion_workers
+        ) as pool:
+            futures = [pool.submit(_convert_epub, path) for path in pending]
+            for file_path, future in zip(pending, futures):
+                try:
+                    converted[file_path] = future.result()
+                except Exception as e:
+                    logger.error(f"EPUB conversion failed for {file_path}: {e}")
+                    continue
+                if self.cache is not None:
+                    self.cache.put(
+                        content_hashes[file_path],
+                        self.extract_method,
+                        converted[file_path],
+                    )
+
+        logger.info(f"Converted {len(converted)}/{len(file_paths)} EPUBs")
+        return converted
+
+    def chunk_by_page(self, markdown_content: str) -> List[MarkdownPage]:
+        """
+        Split converted Markdown back into its chapters.
+
+        Args:
+            markdown_content: Markdown produced by `convert`.
+
+        Returns:
+            List of MarkdownPage with `chapter` set, skipping empty chapters
+        """
+        return [
+            MarkdownPage(content=chapter, chapter=chapter_title(chapter))
+            for chapter in markdown_content.split(CHAPTER_BREAK)
+            if chapter.strip()
+        ]
@@ -0,0 +1,107 @@
+"""Page boundaries of converted Markdown, kept as offsets into one buffer.
+
+Converters that know where pages end (pymupdf4llm with `page_chunks=True`)
+join the pages with `PAGE_BREAK`, a form feed on a line of its own. The
+marker survives the conversion cache as plain text and is whitespace to
+both chunkers, so a `PageIndex` can be rebuilt from the buffer at any time
+without slicing it into per-page strings. Chunkers replace it with
+`strip_page_breaks` before a chunk's text is stored.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+PAGE_BREAK = "\n\f\n"
+
+
+def join_pages(pages: Iterable[str]) -> str:
+    """Join page texts into one buffer with `PAGE_BREAK` between pages."""
+    return PAGE_BREAK.join(pages)
+
+
+def strip_page_breaks(text: str) -> str:
+    """Replace each `PAGE_BREAK` in a chunk with a paragraph break."""
+    return text.replace(PAGE_BREAK, "\n\n")
+
+
+def _squeeze(text: str) -> str:
+    return "".join(text.split())
+
+
+class PageIndex:
+    """Start offset of every page in a buffer built by `join_pages`.
+
+    Page `first_page + i` covers `[starts[i], starts[i + 1])`, the last
+    page running to the end of the buffer.
+    """
+
+    def __init__(self, starts: List[int], length: int, first_page: int = 1):
+        self.starts = starts
+        self.length = length
+        self.first_page = first_page
+
+    @classmethod
+    def from_markdown(cls, markdown: str, first_page: int = 1) -> "PageIndex":
+        """Index the page breaks of `markdown` in one scan; no page breaks means one page."""
+        starts = [0]
+        position = markdown.find(PAGE_BREAK)
+        while position != -1:
+            starts.append(position + len(PAGE_BREAK))
+            position = markdown.find(PAGE_BREAK, starts[-1])
+        return cls(starts, len(markdown), first_page)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def page_at(self, offset: int) -> int:
+        """Page number containing `offset`."""
+        return self.first_page + max(bisect_right(self.starts, offset) - 1, 0)
+
+    def page_range(self, start: int, end: int) -> str:
+        """Citation-style range of the pages `[start, end)` touches, e.g. "12" or "12-14"."""
+        first = self.page_at(start)
+        last = self.page_at(max(end - 1, start))
+        return str(first) if first == last else f"{first}-{last}"
+
+    def spans(self) -> Iterator[Tuple[int, int, int]]:
+        """(page, start, end) for every page, excluding the page breaks themselves."""
+        for i, start in enumerate(self.starts):
+            end = (
+                self.starts[i + 1] - len(PAGE_BREAK)
+                if i + 1 < len(self.starts)
+                else self.length
+            )
+            yield self.first_page + i, start, end
+
+
+class ChunkLocator:
+    """Page ranges for chunks that are not slices of the paged buffer.
+
+    langchain's splitters strip and rejoin lines, so their chunks carry no
+    offsets, but they only ever change whitespace. Each chunk is therefore
+    found in a whitespace-free copy of the buffer, searching forward from the
+    previous chunk's start, and mapped through a `PageIndex` whose offsets
+    count non-whitespace characters.
+    """
+
+    def __init__(self, markdown: str, first_page: int = 1):
+        lengths = [
+            len(_squeeze(markdown[start:end]))
+            for _, start, end in PageIndex.from_markdown(markdown).spans()
+        ]
+        self._text = _squeeze(markdown)
+        self._pages = PageIndex(
+            list(accumulate(lengths[:-1], initial=0)), len(self._text), first_page
+        )
+        self._cursor = 0
+
+    def page_range(self, chunk: str) -> Optional[str]:
+        """Page range of the next chunk in document order, or None if it is not found."""
+        needle = _squeeze(chunk)
+        position = self._text.find(needle, self._cursor) if needle else -1
+        if position == -1:
+            return None
+
+        self._cursor = position
+        return self._pages.page_range(position, position + len(needle))
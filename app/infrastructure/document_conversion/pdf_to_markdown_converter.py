@@ -1,66 +1,178 @@
-from typing import List
-import pymupdf4llm
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Union
+
+from app.config.settings import get_settings
+from app.core.exceptions import DocumentProcessingError
 from app.core.logger import logger
 from app.infrastructure.document_conversion.document_converter import (
     IDocumentConverter,
     MarkdownPage,
     ParagraphChunk,
+    collect_files,
 )
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from app.infrastructure.document_conversion.page_index import PageIndex, join_pages
+
+
+def _to_paged_markdown(file_path: str, pages: Optional[List[int]] = None) -> str:
+    """Convert a PDF (or the 0-based `pages` of it) page by page and join the pages."""
+    import pymupdf4llm
+
+    page_chunks = pymupdf4llm.to_markdown(file_path, pages=pages, page_chunks=True)
+    return join_pages(page_chunk["text"] for page_chunk in page_chunks)
+
+
+def _convert_page_range(file_path: str, pages: List[int]) -> str:
+    """Process-pool worker: convert a 0-based page range of one PDF."""
+    return _to_paged_markdown(file_path, pages)
 
 
 class PdfToMarkdownConverter(IDocumentConverter):
     """
     Convert PDF content to Markdown format using pymupdf.
-    pymupdf tends to separate pages by '---'
+
+    Pages are converted separately and joined with `PAGE_BREAK`, so a
+    `PageIndex` over the Markdown maps any offset back to its page.
     """
 
-    def convert(self, file_path: str) -> str:
+    name = "pymupdf4llm"
+
+    @property
+    def version(self) -> str:
+        # pymupdf4llm is imported here rather than at module level so that
+        # importing the converter stays cheap until a PDF is actually read.
+        import pymupdf4llm
+
+        return f"1.1+{pymupdf4llm.__version__}"
+
+    def _convert(self, file_path: str) -> str:
         try:
-            return pymupdf4llm.to_markdown(file_path)
+            return _to_paged_markdown(file_path)
 
         except Exception as e:
             logger.error(f"PDF conversion failed: {e}")
-            raise Exception
+            raise DocumentProcessingError(f"PDF conversion failed: {e}")
+
+    def convert_many(
+        self,
+        sources: Union[str, Sequence[str]],
+        max_workers: Optional[int] = None,
+        pages_per_task: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Convert many PDFs in parallel over a process pool.
+
+        Every PDF is split into page ranges of `pages_per_task` pages so large
+        books are spread over several workers; the ranges are reassembled in
+        page order. PDFs already in the conversion cache are not parsed again.
+
+        Args:
+            sources: Directory to search for PDFs, or a list of PDF paths.
+            max_workers: Pool size (default from settings, else one per core).
+            pages_per_task: Pages per worker task (default from settings).
+
+        Returns:
+            Mapping of file path to Markdown for every PDF that converted.
+        """
+        import pymupdf
+
+        from app.infrastructure.document_conversion.conversion_cache import hash_file
+
+        pages_per_task = pages_per_task or get_settings().pdf_pages_per_task
+        file_paths = collect_files(sources, ".pdf")
+
+        converted: Dict[str, str] = {}
+        content_hashes: Dict[str, str] = {}
+        if self.cache is not None:
+            for file_path in file_paths:
+                content_hashes[file_path] = hash_file(file_path)
+                cached = self.cache.get(content_hashes[file_path], self.extract_method)
+                if cached is not None:
+                    converted[file_path] = cached
+            logger.info(f"Conversion cache hits: {len(converted)}/{len(file_paths)}")
+
+        page_ranges: Dict[str, List[List[int]]] = {}
+        for file_path in file_paths:
+            if file_path in converted:
+                continue
+            try:
+                with pymupdf.open(file_path) as document:
+                    page_count = document.page_count
+            except Exception as e:
+                logger.error(f"Could not open PDF {file_path}: {e}")
+                continue
+            page_ranges[file_path] = [
+                list(range(start, min(start + pages_per_task, page_count)))
+                for start in range(0, page_count, pages_per_task)
+            ]
+
+        parts: Dict[str, List[Optional[str]]] = {
+            file_path: [None] * len(ranges) for file_path, ranges in page_ranges.items()
+        }
+        failed = set()
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers or get_settings().conversion_workers
+        ) as pool:
+            futures = {
+                pool.submit(_convert_page_range, file_path, pages): (file_path, index)
+                for file_path, ranges in page_ranges.items()
+                for index, pages in enumerate(ranges)
+            }
+            for future in as_completed(futures):
+                file_path, index = futures[future]
+                try:
+                    parts[file_path][index] = future.result()
+                except Exception as e:
+                    logger.error(f"PDF conversion failed for {file_path}: {e}")
+                    failed.add(file_path)
+
+        for file_path, file_parts in parts.items():
+            if file_path in failed:
+                continue
+            converted[file_path] = join_pages(file_parts)
+            if self.cache is not None:
+                self.cache.put(
+                    content_hashes[file_path],
+                    self.extract_method,
+                    converted[file_path],
+                )
+
+        logger.info(
+            f"Converted {len(converted)}/{len(file_paths)} PDFs using {len(futures)} page-range tasks"
+        )
+        return converted
 
     def chunk_by_page(self, markdown_content: str) -> List[MarkdownPage]:
         """
-        Converts a PDF file to Markdown format, splitting into pages by '---' separator.
+        Split converted Markdown into its pages at the page breaks.
 
         Args:
-            file_path: Path to the PDF file.
+            markdown_content: Markdown produced by `convert`.
 
         Returns:
-            List of MarkdownPage
+            List of MarkdownPage, skipping empty pages
         """
 
         paged_documents: List[MarkdownPage] = []
-        page_markdown_string = markdown_content.split("---\n")
 
-        for page_number, page_markdown in enumerate(page_markdown_string):
-            if page_markdown.strip():  # Ignore empty page
-                page_document = MarkdownPage(
-                    content=page_markdown.strip(),  # Store page markdown strip white space
-                    page=page_number + 1,
+        for page_number, start, end in PageIndex.from_markdown(
+            markdown_content
+        ).spans():
+            page_markdown = markdown_content[start:end].strip()
+            if page_markdown:  # Ignore empty page
+                paged_documents.append(
+                    MarkdownPage(content=page_markdown, page=page_number)
                 )
-                paged_documents.append(page_document)
 
         return paged_documents
 
-    def chunk_by_paragraph(
-        self, markdown_pages: List[MarkdownPage]
-    ) -> List[ParagraphChunk]:
-        """
-        Chunks the document into paragraphs using Langchain's RecursiveCharacterTextSplitter.
-        Args:
-            markdown_pages: List of MarkdownPage objects.
+    @cached_property
+    def paragraph_splitter(self):
+        """Langchain splitter used by `chunk_by_paragraph`, built once per converter."""
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-        Returns:
-            List of ParagraphChunk objects.
-        """
-        paragraph_chunks: List[ParagraphChunk] = []
-
-        text_splitter = RecursiveCharacterTextSplitter(  # Initialize Langchain splitter for paragraphs
+        return RecursiveCharacterTextSplitter(  # Initialize Langchain splitter for paragraphs
             separators=[
                 "\n\n",
                 "\n",
@@ -79,8 +191,21 @@ class PdfToMarkdownConverter(IDocumentConverter):
             length_function=len,
         )
 
+    def chunk_by_paragraph(
+        self, markdown_pages: List[MarkdownPage]
+    ) -> List[ParagraphChunk]:
+        """
+        Chunks the document into paragraphs using Langchain's RecursiveCharacterTextSplitter.
+        Args:
+            markdown_pages: List of MarkdownPage objects.
+
+        Returns:
+            List of ParagraphChunk objects.
+        """
+        paragraph_chunks: List[ParagraphChunk] = []
+
         for page in markdown_pages:
-            split_text = text_splitter.split_text(page.content)
+            split_text = self.paragraph_splitter.split_text(page.content)
 
             for chunk_text in split_text:
                 if chunk_text.strip():
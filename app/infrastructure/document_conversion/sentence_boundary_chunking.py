@@ -0,0 +1,203 @@
+"""Single-pass Markdown chunker that cuts at sentence boundaries.
+
+`SentenceBoundaryChunker` walks the Markdown once, keeping a stack of the
+enclosing headers, and splits every header section into chunks of at most
+`chunk_size` characters. Cuts prefer the last sentence end (or line break)
+inside the budget and fall back to whitespace, then to a hard cut. Chunks are
+emitted as `ChunkSpan` offsets into the source text, so nothing is copied
+until a caller slices the text it actually keeps.
+
+Header handling follows langchain's `MarkdownHeaderTextSplitter` with
+`strip_headers=False`: header lines stay in their section, headers inside
+fenced code blocks are ignored, and a header with no body of its own is
+merged into the deeper section that follows it.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_HEADERS: Tuple[Tuple[str, str], ...] = (
+    ("#", "Header1"),
+    ("##", "Header2"),
+    ("###", "Header3"),
+)
+
+# A fence opener/closer or an ATX header line; either may be indented.
+BLOCK_PATTERN = re.compile(
+    r"^[ \t]*(?:(?P<fence>```|~~~)|(?P<marks>#{1,6})(?:[ \t]+(?P<title>[^\n]*?))?[ \t]*$)",
+    re.MULTILINE,
+)
+# End of a sentence (terminal punctuation, optional closing quote or bracket,
+# followed by whitespace) or end of a line. Match ends are cut positions.
+SENTENCE_END = re.compile(r"[.!?][\"'”’)\]]*(?=\s)|\n")
+NON_SPACE = re.compile(r"\S")
+
+Headers = Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class ChunkSpan:
+    """A chunk as the `[start, end)` slice of the source text.
+
+    `headers` holds (metadata key, header text) pairs for the enclosing
+    headers, outermost first, e.g. `(("Header1", "Book"), ("Header2", "Ch 1"))`.
+    """
+
+    start: int
+    end: int
+    headers: Headers
+
+    def text(self, source: str) -> str:
+        return source[self.start : self.end]
+
+
+def _strip(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Narrow `[start, end)` to exclude leading and trailing whitespace."""
+    match = NON_SPACE.search(text, start, end)
+    if match is None:
+        return end, end
+    start = match.start()
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+class SentenceBoundaryChunker:
+    def __init__(
+        self,
+        headers_to_split_on: Optional[Sequence[Tuple[str, str]]] = None,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 100,
+    ):
+        """Configure the chunker.
+
+        Args:
+            headers_to_split_on: (marker, metadata key) pairs such as
+                `("##", "Header2")`; deeper headers are treated as body text
+            chunk_size: Maximum chunk length in characters
+            chunk_overlap: Characters of the previous chunk to repeat at the
+                start of the next one, rounded to a sentence or word boundary
+
+        Raises:
+            ValueError: If the size budget is invalid
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be in [0, chunk_size)")
+
+        self.header_names: Dict[str, str] = dict(
+            headers_to_split_on if headers_to_split_on is not None else DEFAULT_HEADERS
+        )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split_text(self, text: str) -> List[str]:
+        """Chunk `text` and return the chunk strings."""
+        return [span.text(text) for span in self.iter_spans(text)]
+
+    def iter_spans(self, text: str) -> Iterator[ChunkSpan]:
+        """Yield the chunks of `text` in document order."""
+        stack: List[Tuple[int, str, str]] = []  # (level, metadata key, header text)
+        section_start = 0
+        body_start = 0  # first offset after the most recent header line
+        open_fence: Optional[str] = None
+
+        for match in BLOCK_PATTERN.finditer(text):
+            fence = match.group("fence")
+            if fence:
+                line_end = text.find("\n", match.end())
+                if line_end == -1:
+                    line_end = len(text)
+                if text.count(fence, match.start(), line_end) == 1:
+                    if open_fence is None:
+                        open_fence = fence
+                    elif open_fence == fence:
+                        open_fence = None
+                continue
+            if open_fence is not None:
+                continue
+
+            marks = match.group("marks")
+            name = self.header_names.get(marks)
+            if name is None:
+                continue
+
+            level = len(marks)
+            has_body = NON_SPACE.search(text, body_start, match.start()) is not None
+            deeper = not stack or level > stack[-1][0]
+            if has_body or not deeper:
+                yield from self._split_section(
+                    text, section_start, match.start(), self._headers(stack)
+                )
+                section_start = match.start()
+
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, name, (match.group("title") or "").strip()))
+            body_start = match.end()
+
+        yield from self._split_section(
+            text, section_start, len(text), self._headers(stack)
+        )
+
+    @staticmethod
+    def _headers(stack: List[Tuple[int, str, str]]) -> Headers:
+        return tuple((name, title) for _, name, title in stack)
+
+    def _split_section(
+        self, text: str, start: int, end: int, headers: Headers
+    ) -> Iterator[ChunkSpan]:
+        start, end = _strip(text, start, end)
+        if start >= end:
+            return
+        if end - start <= self.chunk_size:
+            yield ChunkSpan(start, end, headers)
+            return
+
+        boundaries = [match.end() for match in SENTENCE_END.finditer(text, start, end)]
+        cut = start
+        while start < end:
+            limit = start + self.chunk_size
+            if limit >= end:
+                yield ChunkSpan(start, end, headers)
+                return
+
+            # Cutting past the previous cut guarantees every chunk adds text
+            # beyond the overlap it repeats.
+            cut = self._cut(text, boundaries, max(start, cut), limit)
+            chunk_start, chunk_end = _strip(text, start, cut)
+            if chunk_start < chunk_end:
+                yield ChunkSpan(chunk_start, chunk_end, headers)
+
+            start, _ = _strip(
+                text, self._overlap_start(text, boundaries, start, cut), end
+            )
+
+    @staticmethod
+    def _cut(text: str, boundaries: List[int], floor: int, limit: int) -> int:
+        """Last sentence boundary in `(floor, limit]`, else last space, else `limit`."""
+        index = bisect_right(boundaries, limit)
+        if index and boundaries[index - 1] > floor:
+            return boundaries[index - 1]
+        space = text.rfind(" ", floor + 1, limit)
+        return space if space > floor else limit
+
+    def _overlap_start(
+        self, text: str, boundaries: List[int], start: int, cut: int
+    ) -> int:
+        """Where the chunk after `[start, cut)` begins.
+
+        The first sentence boundary inside the overlap window, else the first
+        word boundary, so the repeated text never starts mid-word.
+        """
+        if not self.chunk_overlap:
+            return cut
+        window = max(cut - self.chunk_overlap, start + 1)
+        index = bisect_left(boundaries, window)
+        if index < len(boundaries) and boundaries[index] < cut:
+            return boundaries[index]
+        space = text.find(" ", window, cut)
+        return space + 1 if space != -1 else cut
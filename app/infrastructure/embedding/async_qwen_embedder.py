@@ -0,0 +1,172 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
+
+from app.config.settings import get_settings
+from app.core.exceptions import EmbeddingGenerationError
+from app.core.interfaces import IEmbeddedGenerator
+from app.core.logger import logger
+from app.core.metrics import get_metrics
+from app.infrastructure.embedding.qwen_embedder import parse_embedding_response
+from app.infrastructure.embedding.rate_limiter import (
+    DEFAULT_RATE_LIMIT_BACKOFF,
+    RateLimiter,
+    estimate_tokens,
+    retry_after_seconds,
+)
+
+RETRY_DELAY = 2.0
+
+
+class AsyncQwenEmbeddingGenerator(IEmbeddedGenerator):
+    """Qwen embedder on `AsyncOpenAI` with bounded concurrency and rate limiting.
+
+    Sub-batches of `embedding_batch_size` texts are sent concurrently, at most
+    `max_concurrency` at a time, and every request first takes its share of the
+    requests/min and tokens/min budget from the shared `RateLimiter`.
+
+    All requests run on one event loop owned by the embedder, so the sync
+    `IEmbeddedGenerator` methods can be called from any thread and the async
+    ones from any other event loop.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self._client = None
+        self.model = settings.qwen_embedding_model
+        self._dimension = getattr(settings, "qwen_embedding_dimension", 1024)
+        self.batch_size = settings.embedding_batch_size
+        self.max_retries = max(settings.embedding_max_retries, 1)  # attempts
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_minute=settings.embedding_requests_per_minute,
+            tokens_per_minute=settings.embedding_tokens_per_minute,
+        )
+        self._semaphore = asyncio.Semaphore(
+            max_concurrency or settings.embedding_max_concurrency
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """`AsyncOpenAI` client, created (and `openai` imported) on first request."""
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            settings = get_settings()
+            # Retries are handled here so that 429s feed the shared limiter
+            self._client = AsyncOpenAI(
+                base_url=settings.qwen_api_endpoint,
+                api_key=settings.qwen_api_key,
+                timeout=settings.embedding_timeout,
+                max_retries=0,
+            )
+        return self._client
+
+    def generate(self, text: str) -> List[float]:
+        return self.generate_batch([text])[0]
+
+    def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        return self._submit(texts).result()
+
+    async def agenerate(self, text: str) -> List[float]:
+        return (await self.agenerate_batch([text]))[0]
+
+    async def agenerate_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many texts with requests kept in flight concurrently.
+
+        Args:
+            texts: Input texts to generate embeddings for
+
+        Returns:
+            List of embeddings in the same order as `texts`
+
+        Raises:
+            APIError: If a sub-batch still fails after retries
+            ValueError: If any input text is empty
+        """
+        return await asyncio.wrap_future(self._submit(texts))
+
+    def get_dimensions(self) -> int:
+        """Get the expected embedding dimension."""
+        return self._dimension
+
+    def close(self) -> None:
+        """Stop the embedder's event loop."""
+        with self._loop_lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+
+    def _submit(self, texts: List[str]) -> Future:
+        if any(not text.strip() for text in texts):
+            raise ValueError("Input text cannot be empty")
+
+        return asyncio.run_coroutine_threadsafe(
+            self._embed_all(texts), self._get_loop()
+        )
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="embedding-loop", daemon=True
+                ).start()
+            return self._loop
+
+    async def _embed_all(self, texts: List[str]) -> List[List[float]]:
+        sub_batches = await asyncio.gather(
+            *(
+                self._embed_sub_batch(texts[start : start + self.batch_size])
+                for start in range(0, len(texts), self.batch_size)
+            )
+        )
+        return [embedding for batch in sub_batches for embedding in batch]
+
+    async def _embed_sub_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one sub-batch, retrying it alone on transient failures."""
+        from openai import APIConnectionError, APIError, RateLimitError
+
+        tokens = sum(estimate_tokens(text) for text in texts)
+        last_error: Optional[Exception] = None
+
+        for attempt in range(1, self.max_retries + 1):
+            await self.rate_limiter.acquire_async(tokens)
+            try:
+                async with self._semaphore:
+                    with get_metrics().timer("embedding_request", model=self.model):
+                        response = await self.client.embeddings.create(
+                            input=texts, model=self.model
+                        )
+                return parse_embedding_response(response, len(texts), self._dimension)
+
+            except RateLimitError as e:
+                delay = retry_after_seconds(e) or DEFAULT_RATE_LIMIT_BACKOFF
+                logger.warning(
+                    f"Embedding rate limited, backing off {delay:.1f}s (attempt {attempt}/{self.max_retries})"
+                )
+                # Pause every in-flight caller, not only this request
+                self.rate_limiter.backoff(delay)
+                get_metrics().increment("embedding_rate_limited", model=self.model)
+                last_error = e
+
+            except (APIConnectionError, APIError) as e:
+                logger.warning(
+                    f"Embedding request failed (attempt {attempt}/{self.max_retries}): {e}"
+                )
+                last_error = e
+                if attempt < self.max_retries:
+                    await asyncio.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+
+        logger.error(
+            f"Embedding generation failed for batch of {len(texts)} texts. Error: {last_error}"
+        )
+        raise EmbeddingGenerationError(
+            f"Embedding failed after {self.max_retries} attempts: {last_error}"
+        )
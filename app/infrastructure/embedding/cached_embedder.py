@@ -0,0 +1,259 @@
+import threading
+from array import array
+from datetime import datetime
+from hashlib import sha256
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import Insert
+
+from app.config.settings import get_settings
+from app.core.interfaces import IEmbeddedGenerator
+from app.core.logger import logger
+from app.core.sql_models import EmbeddingCacheEntry
+from app.infrastructure.database.database import Base, get_session_factory
+
+# Keep IN (...) lookups under SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+
+def insert_ignore(session: Session, table: Table) -> Insert:
+    """INSERT that skips rows whose primary key already exists.
+
+    A concurrent writer may have cached the same text first; its vector is
+    identical, so the duplicate is simply dropped.
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        return sqlite_insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+        return postgresql_insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with("IGNORE")
+
+
+class CachedEmbeddingGenerator(IEmbeddedGenerator):
+    """Persistent, content-addressed embedding cache in front of any embedder.
+
+    Entries are keyed by (model, dimension, sha256(text)), the same hash used
+    for `DocumentChunk.content_hash`, and evicted least-recently-used once the
+    stored vectors exceed `max_bytes`. The stored size is read from the
+    database once and then tracked in memory, so the table is only summed
+    again when an insert appears to push it past the limit.
+    """
+
+    def __init__(
+        self,
+        embedder: IEmbeddedGenerator,
+        model: str,
+        max_bytes: Optional[int] = None,
+        session_factory: Optional[sessionmaker] = None,
+    ):
+        self.embedder = embedder
+        self.model = model
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else get_settings().embedding_cache_max_bytes
+        )
+        self.session_factory = session_factory or get_session_factory()
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._size_bytes: Optional[int] = None
+        self._size_lock = threading.Lock()
+
+        Base.metadata.create_all(
+            bind=self.session_factory.kw["bind"], tables=[EmbeddingCacheEntry.__table__]
+        )
+
+    def generate(self, text: str) -> List[float]:
+        return self.generate_batch([text])[0]
+
+    def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        """Serve cached embeddings and only send misses to the wrapped embedder.
+
+        Args:
+            texts: Input texts to generate embeddings for
+
+        Returns:
+            List of embeddings in the same order as `texts`
+        """
+        hashes = [sha256(text.encode()).hexdigest() for text in texts]
+        dimension = self.get_dimensions()
+
+        with self.session_factory() as session:
+            found = self._lookup(session, set(hashes), dimension)
+
+            missing: Dict[str, str] = {
+                content_hash: text
+                for content_hash, text in zip(hashes, texts)
+                if content_hash not in found
+            }
+            miss_count = sum(1 for content_hash in hashes if content_hash in missing)
+            with self._stats_lock:
+                self.hits += len(texts) - miss_count
+                self.misses += miss_count
+
+            if missing:
+                generated = self.embedder.generate_batch(list(missing.values()))
+                new_entries = dict(zip(missing.keys(), generated))
+                inserted_bytes = self._store(session, new_entries, dimension)
+                found.update(new_entries)
+
+            self._touch(session, set(hashes) - missing.keys(), dimension)
+            session.commit()
+
+            if missing:
+                self._evict(session, inserted_bytes)
+
+        logger.debug(
+            f"Embedding cache: {len(texts) - miss_count} hits, {len(missing)} generated"
+        )
+        return [found[content_hash] for content_hash in hashes]
+
+    def get_dimensions(self) -> int:
+        return self.embedder.get_dimensions()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for this process."""
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def _lookup(
+        self, session: Session, hashes: set, dimension: int
+    ) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        ordered = list(hashes)
+        for start in range(0, len(ordered), LOOKUP_BATCH_SIZE):
+            rows = session.execute(
+                select(
+                    EmbeddingCacheEntry.content_hash, EmbeddingCacheEntry.embedding
+                ).where(
+                    EmbeddingCacheEntry.model == self.model,
+                    EmbeddingCacheEntry.dimension == dimension,
+                    EmbeddingCacheEntry.content_hash.in_(
+                        ordered[start : start + LOOKUP_BATCH_SIZE]
+                    ),
+                )
+            )
+            for content_hash, blob in rows:
+                found[content_hash] = array("f", blob).tolist()
+        return found
+
+    def _store(
+        self, session: Session, entries: Dict[str, List[float]], dimension: int
+    ) -> int:
+        """Insert new entries with one multi-row statement for the whole batch.
+
+        Returns:
+            Size in bytes of the inserted vectors, counting rows a concurrent
+            writer had already cached
+        """
+        now = datetime.now()
+        rows = []
+        for content_hash, embedding in entries.items():
+            blob = array("f", embedding).tobytes()
+            rows.append(
+                {
+                    "model": self.model,
+                    "dimension": dimension,
+                    "content_hash": content_hash,
+                    "embedding": blob,
+                    "size_bytes": len(blob),
+                    "last_accessed": now,
+                }
+            )
+        session.execute(insert_ignore(session, EmbeddingCacheEntry.__table__), rows)
+        return sum(row["size_bytes"] for row in rows)
+
+    def _touch(self, session: Session, hashes: set, dimension: int) -> None:
+        """Refresh recency for cache hits so eviction stays LRU."""
+        ordered = list(hashes)
+        now = datetime.now()
+        for start in range(0, len(ordered), LOOKUP_BATCH_SIZE):
+            session.execute(
+                update(EmbeddingCacheEntry)
+                .where(
+                    EmbeddingCacheEntry.model == self.model,
+                    EmbeddingCacheEntry.dimension == dimension,
+                    EmbeddingCacheEntry.content_hash.in_(
+                        ordered[start : start + LOOKUP_BATCH_SIZE]
+                    ),
+                )
+                .values(last_accessed=now)
+            )
+
+    def _total_bytes(self, session: Session) -> int:
+        return session.scalar(select(func.sum(EmbeddingCacheEntry.size_bytes))) or 0
+
+    def _evict(self, session: Session, inserted_bytes: int) -> None:
+        """Drop least-recently-used entries until the cache fits in `max_bytes`.
+
+        Args:
+            session: Session whose inserts have been committed
+            inserted_bytes: Size of the entries just inserted
+        """
+        with self._size_lock:
+            if self._size_bytes is None:
+                self._size_bytes = self._total_bytes(session)
+            else:
+                self._size_bytes += inserted_bytes
+            if self._size_bytes <= self.max_bytes:
+                return
+
+            # The running total overcounts ignored duplicates and misses other
+            # processes' writes; recount before deleting anything
+            self._size_bytes = self._total_bytes(session)
+            excess = self._size_bytes - self.max_bytes
+            if excess <= 0:
+                return
+            freed, evicted = self._evict_lru(session, excess)
+            self._size_bytes -= freed
+
+        logger.info(f"Embedding cache evicted {evicted} entries ({freed} bytes)")
+
+    def _evict_lru(self, session: Session, excess: int) -> Tuple[int, int]:
+        """Delete the least-recently-used entries holding at least `excess` bytes.
+
+        Returns:
+            Bytes freed and number of entries deleted
+        """
+        victims = []
+        freed = 0
+        rows = session.execute(
+            select(
+                EmbeddingCacheEntry.model,
+                EmbeddingCacheEntry.dimension,
+                EmbeddingCacheEntry.content_hash,
+                EmbeddingCacheEntry.size_bytes,
+            ).order_by(EmbeddingCacheEntry.last_accessed)
+        )
+        for model, dimension, content_hash, size_bytes in rows:
+            victims.append((model, dimension, content_hash))
+            freed += size_bytes
+            if freed >= excess:
+                break
+
+        for start in range(0, len(victims), LOOKUP_BATCH_SIZE):
+            session.execute(
+                delete(EmbeddingCacheEntry).where(
+                    tuple_(
+                        EmbeddingCacheEntry.model,
+                        EmbeddingCacheEntry.dimension,
+                        EmbeddingCacheEntry.content_hash,
+                    ).in_(victims[start : start + LOOKUP_BATCH_SIZE])
+                )
+            )
+        session.commit()
+        return freed, len(victims)
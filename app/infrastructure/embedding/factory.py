@@ -1,12 +1,32 @@
-from app.config.settings import settings
+from app.config.settings import get_settings
 from app.core.interfaces import IEmbeddedGenerator
-from app.infrastructure.embedding.qwen_embedder import QwenEmbeddingGenerator
 
 
 class EmbeddingFactory:
+    """Builds the configured embedder, importing only the selected backend."""
+
     @staticmethod
     def create_embedder() -> IEmbeddedGenerator:
-        embedding_adaptor = settings.embedding_adaptor
+        embedding_adaptor = get_settings().embedding_adaptor
         if embedding_adaptor == "qwen":
-            return QwenEmbeddingGenerator()
-        raise ValueError(f"Invalid embedding model: {embedding_adaptor}")
+            from app.infrastructure.embedding.qwen_embedder import (
+                QwenEmbeddingGenerator,
+            )
+
+            embedder = QwenEmbeddingGenerator()
+        elif embedding_adaptor == "qwen_async":
+            from app.infrastructure.embedding.async_qwen_embedder import (
+                AsyncQwenEmbeddingGenerator,
+            )
+
+            embedder = AsyncQwenEmbeddingGenerator()
+        else:
+            raise ValueError(f"Invalid embedding model: {embedding_adaptor}")
+
+        if get_settings().embedding_cache_enabled:
+            from app.infrastructure.embedding.cached_embedder import (
+                CachedEmbeddingGenerator,
+            )
+
+            return CachedEmbeddingGenerator(embedder, model=embedder.model)
+        return embedder
@@ -1,21 +1,85 @@
-from typing import List
-from openai import OpenAI, APIConnectionError, APIError
-from retry import retry
-from app.config.settings import settings
+import time
+from typing import TYPE_CHECKING, Callable, List, Optional, TypeVar
+from app.config.settings import get_settings
 from app.core.exceptions import EmbeddingGenerationError
 from app.core.interfaces import IEmbeddedGenerator
 from app.core.logger import logger
+from app.core.metrics import get_metrics
+from app.infrastructure.embedding.rate_limiter import (
+    DEFAULT_RATE_LIMIT_BACKOFF,
+    RateLimiter,
+    estimate_tokens,
+    retry_after_seconds,
+)
 
+if TYPE_CHECKING:
+    from openai.types import CreateEmbeddingResponse
 
-class QwenEmbeddingGenerator(IEmbeddedGenerator):
-    def __init__(self):
-        self.client = OpenAI(
-            base_url=settings.qwen_api_endpoint, api_key=settings.qwen_api_key
+RETRY_DELAY = 2
+RETRY_BACKOFF = 2
+
+T = TypeVar("T")
+
+
+def parse_embedding_response(
+    response: "CreateEmbeddingResponse", expected: int, dimension: int
+) -> List[List[float]]:
+    """Validate a multi-input embeddings response and return vectors in input order."""
+    if not response.data or len(response.data) != expected:
+        raise EmbeddingGenerationError(
+            f"Invalid embedding response. Expected {expected} embeddings, got {len(response.data or [])}"
         )
+
+    # The API tags every embedding with its input index; don't rely on response order
+    embeddings = [
+        item.embedding for item in sorted(response.data, key=lambda item: item.index)
+    ]
+
+    for embedding in embeddings:
+        if len(embedding) != dimension:
+            raise EmbeddingGenerationError(
+                f"Embedding dimenstion mismatch. Expected {dimension}, got {len(embedding)}"
+            )
+
+    return embeddings
+
+
+class QwenEmbeddingGenerator(IEmbeddedGenerator):
+    """Blocking Qwen embedder.
+
+    Every request, retries included, first takes its share of the
+    requests/min and tokens/min budget from `rate_limiter`, so threads sharing
+    one embedder stay within the provider's limits together.
+    """
+
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None):
+        settings = get_settings()
+        self._client = None
         self.model = settings.qwen_embedding_model
         self._dimension = getattr(settings, "qwen_embedding_dimension", 1024)
+        self.batch_size = settings.embedding_batch_size
+        self.max_retries = max(settings.embedding_max_retries, 1)  # attempts
+        self.rate_limiter = rate_limiter or RateLimiter(
+            requests_per_minute=settings.embedding_requests_per_minute,
+            tokens_per_minute=settings.embedding_tokens_per_minute,
+        )
+
+    @property
+    def client(self):
+        """OpenAI-compatible client, created (and `openai` imported) on first request."""
+        if self._client is None:
+            from openai import OpenAI
+
+            settings = get_settings()
+            # Retries are handled in `_request` so that they go through the limiter
+            self._client = OpenAI(
+                base_url=settings.qwen_api_endpoint,
+                api_key=settings.qwen_api_key,
+                timeout=settings.embedding_timeout,
+                max_retries=0,
+            )
+        return self._client
 
-    @retry(tries=3, delay=2, backoff=2, exceptions=(APIConnectionError, APIError))
     def generate(self, text: str) -> List[float]:
         """Generate embeddings for the given text.
 
@@ -32,6 +96,10 @@ class QwenEmbeddingGenerator(IEmbeddedGenerator):
         if not text.strip():
             raise ValueError("Input text cannot be empty")
 
+        return self._request(lambda: self._generate_single(text), estimate_tokens(text))
+
+    def _generate_single(self, text: str) -> List[float]:
+        """Embed one text with one API request."""
         try:
             response = self.client.embeddings.create(input=text, model=self.model)
 
@@ -56,6 +124,81 @@ class QwenEmbeddingGenerator(IEmbeddedGenerator):
             )
             raise
 
+    def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many texts using multi-input requests.
+
+        Texts are sent in sub-batches of `embedding_batch_size`. Each sub-batch
+        is retried on its own, so a transient failure only repeats that request.
+
+        Args:
+            texts: Input texts to generate embeddings for
+
+        Returns:
+            List of embeddings in the same order as `texts`
+
+        Raises:
+            APIError: If a sub-batch still fails after retries
+            ValueError: If any input text is empty
+        """
+        if any(not text.strip() for text in texts):
+            raise ValueError("Input text cannot be empty")
+
+        embeddings: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            sub_batch = texts[start : start + self.batch_size]
+            embeddings.extend(
+                self._request(
+                    lambda: self._generate_sub_batch(sub_batch),
+                    sum(estimate_tokens(text) for text in sub_batch),
+                )
+            )
+
+        return embeddings
+
+    def _generate_sub_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a single sub-batch with one API request."""
+        try:
+            response = self.client.embeddings.create(input=texts, model=self.model)
+
+            return parse_embedding_response(response, len(texts), self._dimension)
+
+        except Exception as e:
+            logger.error(
+                f"Embedding generation failed for batch of {len(texts)} texts. Error: {str(e)}"
+            )
+            raise
+
+    def _request(self, send: Callable[[], T], tokens: int) -> T:
+        """Run one API request under the rate limit, retrying transient failures.
+
+        Every attempt takes its share of the budget from `rate_limiter` and is
+        timed as an `embedding_request`. A 429 pauses every user of the shared
+        limiter for the `Retry-After` delay, which the retry then waits out in
+        `acquire`; other API errors are retried after an exponential delay.
+        """
+        from openai import APIConnectionError, APIError, RateLimitError
+
+        for attempt in range(1, self.max_retries + 1):
+            self.rate_limiter.acquire(tokens)
+            try:
+                with get_metrics().timer("embedding_request", model=self.model):
+                    return send()
+
+            except RateLimitError as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = retry_after_seconds(e) or DEFAULT_RATE_LIMIT_BACKOFF
+                logger.warning(
+                    f"Embedding rate limited, backing off {delay:.1f}s (attempt {attempt}/{self.max_retries})"
+                )
+                self.rate_limiter.backoff(delay)
+                get_metrics().increment("embedding_rate_limited", model=self.model)
+
+            except (APIConnectionError, APIError):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(RETRY_DELAY * RETRY_BACKOFF ** (attempt - 1))
+
     def get_dimensions(self) -> int:
         """Get the expected embedding dimension."""
         return self._dimension
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Fallback pause after a 429 without a usable Retry-After header
+DEFAULT_RATE_LIMIT_BACKOFF = 5.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate for budgeting; 429 backpressure covers the error."""
+    return max(1, len(text) // 4)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read `Retry-After` (seconds or HTTP date) or `retry-after-ms` from an API error."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    if retry_after_ms := headers.get("retry-after-ms"):
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Continuously refilling bucket. Not thread-safe on its own."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take `amount` tokens and return how long the caller must wait for them.
+
+        The balance may go negative so that concurrent callers queue up behind
+        each other instead of all waking at the same moment.
+        """
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.refill_per_second,
+        )
+        self.updated_at = now
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.refill_per_second
+
+
+class RateLimiter:
+    """Requests/min and tokens/min budget shared by threads and event loops.
+
+    Provider backpressure (HTTP 429 with `Retry-After`) is applied through
+    `backoff`, which pauses every caller of the limiter, not only the one that
+    was throttled.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self.requests.reserve(1, now),
+                self.tokens.reserve(tokens, now),
+                self._blocked_until - now,
+            )
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Block the current thread until one request of `tokens` fits the budget."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+        """Await until one request of `tokens` fits the budget."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def backoff(self, seconds: float) -> None:
+        """Pause all callers for `seconds`, e.g. after a 429 response."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
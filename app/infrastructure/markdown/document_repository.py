@@ -1,18 +1,19 @@
-from typing import List
-from app.core.documents import DocumentChunk, DocumentMetadata
-from app.core.interfaces import IDocumentRepository, IEmbeddedGenerator
+from typing import Iterable, Iterator, List
+from app.core.documents import ChunkDraft, DocumentMetadata
+from app.core.interfaces import IDocumentRepository
 from app.core.logger import logger
+from app.infrastructure.document_conversion.document_converter import MarkdownPage
 from app.infrastructure.markdown.processor import MarkdownProcessor
 
 
 class MarkdownDocumentRepository(IDocumentRepository):
     """Markdown processing implementation with chunking"""
 
-    def __init__(self, embedder: IEmbeddedGenerator):
-        self.processor = MarkdownProcessor(embedder=embedder)
+    def __init__(self):
+        self.processor = MarkdownProcessor()
         self.validation_enabled = True
 
-    def process(self, content: str, metadata: DocumentMetadata) -> List[DocumentChunk]:
+    def process(self, content: str, metadata: DocumentMetadata) -> List[ChunkDraft]:
         try:
             if not content.strip():
                 logger.warning("Empty content received for processing")
@@ -23,3 +24,21 @@ class MarkdownDocumentRepository(IDocumentRepository):
         except Exception as e:
             logger.error(f"Document processing failed: {e}")
             raise
+
+    def iter_process(
+        self, content: str, metadata: DocumentMetadata
+    ) -> Iterator[ChunkDraft]:
+        if not content.strip():
+            logger.warning("Empty content received for processing")
+            return
+
+        yield from self.processor.iter_process(
+            content=content, source_metadata=metadata
+        )
+
+    def iter_process_pages(
+        self, pages: Iterable[MarkdownPage], metadata: DocumentMetadata
+    ) -> Iterator[ChunkDraft]:
+        yield from self.processor.iter_process_pages(
+            pages=pages, source_metadata=metadata
+        )
@@ -1,36 +1,57 @@
-from dataclasses import asdict
-from typing import List
+from dataclasses import asdict, replace
+from typing import Iterable, Iterator, List, Optional
 
-from langchain_core.documents import Document
-from langchain_text_splitters import (
-    MarkdownHeaderTextSplitter,
-    RecursiveCharacterTextSplitter,
-)
 from tqdm import tqdm
 
-from app.config.settings import settings
-from app.core.documents import DocumentMetadata, DocumentChunk
+from app.config.settings import ChunkerTypes, get_settings
+from app.core.documents import ChunkDraft, DocumentMetadata
 from app.core.logger import logger
+from app.infrastructure.document_conversion.document_converter import MarkdownPage
+from app.infrastructure.document_conversion.page_index import (
+    PAGE_BREAK,
+    ChunkLocator,
+    PageIndex,
+    strip_page_breaks,
+)
+from app.infrastructure.document_conversion.sentence_boundary_chunking import (
+    SentenceBoundaryChunker,
+)
 
 
 class MarkdownProcessor:
     def __init__(
         self,
-        embedder,
         headers_to_split=None,
-        chunk_size=settings.chunk_size,
-        chunk_overlap=settings.chunk_overlap,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        chunker: Optional[ChunkerTypes] = None,
     ):
+        settings = get_settings()
+        if chunk_size is None:
+            chunk_size = settings.chunk_size
+        if chunk_overlap is None:
+            chunk_overlap = settings.chunk_overlap
         if headers_to_split is None:
             headers_to_split = [("#", "Header1"), ("##", "Header2"), ("###", "Header3")]
 
+        self.sentence_chunker: Optional[SentenceBoundaryChunker] = None
+        if (chunker or settings.chunker) == "sentence":
+            self.sentence_chunker = SentenceBoundaryChunker(
+                headers_to_split, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            )
+            return
+
+        from langchain_text_splitters import (
+            MarkdownHeaderTextSplitter,
+            RecursiveCharacterTextSplitter,
+        )
+
         self.header_splitter = MarkdownHeaderTextSplitter(
             headers_to_split_on=headers_to_split, strip_headers=False
         )
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len
         )
-        self.embedder = embedder
 
     def _build_section_hierarchy(self, metadata: dict) -> str:
         """Build section hierarchy from header metadata."""
@@ -53,13 +74,26 @@ class MarkdownProcessor:
 
     def process(
         self, content: str, source_metadata: DocumentMetadata
-    ) -> List[DocumentChunk]:
+    ) -> List[ChunkDraft]:
+        return list(self.iter_process(content, source_metadata))
+
+    def iter_process(
+        self, content: str, source_metadata: DocumentMetadata
+    ) -> Iterator[ChunkDraft]:
+        """Yield chunk drafts one at a time so downstream stages can start early."""
         # Convert dataclass to dict First
         source_metadata_dict = asdict(source_metadata)
         logger.info(f"Processing content length: {len(content)} characters")
         logger.debug(f"Content sample: {content[:200]}...")
 
-        print(content)
+        if self.sentence_chunker is not None:
+            yield from self._iter_sentence_chunks(
+                content, source_metadata, source_metadata_dict
+            )
+            return
+
+        from langchain_core.documents import Document
+
         # Test
         # test_split = self.header_splitter.split_text("# Test\nContent")
         # logger.info(f"Test header split result: {len(test_split)} chunks")
@@ -79,7 +113,10 @@ class MarkdownProcessor:
             logger.warning("No header splits. Creating single chunk from full content")
             header_splits = [Document(page_content=content, metadata={})]
 
-        final_chunks = []
+        # Paged Markdown (see `PageIndex`): locate chunks to fill page_range
+        pages = ChunkLocator(content) if PAGE_BREAK in content else None
+
+        chunk_count = 0
         for split in tqdm(header_splits, desc="Splitting content"):
             if not split.page_content.strip():
                 logger.debug("Skipping empty split")
@@ -107,34 +144,93 @@ class MarkdownProcessor:
                 if not text_split.page_content.strip():
                     continue
 
-                chunk_metadata = self._convert_metadata(
-                    {**combine_metadata, **text_split.metadata}
-                )
+                split_metadata = {**combine_metadata, **text_split.metadata}
+                if pages is not None:
+                    split_metadata["page_range"] = pages.page_range(
+                        text_split.page_content
+                    )
+                chunk_metadata = self._convert_metadata(split_metadata)
                 logger.debug(
                     "Processign chunk metadata",
                     extra={"chunk_metadata": chunk_metadata},
                 )
 
-                embedding = self.embedder.generate(text_split.page_content)
-                final_chunks.append(
-                    DocumentChunk(
-                        content=text_split.page_content,
-                        metadata=chunk_metadata,
-                        source_id=source_metadata.zotero_id,
-                        embedding=embedding,
-                    )
+                chunk_count += 1
+                yield ChunkDraft(
+                    content=strip_page_breaks(text_split.page_content),
+                    metadata=chunk_metadata,
+                    source_id=source_metadata.zotero_id,
                 )
 
         # Add before final return
-        if not final_chunks:
-            logger.critical("No chunks generated - creating minimal emergency chunk")
-            emergency_content = content.strip() or "Empty document content"
-            return [
-                DocumentChunk(
-                    content=emergency_content[:1000],
-                    metadata=source_metadata,
-                    source_id=source_metadata.zotero_id,
-                    embedding=self.embedder.generate(emergency_content[:1000]),
-                )
-            ]
-        return final_chunks
+        if not chunk_count:
+            yield self._emergency_chunk(content, source_metadata)
+
+    def iter_process_pages(
+        self, pages: Iterable[MarkdownPage], source_metadata: DocumentMetadata
+    ) -> Iterator[ChunkDraft]:
+        """Chunk a document delivered page by page or chapter by chapter.
+
+        Each page is chunked as soon as it arrives, so with a lazy source such
+        as `EpubToMarkdownConverter.iter_chapters` the first chunks are ready
+        before the rest of the book is converted. A page's `chapter` and
+        `page` take precedence over what the headers inside it say.
+        """
+        for page in pages:
+            if not page.content.strip():
+                continue
+
+            overrides = {}
+            if page.chapter:
+                overrides["chapter"] = page.chapter
+            if page.page is not None:
+                overrides["page_range"] = str(page.page)
+
+            for draft in self.iter_process(page.content, source_metadata):
+                if overrides:
+                    draft = replace(
+                        draft, metadata=replace(draft.metadata, **overrides)
+                    )
+                yield draft
+
+    def _iter_sentence_chunks(
+        self,
+        content: str,
+        source_metadata: DocumentMetadata,
+        source_metadata_dict: dict,
+    ) -> Iterator[ChunkDraft]:
+        """Chunk with the native chunker, slicing each chunk's text out of `content` once.
+
+        Paged Markdown (see `PageIndex`) also gets each chunk's page range
+        from its offsets, including chunks that cross a page break.
+        """
+        pages = PageIndex.from_markdown(content) if PAGE_BREAK in content else None
+
+        chunk_count = 0
+        for span in self.sentence_chunker.iter_spans(content):
+            chunk_metadata = {**source_metadata_dict, **dict(span.headers)}
+            if pages is not None:
+                chunk_metadata["page_range"] = pages.page_range(span.start, span.end)
+
+            chunk_count += 1
+            yield ChunkDraft(
+                content=strip_page_breaks(span.text(content)),
+                metadata=self._convert_metadata(chunk_metadata),
+                source_id=source_metadata.zotero_id,
+            )
+
+        if not chunk_count:
+            yield self._emergency_chunk(content, source_metadata)
+
+    def _emergency_chunk(
+        self, content: str, source_metadata: DocumentMetadata
+    ) -> ChunkDraft:
+        logger.critical("No chunks generated - creating minimal emergency chunk")
+        emergency_content = (
+            strip_page_breaks(content).strip() or "Empty document content"
+        )
+        return ChunkDraft(
+            content=emergency_content[:1000],
+            metadata=source_metadata,
+            source_id=source_metadata.zotero_id,
+        )
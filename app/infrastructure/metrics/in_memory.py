@@ -0,0 +1,70 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from app.core.metrics import IMetrics
+
+Labels = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, Labels]
+
+
+@dataclass
+class TimingStats:
+    count: int = 0
+    total: float = 0.0
+    min: float = float("inf")
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+def _series(name: str, labels: Dict[str, str]) -> SeriesKey:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class InMemoryMetrics(IMetrics):
+    """Thread-safe collector keeping counters and timing summaries per label set."""
+
+    def __init__(self):
+        self.counters: Dict[SeriesKey, float] = {}
+        self.timings: Dict[SeriesKey, TimingStats] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = _series(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = _series(name, labels)
+        with self._lock:
+            self.timings.setdefault(key, TimingStats()).add(seconds)
+
+    def snapshot(self) -> Tuple[Dict[SeriesKey, float], Dict[SeriesKey, TimingStats]]:
+        """Consistent copies of the counters and timings."""
+        with self._lock:
+            return dict(self.counters), {
+                key: TimingStats(stats.count, stats.total, stats.min, stats.max)
+                for key, stats in self.timings.items()
+            }
+
+    def stage_totals(self) -> Dict[str, float]:
+        """Total seconds per timed stage, summed over labels."""
+        _, timings = self.snapshot()
+        totals: Dict[str, float] = {}
+        for (name, _), stats in timings.items():
+            totals[name] = totals.get(name, 0.0) + stats.total
+        return totals
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.timings.clear()
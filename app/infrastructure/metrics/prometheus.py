@@ -0,0 +1,63 @@
+import re
+from typing import Dict, List
+
+from app.infrastructure.metrics.in_memory import InMemoryMetrics, Labels
+
+INVALID_NAME_CHARACTERS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _metric_name(namespace: str, name: str, suffix: str) -> str:
+    return INVALID_NAME_CHARACTERS.sub("_", f"{namespace}_{name}_{suffix}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Exact sample value: integers as written, floats with full precision."""
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def render_prometheus(metrics: InMemoryMetrics, namespace: str = "semantics") -> str:
+    """Render collected metrics in the Prometheus text exposition format.
+
+    Counters become `<namespace>_<name>_total` and timings become summaries
+    named `<namespace>_<name>_seconds` with `_count` and `_sum` series.
+    """
+    counters, timings = metrics.snapshot()
+    lines: List[str] = []
+
+    grouped_counters: Dict[str, List[str]] = {}
+    for (name, labels), value in sorted(counters.items()):
+        metric = _metric_name(namespace, name, "total")
+        grouped_counters.setdefault(metric, []).append(
+            f"{metric}{_format_labels(labels)} {_format_value(value)}"
+        )
+    for metric, samples in grouped_counters.items():
+        lines.append(f"# TYPE {metric} counter")
+        lines.extend(samples)
+
+    grouped_timings: Dict[str, List[str]] = {}
+    for (name, labels), stats in sorted(timings.items()):
+        metric = _metric_name(namespace, name, "seconds")
+        rendered = _format_labels(labels)
+        grouped_timings.setdefault(metric, []).extend(
+            [
+                f"{metric}_count{rendered} {stats.count}",
+                f"{metric}_sum{rendered} {_format_value(stats.total)}",
+            ]
+        )
+    for metric, samples in grouped_timings.items():
+        lines.append(f"# TYPE {metric} summary")
+        lines.extend(samples)
+
+    return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,180 @@
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.documents import DocumentChunk
+from app.core.exceptions import VectorStoreError
+from app.core.logger import logger
+from app.core.sql_models import LexicalChunk
+from app.infrastructure.database.database import Base, get_session_factory
+from app.infrastructure.vector_store.serialization import serialize_metadata
+
+# Keep IN (...) lookups under SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query: str) -> str:
+    """Turn free text into an FTS5 MATCH expression ORing every quoted term.
+
+    Quoting keeps punctuation and FTS5 keywords (AND, NEAR, ...) in user input
+    from being parsed as query syntax.
+    """
+    terms = dict.fromkeys(token.lower() for token in TOKEN_PATTERN.findall(query))
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class BM25Index:
+    """BM25 inverted index over chunk text, stored in SQLite FTS5.
+
+    Chunks are keyed by `chunk_id`, the same id the vector stores use.
+    The text lives in the `lexical_chunks` table and the postings in the
+    `chunk_fts` FTS5 table, whose rowids match `lexical_chunks.id`. Both are
+    updated per upsert; FTS5 merges its segments incrementally.
+    """
+
+    def __init__(self, session_factory: Optional[sessionmaker] = None):
+        self.session_factory = session_factory or get_session_factory()
+        engine = self.session_factory.kw["bind"]
+        if engine.dialect.name != "sqlite":
+            raise VectorStoreError(
+                f"BM25 index needs SQLite FTS5, got a {engine.dialect.name} database"
+            )
+
+        Base.metadata.create_all(bind=engine, tables=[LexicalChunk.__table__])
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS chunk_fts USING fts5("
+                    "content, tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            )
+
+    def add(self, chunks: List[DocumentChunk]) -> None:
+        """Index chunks; already indexed ids only get their source and metadata updated."""
+        unique_chunks = {chunk.chunk_id: chunk for chunk in chunks}
+        if not unique_chunks:
+            return
+
+        ids = list(unique_chunks)
+        with self.session_factory() as session:
+            existing: Dict[str, LexicalChunk] = {}
+            for start in range(0, len(ids), LOOKUP_BATCH_SIZE):
+                for record in session.scalars(
+                    select(LexicalChunk).where(
+                        LexicalChunk.chunk_id.in_(
+                            ids[start : start + LOOKUP_BATCH_SIZE]
+                        )
+                    )
+                ):
+                    existing[record.chunk_id] = record
+
+            new_records = []
+            for chunk_id, chunk in unique_chunks.items():
+                metadata_json = json.dumps(serialize_metadata(chunk.metadata))
+                record = existing.get(chunk_id)
+                if record is not None:
+                    # Same content hash means same text, so the postings are unchanged
+                    record.source_id = chunk.source_id
+                    record.metadata_json = metadata_json
+                    continue
+                new_records.append(
+                    LexicalChunk(
+                        chunk_id=chunk_id,
+                        source_id=chunk.source_id,
+                        content=chunk.content,
+                        metadata_json=metadata_json,
+                    )
+                )
+
+            session.add_all(new_records)
+            session.flush()
+            if new_records:
+                session.execute(
+                    text(
+                        "INSERT INTO chunk_fts(rowid, content) VALUES (:id, :content)"
+                    ),
+                    [{"id": r.id, "content": r.content} for r in new_records],
+                )
+            session.commit()
+
+        logger.debug(
+            f"Indexed {len(new_records)} new chunks, {len(existing)} already present"
+        )
+
+    def delete_source(
+        self, source_id: str, keep: Optional[Iterable[str]] = None
+    ) -> None:
+        """Drop every indexed chunk of a source document, except the chunk ids in `keep`."""
+        keep = set(keep or ())
+        with self.session_factory() as session:
+            rowids = [
+                rowid
+                for rowid, chunk_id in session.execute(
+                    select(LexicalChunk.id, LexicalChunk.chunk_id).where(
+                        LexicalChunk.source_id == source_id
+                    )
+                )
+                if chunk_id not in keep
+            ]
+            if not rowids:
+                return
+            session.execute(
+                text("DELETE FROM chunk_fts WHERE rowid = :id"),
+                [{"id": rowid} for rowid in rowids],
+            )
+            for start in range(0, len(rowids), LOOKUP_BATCH_SIZE):
+                session.execute(
+                    delete(LexicalChunk).where(
+                        LexicalChunk.id.in_(rowids[start : start + LOOKUP_BATCH_SIZE])
+                    )
+                )
+            session.commit()
+
+        logger.debug(f"Removed {len(rowids)} chunks of {source_id} from the BM25 index")
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[str, float]]:
+        """Best-matching chunk ids for a text query.
+
+        Returns:
+            (chunk_id, bm25 score) pairs, best first; higher scores are better
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        with self.session_factory() as session:
+            rows = session.execute(
+                text(
+                    "SELECT lexical_chunks.chunk_id, bm25(chunk_fts) FROM chunk_fts "
+                    "JOIN lexical_chunks ON lexical_chunks.id = chunk_fts.rowid "
+                    "WHERE chunk_fts MATCH :match ORDER BY bm25(chunk_fts) LIMIT :limit"
+                ),
+                {"match": match, "limit": limit},
+            )
+            # FTS5 reports BM25 negated so that ascending order is best first
+            return [(chunk_id, -score) for chunk_id, score in rows]
+
+    def get_many(self, chunk_ids: List[str]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Stored content and serialized metadata for indexed chunk ids."""
+        records: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        with self.session_factory() as session:
+            for start in range(0, len(chunk_ids), LOOKUP_BATCH_SIZE):
+                rows = session.execute(
+                    select(
+                        LexicalChunk.chunk_id,
+                        LexicalChunk.content,
+                        LexicalChunk.metadata_json,
+                    ).where(
+                        LexicalChunk.chunk_id.in_(
+                            chunk_ids[start : start + LOOKUP_BATCH_SIZE]
+                        )
+                    )
+                )
+                for chunk_id, content, metadata_json in rows:
+                    records[chunk_id] = (content, json.loads(metadata_json))
+        return records
@@ -1,43 +1,70 @@
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
 
-from pydantic import validate_call
 
-
-from app.config.settings import settings
+from app.config.settings import get_settings
 from app.core.exceptions import VectorStoreError
 from app.core.logger import logger
-from app.core.documents import DocumentChunk, DocumentMetadata
+from app.core.documents import DocumentChunk, SearchHit
 from app.core.interfaces import IVectorStoreRepository
-import chromadb
+from app.infrastructure.vector_store.serialization import (
+    deserialize_metadata,
+    serialize_metadata,
+)
+import numpy as np
 
 
 class ChromaAdaptor(IVectorStoreRepository):
     def __init__(self, collection_name: str, persist_dir: Optional[str] = None):
-        """Initialize Chroma client and collection
+        """Configure the Chroma collection
+
+        chromadb is imported and the persistent client opened on first use, so
+        constructing the adaptor is free for commands that never touch it.
 
         Args:
         collection_name: Name of the collection to use
         persist_dir: Directory to persist data (default from settings)
         """
-        print(settings.chroma_persist_dir)
-        self.client = chromadb.PersistentClient(
-            path=persist_dir
-            if persist_dir
-            else settings.chroma_persist_dir,  # TODO change to settings
-        )
-
-        try:
-            self.collection = self.client.get_or_create_collection(
-                name=collection_name, metadata={"hnsw:space": "cosine"}
-            )
-        except Exception as e:
-            logger.error(f"Failed to Initialize Chroma collection: {e}")
-            raise VectorStoreError(f"Failed to Initialize Chroma: {e}")
-
-        logger.info(f"Initialized Chroma collection '{collection_name}'")
+        self.collection_name = collection_name
+        self.persist_dir = persist_dir or get_settings().chroma_persist_dir
+        self._client = None
+        self._collection = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The chromadb PersistentClient, created on first access."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import chromadb
+
+                    self._client = chromadb.PersistentClient(path=self.persist_dir)
+        return self._client
+
+    @property
+    def collection(self):
+        """The Chroma collection, created on first access."""
+        if self._collection is None:
+            client = self.client
+            with self._lock:
+                if self._collection is None:
+                    try:
+                        self._collection = client.get_or_create_collection(
+                            name=self.collection_name,
+                            metadata={"hnsw:space": "cosine"},
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to Initialize Chroma collection: {e}")
+                        raise VectorStoreError(f"Failed to Initialize Chroma: {e}")
+
+                    logger.info(
+                        f"Initialized Chroma collection '{self.collection_name}'"
+                    )
+        return self._collection
 
-    @validate_call
     def upsert_chunk(self, chunk: DocumentChunk) -> None:
         """Single chunk upsert (uses batch internally)
 
@@ -46,150 +73,232 @@ class ChromaAdaptor(IVectorStoreRepository):
         """
         self.upsert_chunks([chunk])
 
-    @validate_call
     def upsert_chunks(self, chunks: List[DocumentChunk]) -> None:
         """Batch upsert chunks with error handling
 
+        Chunks are deduplicated by content hash and written in batches capped by
+        `chroma_upsert_batch_size` and Chroma's own max batch size. Each batch's
+        metadata is serialized on a helper thread while the previous batch is
+        being written.
+
         Args:
             chunks: List of DocumentChunks to upsert
 
         Raises:
             ValueError: If input validation fails
-            Exception: If upsert operation fails
+            VectorStoreError: If upsert operation fails
         """
 
         if not chunks:
             logger.debug("No chunks to upsert")
             return
 
-        batch_size = len(chunks)
-        ids = []
-        embeddings = []
-        documents = []
-        metadatas = []
-
-        unique_chunks = list({chunk.content_hash: chunk for chunk in chunks}.values())
+        unique_chunks = list({chunk.chunk_id: chunk for chunk in chunks}.values())
 
         if len(unique_chunks) != len(chunks):
             logger.warning(
                 f"Original number of chunks: {len(chunks)}, number of unique chunks: {len(unique_chunks)} "
             )
         else:
-            logger.debug(f"Preparing to upsert {batch_size} chunks")
+            logger.debug(f"Preparing to upsert {len(chunks)} chunks")
 
-        for chunk in chunks:
-            if not chunk.content_hash or not chunk.content:
-                raise ValueError("Chunk must have content and content_hash")
+        batch_size = min(
+            get_settings().chroma_upsert_batch_size, self.client.get_max_batch_size()
+        )
+        batches = [
+            unique_chunks[start : start + batch_size]
+            for start in range(0, len(unique_chunks), batch_size)
+        ]
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=1) as serializer:
+            pending = serializer.submit(self._serialize_batch, batches[0])
+            for index, batch in enumerate(batches):
+                payload = pending.result()
+                if index + 1 < len(batches):
+                    pending = serializer.submit(
+                        self._serialize_batch, batches[index + 1]
+                    )
+
+                batch_started = time.perf_counter()
+                try:
+                    self.collection.upsert(**payload)
+                except Exception as e:
+                    logger.error(f"Failed to upsert batch of {len(batch)} chunks: {e}")
+                    raise VectorStoreError(f"Upsert failed: {e}")
 
-            meta = {
-                key: (value.isoformat() if isinstance(value, datetime) else str(value))
-                for key, value in chunk.metadata.__dict__.items()
-            }
+                logger.debug(
+                    f"Upserted batch {index + 1}/{len(batches)} ({len(batch)} chunks) in {(time.perf_counter() - batch_started) * 1000:.1f} ms"
+                )
+
+        logger.debug(
+            f"Successfully upserted {len(unique_chunks)} chunks in {len(batches)} batches, {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
 
-            ids.append(chunk.content_hash)
-            embeddings.append(chunk.embedding)
+    def _serialize_batch(self, chunks: List[DocumentChunk]) -> Dict[str, list]:
+        """Build the column lists Chroma expects for one batch."""
+        ids = []
+        embeddings = []
+        documents = []
+        metadatas = []
+
+        for chunk in chunks:
+            if not chunk.chunk_id or not chunk.content:
+                raise ValueError("Chunk must have content and chunk_id")
+
+            ids.append(chunk.chunk_id)
+            # Zero-copy view over the chunk's float32 buffer
+            embeddings.append(np.frombuffer(chunk.embedding, dtype=np.float32))
             documents.append(chunk.content)
-            metadatas.append(meta)
+            metadatas.append(serialize_metadata(chunk.metadata))
 
-        try:
-            self.collection.upsert(
-                ids=ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas,
-            )
-            logger.debug(f"Successfully upserted {batch_size} chunks.")
+        return {
+            "ids": ids,
+            "embeddings": embeddings,
+            "documents": documents,
+            "metadatas": metadatas,
+        }
+
+    def delete_source(
+        self, source_id: str, keep: Optional[Iterable[str]] = None
+    ) -> None:
+        """Remove every chunk that belongs to a source document
 
+        Args:
+            source_id: Zotero key of the source document
+            keep: Chunk ids (content hashes) of the source to leave in place,
+                e.g. the chunks just stored by a re-ingest
+        """
+        try:
+            if keep is None:
+                self.collection.delete(where={"zotero_id": source_id})
+                logger.debug(f"Deleted chunks of {source_id}")
+                return
+
+            keep = set(keep)
+            stored = self.collection.get(where={"zotero_id": source_id}, include=[])
+            stale = [chunk_id for chunk_id in stored["ids"] if chunk_id not in keep]
+            batch_size = self.client.get_max_batch_size()
+            for start in range(0, len(stale), batch_size):
+                self.collection.delete(ids=stale[start : start + batch_size])
+            logger.debug(f"Deleted {len(stale)} stale chunks of {source_id}")
         except Exception as e:
-            logger.error(f"Failed to upsert batch of {batch_size} chunks: {e}")
-            raise VectorStoreError(f"Upsert failed: {e}")
+            logger.error(f"Failed to delete chunks of {source_id}: {e}")
+            raise VectorStoreError(f"Delete failed: {e}")
 
-    @validate_call
     def search(
         self,
         embedding: List[float],
         top_k: int = 5,
         filters: Optional[Dict[str, Any]] = None,
-    ) -> List[DocumentChunk]:
+        include_embeddings: bool = False,
+    ) -> List[SearchHit]:
         """Search for similar chunks using embedding vector.
 
         Args:
             embedding: Query embedding vector
             top_k: Number of results to return
             filters: Optional metadata filters
+            include_embeddings: Also return the stored embedding of every hit
+
+        Returns:
+            List of SearchHits, closest first
+
+        Raises:
+            ValueError: If input validation fails
+        """
+        if embedding is None or len(embedding) == 0:
+            raise ValueError("Embedding cannot be empty")
+
+        return self.search_many(
+            [embedding],
+            top_k=top_k,
+            filters=filters,
+            include_embeddings=include_embeddings,
+        )[0]
+
+    def search_many(
+        self,
+        embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[List[SearchHit]]:
+        """Search for several query embeddings in as few Chroma calls as possible.
+
+        Queries are sent in batches of up to Chroma's max batch size.
+
+        Args:
+            embeddings: Query embedding vectors
+            top_k: Number of results to return per query
+            filters: Optional metadata filters, applied to every query
+            include_embeddings: Also return the stored embedding of every hit
 
         Returns:
-            List of matching DocumentChunks
+            One list of SearchHits per query, in query order, closest first
 
         Raises:
             ValueError: If input validation fails
         """
-        if not embedding:
+        if any(embedding is None or len(embedding) == 0 for embedding in embeddings):
             raise ValueError("Embedding cannot be empty")
 
         if top_k <= 0:
             raise ValueError("top_k must be positive")
 
-        try:
-            query_results = self.collection.query(
-                query_embeddings=[embedding],
-                n_results=top_k,
-                where=filters if filters else None,
-            )
+        include = ["documents", "metadatas", "distances"]
+        if include_embeddings:
+            include.append("embeddings")
 
-            if not query_results or not query_results.get("ids"):
-                logger.warning("No results found for the query.")
-                return []
-
-            documents = query_results.get("documents", [[]])
-            embeddings = query_results.get("embeddings", [[]])
-            metadatas = query_results.get("metadatas", [[]])
-            ids = query_results.get("ids")[0]
-
-            if documents is None or embeddings is None or metadatas is None:
-                logger.warning("Incomplete data in query results.")
-                return []
-            document_chunks = []
-            for doc, emb, meta, idx in zip(
-                documents[0], embeddings[0], metadatas[0], ids
-            ):
-                # Normalize metadata fields
-
-                normalized_meta = {
-                    "zotero_id": str(meta.get("zotero_id", "")),
-                    "title": str(meta.get("title", "")),
-                    "authors": str(meta.get("authors", "")),
-                    "section_header": str(meta.get("section_header"))
-                    if meta.get("section_header")
-                    else None,
-                    "page_range": str(meta.get("page_range"))
-                    if meta.get("page_range")
-                    else None,
-                    "chapter": str(meta.get("chapter"))
-                    if meta.get("chapter")
-                    else None,
-                    "ingestion_date": (
-                        datetime.fromisoformat(str(meta.get("ingestion_date", "")))
-                        if meta.get("ingestion_date")
-                        else None
-                    ),
-                    "source_version": str(meta.get("source_version", "v1.0.0")),
-                    "tags": str(meta.get("tags", "")),
-                    "language": str(meta.get("language", "en")),
-                }
-
-                # Create DocumentChunk
-
-                document_chunks.append(
-                    DocumentChunk(
-                        content=doc,
-                        embedding=emb,
-                        metadata=DocumentMetadata(**normalized_meta),
-                        source_id=str(meta.get("zotero_id")),
-                        content_hash=idx,
-                    )
+        batch_size = self.client.get_max_batch_size()
+        results: List[List[SearchHit]] = []
+        try:
+            for start in range(0, len(embeddings), batch_size):
+                batch = embeddings[start : start + batch_size]
+                query_results = self.collection.query(
+                    query_embeddings=batch,
+                    n_results=top_k,
+                    where=filters if filters else None,
+                    include=include,
                 )
-            return document_chunks
+                for position in range(len(batch)):
+                    results.append(
+                        self._to_hits(query_results, position, include_embeddings)
+                    )
         except Exception as e:
             logger.error(f"Search failed: {e}")
             raise VectorStoreError(f"Search failed: {e}")
+
+        return results
+
+    @staticmethod
+    def _to_hits(
+        query_results: Dict[str, Any], position: int, include_embeddings: bool
+    ) -> List[SearchHit]:
+        """SearchHits of one query out of a (possibly multi-query) Chroma result."""
+        if not query_results or not query_results.get("ids"):
+            logger.warning("No results found for the query.")
+            return []
+
+        ids = query_results["ids"][position]
+        documents = query_results["documents"][position]
+        metadatas = query_results["metadatas"][position]
+        distances = query_results["distances"][position]
+        embeddings = (
+            query_results["embeddings"][position]
+            if include_embeddings
+            else [None] * len(ids)
+        )
+
+        return [
+            SearchHit(
+                id=idx,
+                content=doc,
+                distance=float(distance),
+                metadata=deserialize_metadata(meta or {}),
+                embedding=list(emb) if emb is not None else None,
+            )
+            for idx, doc, meta, distance, emb in zip(
+                ids, documents, metadatas, distances, embeddings
+            )
+        ]
@@ -1,25 +1,51 @@
-from typing import Literal, Optional
+from typing import Optional
 
-from app.config.settings import VectorStoreTypes, settings
+from app.config.settings import VectorStoreTypes, get_settings
 from app.core.exceptions import VectorStoreError
 from app.core.interfaces import IVectorStoreRepository
-from app.infrastructure.vector_store.chroma_adaptor import ChromaAdaptor
 
 
 class VectorStoreFactory:
+    """Builds the configured vector store.
+
+    Backends are imported inside their branch, so only the selected client
+    library (chromadb, qdrant_client, ...) is loaded.
+    """
+
     @staticmethod
     def create_store(
         store_type: Optional[VectorStoreTypes] = None,
     ) -> IVectorStoreRepository:
+        settings = get_settings()
         store_type = store_type or settings.vector_store_type
+        store = VectorStoreFactory._create_base_store(store_type)
+
+        if settings.hybrid_search_enabled:
+            from app.infrastructure.vector_store.hybrid import HybridVectorStore
 
+            return HybridVectorStore(store)
+        return store
+
+    @staticmethod
+    def _create_base_store(store_type: VectorStoreTypes) -> IVectorStoreRepository:
+        settings = get_settings()
         if store_type == "chroma":
+            from app.infrastructure.vector_store.chroma_adaptor import ChromaAdaptor
+
             return ChromaAdaptor(settings.chroma_collection)
+        elif store_type == "numpy":
+            from app.infrastructure.vector_store.numpy_adaptor import NumpyAdaptor
+
+            return NumpyAdaptor(
+                settings.chroma_collection,
+                settings.numpy_store_dir,
+                quantization=settings.numpy_quantization,
+            )
         elif store_type == "pinecone":
             raise NotImplementedError  # TODO add pinecone adaptor
         elif store_type == "qdrant":
-            raise NotImplementedError  # TODO add qdrant adaptor
+            from app.infrastructure.vector_store.qdrant_adaptor import QdrantAdaptor
 
-        raise VectorStoreError(f"Invalid store type: {store_type}")
+            return QdrantAdaptor(settings.chroma_collection)
 
-        return None
+        raise VectorStoreError(f"Invalid store type: {store_type}")
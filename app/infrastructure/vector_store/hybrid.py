@@ -0,0 +1,181 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.config.settings import get_settings
+from app.core.documents import DocumentChunk, SearchHit
+from app.core.interfaces import IHybridSearchRepository, IVectorStoreRepository
+from app.core.logger import logger
+from app.infrastructure.vector_store.bm25_index import BM25Index
+from app.infrastructure.vector_store.serialization import (
+    deserialize_metadata,
+    matches_filter,
+)
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> Dict[str, float]:
+    """Fuse ranked id lists: each id scores the sum of 1 / (k + rank) over the lists."""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            fused[item_id] = fused.get(item_id, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+class HybridVectorStore(IHybridSearchRepository):
+    """Vector store wrapper that keeps a BM25 index in step with it.
+
+    Writes and deletes go to both the wrapped store and the index. `search`
+    stays pure vector search; `hybrid_search` fuses the vector and BM25
+    rankings with reciprocal rank fusion.
+    """
+
+    def __init__(
+        self,
+        store: IVectorStoreRepository,
+        index: Optional[BM25Index] = None,
+        candidates: Optional[int] = None,
+        rrf_k: Optional[int] = None,
+    ):
+        self.store = store
+        self.index = index or BM25Index()
+        self.candidates = candidates or get_settings().hybrid_candidates
+        self.rrf_k = rrf_k or get_settings().rrf_k
+
+    def upsert_chunk(self, chunk: DocumentChunk) -> None:
+        self.upsert_chunks([chunk])
+
+    def upsert_chunks(self, chunks: List[DocumentChunk]) -> None:
+        self.store.upsert_chunks(chunks)
+        self.index.add(chunks)
+
+    def delete_source(
+        self, source_id: str, keep: Optional[Iterable[str]] = None
+    ) -> None:
+        keep = None if keep is None else set(keep)
+        self.store.delete_source(source_id, keep=keep)
+        self.index.delete_source(source_id, keep=keep)
+
+    def search(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[SearchHit]:
+        return self.store.search(
+            embedding,
+            top_k=top_k,
+            filters=filters,
+            include_embeddings=include_embeddings,
+        )
+
+    def search_many(
+        self,
+        embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[List[SearchHit]]:
+        return self.store.search_many(
+            embeddings,
+            top_k=top_k,
+            filters=filters,
+            include_embeddings=include_embeddings,
+        )
+
+    def hybrid_search(
+        self,
+        query: str,
+        embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchHit]:
+        """Fuse vector and BM25 results for a query.
+
+        Each side contributes its best `candidates` results; lexical matches
+        are filtered on their stored metadata the same way as vector hits.
+
+        Args:
+            query: Query text, matched against the BM25 index
+            embedding: Embedding of the same query
+            top_k: Number of results to return
+            filters: Optional Chroma-style metadata filters
+
+        Returns:
+            List of SearchHits ordered by fused score. Hits found only by BM25
+            carry a distance of 1.0, as no vector distance was computed.
+        """
+        return self.hybrid_search_many([query], [embedding], top_k, filters)[0]
+
+    def hybrid_search_many(
+        self,
+        queries: List[str],
+        embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchHit]]:
+        """`hybrid_search` for several queries, with one batched vector search.
+
+        Args:
+            queries: Query texts
+            embeddings: Embeddings of the queries, in the same order
+            top_k: Number of results to return per query
+            filters: Optional Chroma-style metadata filters, applied to every query
+
+        Returns:
+            One list of SearchHits per query, in query order
+        """
+        if len(queries) != len(embeddings):
+            raise ValueError("Every query needs exactly one embedding")
+
+        depth = max(self.candidates, top_k)
+        vector_results = self.store.search_many(
+            embeddings, top_k=depth, filters=filters
+        )
+        return [
+            self._fuse(query, vector_hits, top_k, depth, filters)
+            for query, vector_hits in zip(queries, vector_results)
+        ]
+
+    def _fuse(
+        self,
+        query: str,
+        vector_hits: List[SearchHit],
+        top_k: int,
+        depth: int,
+        filters: Optional[Dict[str, Any]],
+    ) -> List[SearchHit]:
+        lexical_ids = [chunk_id for chunk_id, _ in self.index.search(query, depth)]
+
+        hits = {hit.id: hit for hit in vector_hits}
+        records = self.index.get_many([i for i in lexical_ids if i not in hits])
+        lexical_ranking = []
+        for chunk_id in lexical_ids:
+            if chunk_id not in hits:
+                record = records.get(chunk_id)
+                if record is None:
+                    continue
+                content, metadata = record
+                if filters and not matches_filter(metadata, filters):
+                    continue
+                hits[chunk_id] = SearchHit(
+                    id=chunk_id,
+                    content=content,
+                    distance=1.0,
+                    metadata=deserialize_metadata(metadata),
+                )
+            lexical_ranking.append(chunk_id)
+
+        fused = reciprocal_rank_fusion(
+            [[hit.id for hit in vector_hits], lexical_ranking], k=self.rrf_k
+        )
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+        logger.debug(
+            f"Hybrid search fused {len(vector_hits)} vector and {len(lexical_ranking)} lexical results"
+        )
+        results = []
+        for chunk_id, score in ranked:
+            hit = hits[chunk_id]
+            hit.fused_score = score
+            results.append(hit)
+        return results
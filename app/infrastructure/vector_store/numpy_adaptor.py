@@ -0,0 +1,735 @@
+import json
+import os
+import threading
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config.settings import get_settings
+from app.core.documents import DocumentChunk, DocumentMetadata, SearchHit
+from app.core.exceptions import VectorStoreError
+from app.core.interfaces import IVectorStoreRepository
+from app.core.logger import logger
+from app.infrastructure.vector_store.quantization import (
+    QuantizedCodes,
+    get_quantizer,
+)
+from app.infrastructure.vector_store.serialization import (
+    deserialize_metadata,
+    matches_filter,
+    serialize_metadata,
+)
+
+MIN_CAPACITY = 1024
+SCORE_BUFFER_ELEMENTS = 16 * 1024 * 1024
+DIGEST_BYTES = 32  # chunk ids are sha256 hex digests
+
+METADATA_FIELDS = tuple(field.name for field in fields(DocumentMetadata))
+# Metadata fields kept as dictionary-coded columns, so filters on them are array
+# comparisons. The per-chunk ingestion timestamp would make a column as large
+# as the rows; filters on it read metadata from the row log instead.
+INDEXED_FIELDS = tuple(name for name in METADATA_FIELDS if name != "ingestion_data")
+
+# The row table is snapshotted once this many records (or 2% of the rows, if
+# more) were appended since the last snapshot, bounding the replay on open
+SNAPSHOT_MIN_RECORDS = 10_000
+SNAPSHOT_ROW_FRACTION = 50
+
+
+def _resized(values: np.ndarray, capacity: int) -> np.ndarray:
+    resized = np.zeros((capacity, *values.shape[1:]), dtype=values.dtype)
+    resized[: len(values)] = values
+    return resized
+
+
+class NumpyAdaptor(IVectorStoreRepository):
+    """In-process vector store over a memory-mapped float32 matrix.
+
+    Layout of `<persist_dir>/<collection_name>/`:
+        manifest.json   embedding dimension
+        vectors.f32     row-major matrix of L2-normalized embeddings
+        rows.jsonl      append-only log of row records and tombstones
+        table.npz       snapshot of the row table and the log length it covers
+
+    Only a compact row table lives in memory: for every row, the offset and
+    length of its record in rows.jsonl, its content hash, a liveness flag and
+    dictionary codes for the `INDEXED_FIELDS`. Content and metadata stay in
+    the log and are read for the hits a search returns. Opening loads the
+    snapshot and replays only the records appended after it.
+
+    Vectors are normalized on write, so cosine similarity is a single
+    matrix-vector product and top-k is selected with `argpartition`. Search is
+    exact. Deleted rows are masked out until `compact` rewrites the files.
+
+    With `quantization` set ("int8" or "binary") a compact code file is kept
+    next to the vectors. Search scans the codes, then re-scores a shortlist of
+    `top_k * rescore_multiplier` rows against the full-precision vectors.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        persist_dir: Optional[str] = None,
+        quantization: Optional[str] = None,
+        rescore_multiplier: Optional[int] = None,
+    ):
+        """Open (or create) a collection
+
+        Args:
+            collection_name: Name of the collection to use
+            persist_dir: Directory to persist data (default from settings)
+            quantization: "int8", "binary" or None for exact search only
+            rescore_multiplier: Shortlist size per requested result when quantized
+        """
+        self.path = (
+            Path(persist_dir or get_settings().numpy_store_dir) / collection_name
+        )
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.path / "vectors.f32"
+        self._rows_path = self.path / "rows.jsonl"
+        self._table_path = self.path / "table.npz"
+        self._manifest_path = self.path / "manifest.json"
+        self._lock = threading.RLock()
+
+        self.dimension: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        self._reset_table()
+        self._reader = None  # unbuffered handle on rows.jsonl for record reads
+
+        self.quantizer = get_quantizer(quantization) if quantization else None
+        self.rescore_multiplier = (
+            rescore_multiplier or get_settings().numpy_rescore_multiplier
+        )
+        self._codes: Optional[QuantizedCodes] = None
+
+        try:
+            self._load()
+        except Exception as e:
+            logger.error(f"Failed to load numpy collection at {self.path}: {e}")
+            raise VectorStoreError(f"Failed to load numpy store: {e}")
+
+        logger.info(
+            f"Initialized numpy collection '{collection_name}' ({len(self)} chunks)"
+        )
+
+    def _reset_table(self) -> None:
+        self._count = 0
+        self._offsets = np.zeros(0, dtype=np.int64)
+        self._lengths = np.zeros(0, dtype=np.int32)
+        self._digests = np.zeros((0, DIGEST_BYTES), dtype=np.uint8)
+        self._alive = np.zeros(0, dtype=bool)
+        self._columns = {name: np.zeros(0, dtype=np.int32) for name in INDEXED_FIELDS}
+        self._vocab: Dict[str, List[str]] = {name: [] for name in INDEXED_FIELDS}
+        self._code_of: Dict[str, Dict[str, int]] = {name: {} for name in INDEXED_FIELDS}
+        # Content hash -> row, only needed by writes and built on the first one
+        self._row_of: Optional[Dict[bytes, int]] = None
+        self._log_bytes = 0  # length of rows.jsonl reflected in the table
+        self._unsnapshotted = 0
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._alive[: self._count]))
+
+    def close(self) -> None:
+        """Flush vectors, snapshot the row table if it changed, and release files."""
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+            if self._unsnapshotted:
+                self._save_snapshot()
+            self._close_reader()
+
+    def _load(self) -> None:
+        if not self._manifest_path.exists():
+            return
+
+        self.dimension = json.loads(self._manifest_path.read_text())["dimension"]
+        self._map(self._capacity_on_disk())
+
+        if self._rows_path.exists():
+            if not self._load_snapshot():
+                self._reset_table()
+            self._replay()
+            self._maybe_snapshot()
+
+        if self.quantizer is not None:
+            self._codes = QuantizedCodes(self.path, self.quantizer, self.dimension)
+            if self._matrix is not None:
+                self._codes.sync(self._matrix, self._count)
+
+    def _load_snapshot(self) -> bool:
+        """Restore the row table from `table.npz`; False if there is no usable snapshot."""
+        if not self._table_path.exists():
+            return False
+
+        with np.load(self._table_path) as table:
+            log_bytes = int(table["log_bytes"])
+            if log_bytes > self._rows_path.stat().st_size:
+                logger.warning(f"Ignoring snapshot of {self.path}: row log is shorter")
+                return False
+            if any(f"column_{name}" not in table.files for name in INDEXED_FIELDS):
+                logger.warning(
+                    f"Ignoring snapshot of {self.path}: indexed fields changed"
+                )
+                return False
+
+            self._count = int(table["count"])
+            self._offsets = table["offsets"]
+            self._lengths = table["lengths"]
+            self._digests = table["digests"]
+            self._alive = table["alive"]
+            for name in INDEXED_FIELDS:
+                self._columns[name] = table[f"column_{name}"]
+                self._vocab[name] = table[f"vocab_{name}"].tolist()
+                self._code_of[name] = {
+                    value: code for code, value in enumerate(self._vocab[name])
+                }
+        self._log_bytes = log_bytes
+        return True
+
+    def _save_snapshot(self) -> None:
+        """Atomically write the row table, covering the log up to `_log_bytes`."""
+        count = self._count
+        tmp_path = self._table_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                count=np.int64(count),
+                log_bytes=np.int64(self._log_bytes),
+                offsets=self._offsets[:count],
+                lengths=self._lengths[:count],
+                digests=self._digests[:count],
+                alive=self._alive[:count],
+                **{
+                    f"column_{name}": self._columns[name][:count]
+                    for name in INDEXED_FIELDS
+                },
+                **{
+                    f"vocab_{name}": np.array(self._vocab[name], dtype=str)
+                    for name in INDEXED_FIELDS
+                },
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._table_path)
+        self._unsnapshotted = 0
+        logger.debug(f"Snapshotted {count} rows of {self.path}")
+
+    def _maybe_snapshot(self) -> None:
+        threshold = max(SNAPSHOT_MIN_RECORDS, self._count // SNAPSHOT_ROW_FRACTION)
+        if self._unsnapshotted >= threshold:
+            self._save_snapshot()
+
+    def _replay(self) -> None:
+        """Apply the records appended to rows.jsonl after `_log_bytes`."""
+        offset = self._log_bytes
+        with open(self._rows_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A write interrupted mid-record; later appends must not extend it
+                    logger.warning(
+                        f"Truncating partial record at {offset} in {self._rows_path}"
+                    )
+                    break
+                if line.strip():
+                    self._apply(json.loads(line), offset, len(line))
+                    self._unsnapshotted += 1
+                offset += len(line)
+        if offset < self._rows_path.stat().st_size:
+            os.truncate(self._rows_path, offset)
+        self._log_bytes = offset
+
+    def _capacity_on_disk(self) -> int:
+        if not self._vectors_path.exists():
+            return 0
+        return self._vectors_path.stat().st_size // (4 * self.dimension)
+
+    def _map(self, capacity: int) -> None:
+        """(Re)map the vector file, growing it to hold `capacity` rows."""
+        if self._matrix is not None:
+            self._matrix.flush()
+            self._matrix = None
+
+        if capacity == 0:
+            return
+
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < capacity * 4 * self.dimension:
+                f.truncate(capacity * 4 * self.dimension)
+
+        self._matrix = np.memmap(
+            self._vectors_path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(capacity, self.dimension),
+        )
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        new_capacity = max(MIN_CAPACITY, capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+        self._map(new_capacity)
+
+    def _grow_table(self, rows: int) -> None:
+        capacity = len(self._alive)
+        if rows <= capacity:
+            return
+        capacity = max(MIN_CAPACITY, capacity)
+        while capacity < rows:
+            capacity *= 2
+        self._offsets = _resized(self._offsets, capacity)
+        self._lengths = _resized(self._lengths, capacity)
+        self._digests = _resized(self._digests, capacity)
+        self._alive = _resized(self._alive, capacity)
+        for name in INDEXED_FIELDS:
+            self._columns[name] = _resized(self._columns[name], capacity)
+
+    def _code(self, name: str, value: str) -> int:
+        code = self._code_of[name].get(value)
+        if code is None:
+            code = self._code_of[name][value] = len(self._vocab[name])
+            self._vocab[name].append(value)
+        return code
+
+    def _apply(self, record: Dict[str, Any], offset: int, length: int) -> None:
+        """Apply one rows.jsonl record, found at `offset`, to the row table."""
+        row = record["row"]
+        self._grow_table(row + 1)
+        self._count = max(self._count, row + 1)
+
+        if self._alive[row] and self._row_of is not None:
+            self._row_of.pop(self._digests[row].tobytes(), None)
+
+        if record.get("deleted"):
+            self._alive[row] = False
+            return
+
+        digest = bytes.fromhex(record["id"])
+        self._digests[row] = np.frombuffer(digest, dtype=np.uint8)
+        self._offsets[row] = offset
+        self._lengths[row] = length
+        metadata = record["metadata"]
+        for name in INDEXED_FIELDS:
+            self._columns[name][row] = self._code(name, metadata.get(name, ""))
+        self._alive[row] = True
+        if self._row_of is not None:
+            self._row_of[digest] = row
+
+    def _rows_by_id(self) -> Dict[bytes, int]:
+        if self._row_of is None:
+            live = np.flatnonzero(self._alive[: self._count])
+            self._row_of = dict(zip(map(bytes, self._digests[live]), live.tolist()))
+        return self._row_of
+
+    def _read_record(self, row: int) -> Dict[str, Any]:
+        if self._reader is None:
+            self._reader = open(self._rows_path, "rb", buffering=0)
+        self._reader.seek(int(self._offsets[row]))
+        return json.loads(self._reader.read(int(self._lengths[row])))
+
+    def _close_reader(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _append_records(self, records: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+        """Durably append records to the log; returns each one's (offset, length)."""
+        lines = [
+            (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            for record in records
+        ]
+        spans = []
+        with open(self._rows_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            for line in lines:
+                spans.append((offset, len(line)))
+                offset += len(line)
+            f.write(b"".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        return spans
+
+    def _commit_records(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the log, then apply them to the row table."""
+        spans = self._append_records(records)
+        for record, (offset, length) in zip(records, spans):
+            self._apply(record, offset, length)
+        self._log_bytes = spans[-1][0] + spans[-1][1]
+        self._unsnapshotted += len(records)
+        self._maybe_snapshot()
+
+    def upsert_chunk(self, chunk: DocumentChunk) -> None:
+        """Single chunk upsert (uses batch internally)
+
+        Args:
+            chunk: DocumentChunk to upsert
+        """
+        self.upsert_chunks([chunk])
+
+    def upsert_chunks(self, chunks: List[DocumentChunk]) -> None:
+        """Normalize and write chunk vectors, keyed by content hash
+
+        A chunk whose content hash is already stored overwrites its row in place.
+
+        Args:
+            chunks: List of DocumentChunks to upsert
+
+        Raises:
+            ValueError: If a chunk's embedding dimension does not match the store
+            VectorStoreError: If writing to disk fails
+        """
+        if not chunks:
+            logger.debug("No chunks to upsert")
+            return
+
+        unique_chunks = list({chunk.chunk_id: chunk for chunk in chunks}.values())
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = len(unique_chunks[0].embedding)
+                self._manifest_path.write_text(
+                    json.dumps({"dimension": self.dimension})
+                )
+                if self.quantizer is not None:
+                    self._codes = QuantizedCodes(
+                        self.path, self.quantizer, self.dimension
+                    )
+
+            vectors = np.empty((len(unique_chunks), self.dimension), dtype=np.float32)
+            for i, chunk in enumerate(unique_chunks):
+                if len(chunk.embedding) != self.dimension:
+                    raise ValueError(
+                        f"Embedding dimension {len(chunk.embedding)} does not match store dimension {self.dimension}"
+                    )
+                vectors[i] = np.frombuffer(chunk.embedding, dtype=np.float32)
+
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1, norms)
+
+            row_of = self._rows_by_id()
+            records = []
+            next_row = self._count
+            for chunk in unique_chunks:
+                row = row_of.get(bytes.fromhex(chunk.chunk_id))
+                if row is None:
+                    row = next_row
+                    next_row += 1
+                records.append(
+                    {
+                        "row": row,
+                        "id": chunk.chunk_id,
+                        "content": chunk.content,
+                        "metadata": serialize_metadata(chunk.metadata),
+                    }
+                )
+
+            try:
+                self._ensure_capacity(next_row)
+                rows = np.fromiter((r["row"] for r in records), dtype=np.int64)
+                self._matrix[rows] = vectors
+                self._matrix.flush()
+                if self._codes is not None:
+                    self._codes.reserve(self._matrix.shape[0])
+                    self._codes.write(rows, vectors)
+                # Row records go last: a row only exists once its vector is on disk
+                self._commit_records(records)
+            except OSError as e:
+                logger.error(f"Failed to write {len(records)} chunks: {e}")
+                raise VectorStoreError(f"Upsert failed: {e}")
+
+        logger.debug(f"Upserted {len(records)} chunks into {self.path}")
+
+    def delete_source(
+        self, source_id: str, keep: Optional[Iterable[str]] = None
+    ) -> None:
+        """Remove every chunk that belongs to a source document
+
+        Args:
+            source_id: Zotero key of the source document
+            keep: Chunk ids (content hashes) of the source to leave in place,
+                e.g. the chunks just stored by a re-ingest
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._field_mask("zotero_id", source_id))
+            if keep is not None:
+                kept = {bytes.fromhex(chunk_id) for chunk_id in keep}
+                rows = [row for row in rows if self._digests[row].tobytes() not in kept]
+            if not len(rows):
+                return
+            records = [{"row": int(row), "deleted": True} for row in rows]
+            try:
+                self._commit_records(records)
+            except OSError as e:
+                logger.error(f"Failed to delete chunks of {source_id}: {e}")
+                raise VectorStoreError(f"Delete failed: {e}")
+
+        logger.debug(f"Deleted {len(rows)} chunks of {source_id}")
+
+    def compact(self) -> None:
+        """Rewrite the vector file and row log without deleted rows."""
+        with self._lock:
+            if self._matrix is None:
+                return
+            live = np.flatnonzero(self._alive[: self._count])
+            vectors = np.array(self._matrix[live])
+
+            tmp_vectors = self._vectors_path.with_suffix(".tmp")
+            tmp_rows = self._rows_path.with_suffix(".tmp")
+            offsets = np.zeros(len(live), dtype=np.int64)
+            lengths = np.zeros(len(live), dtype=np.int32)
+            offset = 0
+            with open(tmp_rows, "wb") as f:
+                for new_row, row in enumerate(live.tolist()):
+                    record = self._read_record(row)
+                    record["row"] = new_row
+                    line = (json.dumps(record, ensure_ascii=False) + "\n").encode(
+                        "utf-8"
+                    )
+                    f.write(line)
+                    offsets[new_row], lengths[new_row] = offset, len(line)
+                    offset += len(line)
+            vectors.tofile(tmp_vectors)
+
+            self._matrix = None
+            self._close_reader()
+            # Row numbers change, so the snapshot and every quantized code file are stale
+            self._table_path.unlink(missing_ok=True)
+            self._codes = None
+            for codes_path in self.path.glob("codes-*"):
+                codes_path.unlink()
+            os.replace(tmp_vectors, self._vectors_path)
+            os.replace(tmp_rows, self._rows_path)
+
+            self._count = len(live)
+            self._offsets, self._lengths = offsets, lengths
+            self._digests = self._digests[live]
+            self._alive = np.ones(len(live), dtype=bool)
+            for name in INDEXED_FIELDS:
+                self._columns[name] = self._columns[name][live]
+            self._row_of = None
+            self._log_bytes = offset
+            self._save_snapshot()
+
+            self._map(self._capacity_on_disk())
+            if self.quantizer is not None:
+                self._codes = QuantizedCodes(self.path, self.quantizer, self.dimension)
+                if self._matrix is not None:
+                    self._codes.sync(self._matrix, self._count)
+
+        logger.info(f"Compacted {self.path} to {len(live)} chunks")
+
+    def _candidate_mask(self, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        mask = self._alive[: self._count].copy()
+        if filters:
+            mask &= self._filter_mask(filters, mask)
+        return mask
+
+    def _filter_mask(self, filters: Dict[str, Any], rows: np.ndarray) -> np.ndarray:
+        """Rows matching a Chroma-style `where` filter, among the `rows` mask.
+
+        Same semantics as `matches_filter`. Conditions on `INDEXED_FIELDS`
+        compare code columns, and keys that are not metadata fields match all
+        rows or none. Other fields read the metadata of the rows still in the
+        running.
+        """
+        mask = rows.copy()
+        for key, condition in filters.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._filter_mask(clause, mask)
+            elif key == "$or":
+                matched = np.zeros_like(mask)
+                for clause in condition:
+                    matched |= self._filter_mask(clause, mask)
+                mask &= matched
+            elif key in INDEXED_FIELDS:
+                mask &= self._field_mask(key, condition)
+            elif key not in METADATA_FIELDS:
+                if not matches_filter({}, {key: condition}):
+                    mask[:] = False
+            else:
+                for row in np.flatnonzero(mask):
+                    metadata = self._read_record(row)["metadata"]
+                    mask[row] = matches_filter(metadata, {key: condition})
+        return mask
+
+    def _field_mask(self, name: str, condition: Any) -> np.ndarray:
+        """Live rows whose indexed field `name` satisfies one filter condition."""
+        column = self._columns[name][: self._count]
+        code_of = self._code_of[name]
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        mask = self._alive[: self._count].copy()
+        for operator, operand in condition.items():
+            if operator in ("$eq", "$ne"):
+                matched = column == code_of.get(str(operand), -1)
+            elif operator in ("$in", "$nin"):
+                codes = [code_of[str(item)] for item in operand if str(item) in code_of]
+                matched = np.isin(column, codes)
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            mask &= ~matched if operator in ("$ne", "$nin") else matched
+        return mask
+
+    def search(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[SearchHit]:
+        """Exact cosine search over the stored vectors.
+
+        Args:
+            embedding: Query embedding vector
+            top_k: Number of results to return
+            filters: Optional Chroma-style metadata filters
+            include_embeddings: Also return the stored (normalized) embedding of every hit
+
+        Returns:
+            List of SearchHits, closest first
+
+        Raises:
+            ValueError: If input validation fails
+        """
+        if embedding is None or len(embedding) == 0:
+            raise ValueError("Embedding cannot be empty")
+
+        return self.search_many(
+            [embedding],
+            top_k=top_k,
+            filters=filters,
+            include_embeddings=include_embeddings,
+        )[0]
+
+    def search_many(
+        self,
+        embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[List[SearchHit]]:
+        """Search for several query embeddings at once.
+
+        Filters are evaluated once for the whole batch, and without
+        quantization the scores of a block of queries come from a single
+        matrix product.
+
+        Args:
+            embeddings: Query embedding vectors
+            top_k: Number of results to return per query
+            filters: Optional Chroma-style metadata filters, applied to every query
+            include_embeddings: Also return the stored (normalized) embedding of every hit
+
+        Returns:
+            One list of SearchHits per query, in query order, closest first
+
+        Raises:
+            ValueError: If input validation fails
+        """
+        if any(embedding is None or len(embedding) == 0 for embedding in embeddings):
+            raise ValueError("Embedding cannot be empty")
+
+        if top_k <= 0:
+            raise ValueError("top_k must be positive")
+
+        if not embeddings:
+            return []
+
+        with self._lock:
+            if self._matrix is None or not self._alive[: self._count].any():
+                logger.warning("No results found for the query.")
+                return [[] for _ in embeddings]
+
+            queries = np.asarray(embeddings, dtype=np.float32)
+            if queries.ndim != 2 or queries.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Query dimension {queries.shape[-1]} does not match store dimension {self.dimension}"
+                )
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            queries = queries / np.where(norms == 0, 1, norms)
+
+            candidates = np.flatnonzero(self._candidate_mask(filters))
+            if candidates.size == 0:
+                return [[] for _ in embeddings]
+
+            if self._codes is not None:
+                ranked = [self._rank(query, candidates, top_k) for query in queries]
+            else:
+                ranked = self._rank_exact_many(queries, candidates, top_k)
+
+            return [
+                [
+                    self._hit(row, score, include_embeddings)
+                    for row, score in zip(rows.tolist(), scores.tolist())
+                ]
+                for rows, scores in ranked
+            ]
+
+    def _hit(self, row: int, score: float, include_embeddings: bool) -> SearchHit:
+        """Build a SearchHit, reading the row's content and metadata from the log."""
+        record = self._read_record(row)
+        return SearchHit(
+            id=record["id"],
+            content=record["content"],
+            distance=float(1.0 - score),
+            metadata=deserialize_metadata(record["metadata"]),
+            embedding=self._matrix[row].tolist() if include_embeddings else None,
+        )
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Positions of the `top_k` highest scores, best first."""
+        k = min(top_k, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def _rank(
+        self, query: np.ndarray, candidates: np.ndarray, top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows and cosine scores of the best `top_k` candidates, best first."""
+        everything = candidates.size == self._count
+        shortlist_size = top_k * self.rescore_multiplier
+
+        if self._codes is not None and shortlist_size < candidates.size:
+            approximate = self._codes.score(
+                query, self._count, None if everything else candidates
+            )
+            shortlist = np.argpartition(-approximate, shortlist_size - 1)[
+                :shortlist_size
+            ]
+            # Sorted rows keep the full-precision reads sequential in the memmap
+            candidates = np.sort(candidates[shortlist])
+            everything = False
+
+        if everything:
+            scores = self._matrix[: self._count] @ query
+        else:
+            scores = self._matrix[candidates] @ query
+
+        top = self._top_k(scores, top_k)
+        return candidates[top], scores[top]
+
+    def _rank_exact_many(
+        self, queries: np.ndarray, candidates: np.ndarray, top_k: int
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Exact top-k for a batch of queries, one matrix product per query block."""
+        if candidates.size == self._count:
+            matrix = self._matrix[: self._count]
+        else:
+            matrix = self._matrix[candidates]
+
+        # Cap the (queries x candidates) score buffer
+        block = max(1, SCORE_BUFFER_ELEMENTS // candidates.size)
+        ranked = []
+        for start in range(0, len(queries), block):
+            for query_scores in queries[start : start + block] @ matrix.T:
+                top = self._top_k(query_scores, top_k)
+                ranked.append((candidates[top], query_scores[top]))
+        return ranked
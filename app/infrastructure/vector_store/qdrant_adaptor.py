@@ -0,0 +1,319 @@
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from qdrant_client import QdrantClient, models
+
+from app.config.settings import get_settings
+from app.core.documents import DocumentChunk, SearchHit
+from app.core.exceptions import VectorStoreError
+from app.core.interfaces import IVectorStoreRepository
+from app.core.logger import logger
+from app.infrastructure.vector_store.serialization import (
+    deserialize_metadata,
+    serialize_metadata,
+)
+
+PAYLOAD_INDEXES = ("zotero_id", "tags", "language")
+
+
+def point_id(chunk_id: str) -> str:
+    """Qdrant point ids must be UUIDs or integers; reuse the first 128 bits of the hash."""
+    return str(uuid.UUID(chunk_id[:32]))
+
+
+def build_filter(filters: Dict[str, Any]) -> models.Filter:
+    """Translate a Chroma-style `where` filter into a Qdrant Filter.
+
+    Supports the same subset as the other adaptors: plain equality, `$eq`,
+    `$ne`, `$in`, `$nin`, `$and` and `$or`. Values are matched as strings,
+    the way metadata is stored.
+    """
+    must: List[Any] = []
+    must_not: List[Any] = []
+
+    for key, condition in filters.items():
+        if key == "$and":
+            must.extend(build_filter(clause) for clause in condition)
+            continue
+        if key == "$or":
+            must.append(
+                models.Filter(should=[build_filter(clause) for clause in condition])
+            )
+            continue
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for operator, operand in condition.items():
+            if operator in ("$eq", "$ne"):
+                match = models.MatchValue(value=str(operand))
+            elif operator in ("$in", "$nin"):
+                match = models.MatchAny(any=[str(item) for item in operand])
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+
+            field = models.FieldCondition(key=key, match=match)
+            (must_not if operator in ("$ne", "$nin") else must).append(field)
+
+    return models.Filter(must=must or None, must_not=must_not or None)
+
+
+class QdrantAdaptor(IVectorStoreRepository):
+    """Qdrant collection, either embedded on disk (`path`) or on a server (`url`).
+
+    Points are keyed by a UUID derived from the chunk's content hash, with the
+    chunk text and serialized metadata as payload. On a server, keyword payload
+    indexes on `zotero_id`, `tags` and `language` back filtered search and
+    deletes.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        path: Optional[str] = None,
+        url: Optional[str] = None,
+    ):
+        """Initialize Qdrant client
+
+        The collection itself is created on the first upsert, once the
+        embedding dimension is known.
+
+        Args:
+            collection_name: Name of the collection to use
+            path: Directory for the embedded on-disk mode (default from settings)
+            url: Qdrant server URL; takes precedence over `path`
+        """
+        settings = get_settings()
+        self.collection_name = collection_name
+        url = url or settings.qdrant_url
+        self._remote = bool(url)
+        try:
+            if url:
+                self.client = QdrantClient(url=url)
+            else:
+                self.client = QdrantClient(path=path or settings.qdrant_path)
+            self._ready = self.client.collection_exists(collection_name)
+        except Exception as e:
+            logger.error(f"Failed to Initialize Qdrant client: {e}")
+            raise VectorStoreError(f"Failed to Initialize Qdrant: {e}")
+
+        logger.info(f"Initialized Qdrant collection '{collection_name}'")
+
+    def _ensure_collection(self, dimension: int) -> None:
+        if self._ready:
+            return
+
+        quantization = get_settings().qdrant_quantization
+        quantization_config = None
+        if quantization == "int8":
+            quantization_config = models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, always_ram=True
+                )
+            )
+        elif quantization == "binary":
+            quantization_config = models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+
+        self.client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=models.VectorParams(
+                size=dimension, distance=models.Distance.COSINE
+            ),
+            quantization_config=quantization_config,
+        )
+        # The embedded mode scans payloads and warns that indexes have no effect
+        if self._remote:
+            for field in PAYLOAD_INDEXES:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+        self._ready = True
+        logger.info(
+            f"Created Qdrant collection '{self.collection_name}' ({dimension} dimensions)"
+        )
+
+    def upsert_chunk(self, chunk: DocumentChunk) -> None:
+        """Single chunk upsert (uses batch internally)
+
+        Args:
+            chunk: DocumentChunk to upsert
+        """
+        self.upsert_chunks([chunk])
+
+    def upsert_chunks(self, chunks: List[DocumentChunk]) -> None:
+        """Batch upsert chunks, deduplicated by content hash
+
+        Args:
+            chunks: List of DocumentChunks to upsert
+
+        Raises:
+            VectorStoreError: If upsert operation fails
+        """
+        if not chunks:
+            logger.debug("No chunks to upsert")
+            return
+
+        unique_chunks = list({chunk.chunk_id: chunk for chunk in chunks}.values())
+        batch_size = get_settings().qdrant_upsert_batch_size
+
+        try:
+            self._ensure_collection(len(unique_chunks[0].embedding))
+            for start in range(0, len(unique_chunks), batch_size):
+                batch = unique_chunks[start : start + batch_size]
+                self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=[
+                        models.PointStruct(
+                            id=point_id(chunk.chunk_id),
+                            vector=np.frombuffer(
+                                chunk.embedding, dtype=np.float32
+                            ).tolist(),
+                            payload={
+                                **serialize_metadata(chunk.metadata),
+                                "chunk_id": chunk.chunk_id,
+                                "content": chunk.content,
+                            },
+                        )
+                        for chunk in batch
+                    ],
+                    wait=True,
+                )
+        except Exception as e:
+            logger.error(f"Failed to upsert {len(unique_chunks)} chunks: {e}")
+            raise VectorStoreError(f"Upsert failed: {e}")
+
+        logger.debug(f"Successfully upserted {len(unique_chunks)} chunks")
+
+    def delete_source(
+        self, source_id: str, keep: Optional[Iterable[str]] = None
+    ) -> None:
+        """Remove every chunk that belongs to a source document
+
+        Args:
+            source_id: Zotero key of the source document
+            keep: Chunk ids (content hashes) of the source to leave in place,
+                e.g. the chunks just stored by a re-ingest
+        """
+        if not self._ready:
+            return
+
+        selector = build_filter({"zotero_id": source_id})
+        if keep is not None:
+            selector.must_not = [
+                *(selector.must_not or []),
+                models.HasIdCondition(has_id=[point_id(chunk_id) for chunk_id in keep]),
+            ]
+        try:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.FilterSelector(filter=selector),
+                wait=True,
+            )
+            logger.debug(f"Deleted chunks of {source_id}")
+        except Exception as e:
+            logger.error(f"Failed to delete chunks of {source_id}: {e}")
+            raise VectorStoreError(f"Delete failed: {e}")
+
+    def search(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[SearchHit]:
+        """Search for similar chunks using embedding vector.
+
+        Args:
+            embedding: Query embedding vector
+            top_k: Number of results to return
+            filters: Optional Chroma-style metadata filters
+            include_embeddings: Also return the stored embedding of every hit
+
+        Returns:
+            List of SearchHits, closest first
+
+        Raises:
+            ValueError: If input validation fails
+        """
+        if embedding is None or len(embedding) == 0:
+            raise ValueError("Embedding cannot be empty")
+
+        return self.search_many(
+            [embedding],
+            top_k=top_k,
+            filters=filters,
+            include_embeddings=include_embeddings,
+        )[0]
+
+    def search_many(
+        self,
+        embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[List[SearchHit]]:
+        """Search for several query embeddings in one batched Qdrant request.
+
+        Args:
+            embeddings: Query embedding vectors
+            top_k: Number of results to return per query
+            filters: Optional Chroma-style metadata filters, applied to every query
+            include_embeddings: Also return the stored embedding of every hit
+
+        Returns:
+            One list of SearchHits per query, in query order, closest first
+
+        Raises:
+            ValueError: If input validation fails
+        """
+        if any(embedding is None or len(embedding) == 0 for embedding in embeddings):
+            raise ValueError("Embedding cannot be empty")
+
+        if top_k <= 0:
+            raise ValueError("top_k must be positive")
+
+        if not self._ready:
+            logger.warning("No results found for the query.")
+            return [[] for _ in embeddings]
+
+        query_filter = build_filter(filters) if filters else None
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    models.QueryRequest(
+                        query=[float(value) for value in embedding],
+                        filter=query_filter,
+                        limit=top_k,
+                        with_payload=True,
+                        with_vector=include_embeddings,
+                    )
+                    for embedding in embeddings
+                ],
+            )
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise VectorStoreError(f"Search failed: {e}")
+
+        return [
+            [self._to_hit(point) for point in response.points] for response in responses
+        ]
+
+    @staticmethod
+    def _to_hit(point: models.ScoredPoint) -> SearchHit:
+        payload = dict(point.payload or {})
+        chunk_id = payload.pop("chunk_id", str(point.id))
+        content = payload.pop("content", "")
+        return SearchHit(
+            id=chunk_id,
+            content=content,
+            # Qdrant reports cosine similarity; convert to Chroma-style distance
+            distance=1.0 - float(point.score),
+            metadata=deserialize_metadata(payload),
+            embedding=list(point.vector) if point.vector is not None else None,
+        )
@@ -0,0 +1,181 @@
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional, Type
+
+import numpy as np
+
+from app.core.logger import logger
+
+# Rows scored per block, bounding temporary buffers during a scan
+SCAN_BLOCK_ROWS = 8192
+
+
+class Quantizer(ABC):
+    """Encodes L2-normalized float32 vectors into fixed-width uint8 codes."""
+
+    name: str
+
+    @abstractmethod
+    def code_width(self, dimension: int) -> int:
+        """Bytes per encoded row."""
+        pass
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Encode an (n, dimension) float32 matrix into (n, code_width) uint8 codes."""
+        pass
+
+    @abstractmethod
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Approximate similarity of each code row to a normalized query; higher is closer."""
+        pass
+
+
+class Int8Quantizer(Quantizer):
+    """Symmetric scalar quantization with one float32 scale per row.
+
+    A row is stored as its 4-byte scale followed by `dimension` int8 values,
+    a quarter of the float32 size. Queries stay in float32, so only the stored
+    side carries quantization error.
+    """
+
+    name = "int8"
+
+    def code_width(self, dimension: int) -> int:
+        return dimension + 4
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        peak = np.abs(vectors).max(axis=1)
+        scale = np.where(peak == 0, 1.0, peak / 127.0).astype(np.float32)
+
+        codes = np.empty((len(vectors), vectors.shape[1] + 4), dtype=np.uint8)
+        codes[:, :4] = scale.view(np.uint8).reshape(-1, 4)
+        codes[:, 4:] = (
+            np.rint(vectors / scale[:, None]).clip(-127, 127).astype(np.int8)
+        ).view(np.uint8)
+        return codes
+
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        scale = np.ascontiguousarray(codes[:, :4]).view(np.float32).ravel()
+        # einsum accumulates int8 x float32 without materializing a float copy
+        dots = np.einsum(
+            "ij,j->i",
+            codes[:, 4:].view(np.int8),
+            query,
+            dtype=np.float32,
+            casting="unsafe",
+        )
+        return dots * scale
+
+
+class BinaryQuantizer(Quantizer):
+    """One sign bit per dimension, compared by Hamming distance.
+
+    32x smaller than float32. The ranking is coarse, so it is meant as a
+    prefilter ahead of exact re-scoring with a generous shortlist.
+    """
+
+    name = "binary"
+
+    def code_width(self, dimension: int) -> int:
+        return (dimension + 7) // 8
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.packbits(vectors > 0, axis=1)
+
+    def score(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        query_bits = np.packbits(query > 0)
+        distance = np.bitwise_count(codes ^ query_bits).sum(axis=1, dtype=np.int32)
+        return -distance.astype(np.float32)
+
+
+QUANTIZERS: Dict[str, Type[Quantizer]] = {
+    Int8Quantizer.name: Int8Quantizer,
+    BinaryQuantizer.name: BinaryQuantizer,
+}
+
+
+def get_quantizer(name: str) -> Quantizer:
+    try:
+        return QUANTIZERS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown quantization {name!r}, expected one of {sorted(QUANTIZERS)}"
+        )
+
+
+class QuantizedCodes:
+    """Memory-mapped code matrix kept in step with a full-precision vector file.
+
+    Codes live in `codes-<quantizer>.u8`, and `codes-<quantizer>.json` records
+    how many leading rows are encoded so a store opened with quantization for
+    the first time (or after writes without it) only encodes the missing tail.
+    """
+
+    def __init__(self, directory: Path, quantizer: Quantizer, dimension: int):
+        self.quantizer = quantizer
+        self.width = quantizer.code_width(dimension)
+        self._codes_path = directory / f"codes-{quantizer.name}.u8"
+        self._state_path = directory / f"codes-{quantizer.name}.json"
+        self._codes: Optional[np.memmap] = None
+        self.rows = 0
+
+        if self._state_path.exists() and self._codes_path.exists():
+            self.rows = json.loads(self._state_path.read_text())["rows"]
+            self._map(self._codes_path.stat().st_size // self.width)
+
+    def _map(self, capacity: int) -> None:
+        if self._codes is not None:
+            self._codes.flush()
+            self._codes = None
+        if capacity == 0:
+            return
+
+        with open(self._codes_path, "ab") as f:
+            if f.tell() < capacity * self.width:
+                f.truncate(capacity * self.width)
+
+        self._codes = np.memmap(
+            self._codes_path, dtype=np.uint8, mode="r+", shape=(capacity, self.width)
+        )
+
+    def reserve(self, capacity: int) -> None:
+        """Grow the code file to match the vector file's capacity."""
+        if self._codes is None or self._codes.shape[0] < capacity:
+            self._map(capacity)
+
+    def write(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Encode `vectors` into `rows` and persist the encoded row count."""
+        self._codes[rows] = self.quantizer.encode(vectors)
+        self._codes.flush()
+        self.rows = max(self.rows, int(rows.max()) + 1)
+        self._state_path.write_text(json.dumps({"rows": self.rows}))
+
+    def sync(self, matrix: np.ndarray, count: int) -> None:
+        """Encode rows of `matrix` that were written without quantization."""
+        if self.rows >= count:
+            return
+        self.reserve(matrix.shape[0])
+        logger.info(
+            f"Encoding {count - self.rows} vectors as {self.quantizer.name} codes"
+        )
+        for start in range(self.rows, count, SCAN_BLOCK_ROWS):
+            stop = min(start + SCAN_BLOCK_ROWS, count)
+            self.write(np.arange(start, stop), np.asarray(matrix[start:stop]))
+
+    def score(
+        self, query: np.ndarray, count: int, rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Approximate scores for `rows`, or for the first `count` rows if None."""
+        total = count if rows is None else len(rows)
+        scores = np.empty(total, dtype=np.float32)
+        for start in range(0, total, SCAN_BLOCK_ROWS):
+            stop = min(start + SCAN_BLOCK_ROWS, total)
+            block = (
+                self._codes[start:stop]
+                if rows is None
+                else self._codes[rows[start:stop]]
+            )
+            scores[start:stop] = self.quantizer.score(block, query)
+        return scores
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from app.core.documents import DocumentMetadata
+
+
+def serialize_metadata(metadata: DocumentMetadata) -> Dict[str, str]:
+    """Flatten DocumentMetadata into the string-valued dict vector stores accept."""
+    return {
+        key: (value.isoformat() if isinstance(value, datetime) else str(value))
+        for key, value in metadata.__dict__.items()
+    }
+
+
+def deserialize_metadata(meta: Dict[str, Any]) -> DocumentMetadata:
+    """Rebuild DocumentMetadata from a stored metadata dict."""
+    # Stored as the string "None" by serialize_metadata
+    optional = {
+        key: str(meta[key]) if meta.get(key) not in (None, "", "None") else None
+        for key in ("section_header", "page_range", "chapter")
+    }
+    ingestion_data = meta.get("ingestion_data")
+
+    return DocumentMetadata(
+        zotero_id=str(meta.get("zotero_id", "")),
+        title=str(meta.get("title", "")),
+        authors=str(meta.get("authors", "")),
+        **optional,
+        ingestion_data=(
+            datetime.fromisoformat(str(ingestion_data))
+            if ingestion_data
+            else datetime.now()
+        ),
+        source_version=str(meta.get("source_version", "v1.0.0")),
+        tags=str(meta.get("tags", "")),
+        language=str(meta.get("language", "en")),
+    )
+
+
+def matches_filter(metadata: Dict[str, str], filters: Dict[str, Any]) -> bool:
+    """Evaluate a Chroma-style `where` filter against serialized metadata.
+
+    Supports plain equality (`{"tags": "history"}`), the `$eq`, `$ne`, `$in`
+    and `$nin` operators, and `$and` / `$or` combinations. Values are compared
+    as strings, the way metadata is stored.
+    """
+    for key, condition in filters.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+            continue
+
+        value = metadata.get(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        for operator, operand in condition.items():
+            if operator == "$eq":
+                matched = value == str(operand)
+            elif operator == "$ne":
+                matched = value != str(operand)
+            elif operator == "$in":
+                matched = value in {str(item) for item in operand}
+            elif operator == "$nin":
+                matched = value not in {str(item) for item in operand}
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            if not matched:
+                return False
+
+    return True
@@ -0,0 +1,120 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.config.settings import get_settings
+from app.core.logger import logger
+from app.core.sql_models import ZoteroItemRecord
+from app.core.zotero import ZoteroItem
+from app.infrastructure.database.database import Base, get_session_factory
+
+# Keep IN (...) lookups under SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+
+def library_key() -> str:
+    """Identifier of the configured Zotero library, e.g. `user:12345`."""
+    settings = get_settings()
+    return f"{settings.zotero_library_type.value}:{settings.zotero_library_id}"
+
+
+class ZoteroItemCache:
+    """On-disk cache of raw Zotero items shared by every Zotero client.
+
+    Entries expire after `ttl` seconds, and an entry is never replaced by an
+    older item version, so data written by a sync is not clobbered by a
+    slower, stale fetch.
+    """
+
+    def __init__(
+        self,
+        library: Optional[str] = None,
+        ttl: Optional[int] = None,
+        session_factory: Optional[sessionmaker] = None,
+    ):
+        self.library = library or library_key()
+        self.ttl = timedelta(
+            seconds=ttl if ttl is not None else get_settings().zotero_cache_ttl
+        )
+        self.session_factory = session_factory or get_session_factory()
+        Base.metadata.create_all(
+            bind=self.session_factory.kw["bind"], tables=[ZoteroItemRecord.__table__]
+        )
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, ZoteroItem]:
+        """Return the unexpired cached items among `keys`."""
+        ordered = list(dict.fromkeys(keys))
+        fresh_after = datetime.now() - self.ttl
+        items: Dict[str, ZoteroItem] = {}
+
+        with self.session_factory() as session:
+            for start in range(0, len(ordered), LOOKUP_BATCH_SIZE):
+                rows = session.execute(
+                    select(ZoteroItemRecord.key, ZoteroItemRecord.payload).where(
+                        ZoteroItemRecord.library == self.library,
+                        ZoteroItemRecord.key.in_(
+                            ordered[start : start + LOOKUP_BATCH_SIZE]
+                        ),
+                        ZoteroItemRecord.fetched_at >= fresh_after,
+                    )
+                )
+                for key, payload in rows:
+                    try:
+                        items[key] = ZoteroItem(**json.loads(payload))
+                    except Exception as e:
+                        logger.warning(f"Dropping unreadable cached item {key}: {e}")
+
+        return items
+
+    def put_many(self, raw_items: List[Dict[str, Any]]) -> Dict[str, ZoteroItem]:
+        """Validate and store raw API items, skipping any older than the cached copy.
+
+        Returns:
+            The validated items, keyed by item key
+        """
+        items: Dict[str, ZoteroItem] = {}
+        now = datetime.now()
+
+        with self.session_factory() as session:
+            for raw_item in raw_items:
+                try:
+                    item = ZoteroItem(**raw_item)
+                except Exception as e:
+                    logger.error(f"Zotero data validation failed: {e}")
+                    continue
+
+                items[item.key] = item
+                record = session.get(ZoteroItemRecord, (self.library, item.key))
+                if record is not None and record.version > item.version:
+                    continue
+
+                session.merge(
+                    ZoteroItemRecord(
+                        library=self.library,
+                        key=item.key,
+                        version=item.version,
+                        payload=json.dumps(raw_item),
+                        fetched_at=now,
+                    )
+                )
+            session.commit()
+
+        return items
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        """Forget cached copies of `keys`."""
+        ordered = list(keys)
+        with self.session_factory() as session:
+            for start in range(0, len(ordered), LOOKUP_BATCH_SIZE):
+                session.execute(
+                    delete(ZoteroItemRecord).where(
+                        ZoteroItemRecord.library == self.library,
+                        ZoteroItemRecord.key.in_(
+                            ordered[start : start + LOOKUP_BATCH_SIZE]
+                        ),
+                    )
+                )
+            session.commit()
@@ -1,9 +1,9 @@
-from operator import itemgetter
-from typing import Dict, Optional
-from app.config.settings import settings
+from typing import Optional
+from app.config.settings import get_settings
 from app.core.logger import logger
 from app.core.zotero import DocumentMetadata, convert_zotero_item
 from app.core.interfaces import IMetadataRepository
+from app.infrastructure.zotero.item_cache import ZoteroItemCache
 from pyzotero import zotero
 
 
@@ -12,29 +12,29 @@ class ZoteroMetadataRepository(IMetadataRepository):
     Zotero API implementation for metadata retrieval
     """
 
-    def __init__(self) -> None:
+    def __init__(self, item_cache: Optional[ZoteroItemCache] = None) -> None:
+        settings = get_settings()
         self.zot = zotero.Zotero(
             settings.zotero_library_id,
             settings.zotero_library_type,
             settings.zotero_api_key,
         )
-        self.cache: Dict[str, DocumentMetadata] = {}
+        self.item_cache = item_cache or ZoteroItemCache()
 
     def get_metadata(self, source_id: str) -> Optional[DocumentMetadata]:
         try:
             # Check cache first
-            if cached := self.cache.get(source_id):
-                return cached
+            if cached := self.item_cache.get_many([source_id]).get(source_id):
+                return convert_zotero_item(cached)
 
             # Fetch from Zotero API
             item = self.zot.item(source_id)
             if not item or "data" not in item:
                 return None
 
-            # Conver and cache
-            metadata = convert_zotero_item(item)
-            self.cache[source_id] = metadata
-            return metadata
+            # Cache and convert
+            validated = self.item_cache.put_many([item]).get(source_id)
+            return convert_zotero_item(validated) if validated else None
 
         except Exception as e:
             logger.error(f"Zotero metadata fetch failed: {e}")
@@ -1,16 +1,30 @@
-from typing import Dict
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
 from pyzotero.zotero import Zotero
-from app.config.settings import settings
+from sqlalchemy.orm import sessionmaker
+from app.config.settings import get_settings
 from app.core.logger import logger
-from app.core.documents import DocumentMetadata
+from app.core.documents import DocumentMetadata, LibraryChanges
 from app.core.interfaces import ILibraryManagerRepository
-from app.core.zotero import ZoteroItem
+from app.core.sql_models import ZoteroSyncState
+from app.core.zotero import ZoteroItem, convert_zotero_item
+from app.infrastructure.database.database import Base, get_session_factory
+from app.infrastructure.zotero.item_cache import ZoteroItemCache, library_key
+
+# Zotero API limit for `itemKey` multi-item queries
+MAX_KEYS_PER_REQUEST = 50
 
 
 class ZoteroRepository(ILibraryManagerRepository):
     """Zotero API implementation with caching and data validation"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        item_cache: Optional[ZoteroItemCache] = None,
+        session_factory: Optional[sessionmaker] = None,
+    ) -> None:
+        settings = get_settings()
         if not all(
             [
                 settings.zotero_api_key,
@@ -20,51 +34,116 @@ class ZoteroRepository(ILibraryManagerRepository):
         ):
             raise ValueError("Missing Zotero configuration in settings")
 
-        self.client = Zotero(
-            settings.zotero_library_id,
-            settings.zotero_library_type,
-            settings.zotero_api_key,
+        self._clients = threading.local()
+        self.item_cache = item_cache or ZoteroItemCache(session_factory=session_factory)
+
+        self.session_factory = session_factory or get_session_factory()
+        self.library = library_key()
+        Base.metadata.create_all(
+            bind=self.session_factory.kw["bind"], tables=[ZoteroSyncState.__table__]
+        )
+
+    @property
+    def client(self) -> Zotero:
+        """Zotero client of the calling thread.
+
+        pyzotero keeps the last response and pagination links on the client,
+        so concurrent ingestion workers must not share one.
+        """
+        client = getattr(self._clients, "client", None)
+        if client is None:
+            settings = get_settings()
+            client = self._clients.client = Zotero(
+                settings.zotero_library_id,
+                settings.zotero_library_type,
+                settings.zotero_api_key,
+            )
+        return client
+
+    def list_items(
+        self, collection_key: Optional[str] = None, query: Optional[str] = None
+    ) -> List[str]:
+        """List the top-level items of a collection, or of the whole library.
+
+        Every page of the listing is fetched, and the items go into the item
+        cache so the metadata lookups of the ingestion that follows need no
+        further requests.
+
+        Args:
+            collection_key: Zotero collection key; None lists the whole library
+            query: Optional quick-search text to narrow the listing
+
+        Returns:
+            Item keys in listing order
+        """
+        params = {"q": query} if query else {}
+        if collection_key:
+            first_page = self.client.collection_items_top(collection_key, **params)
+        else:
+            first_page = self.client.top(**params)
+        raw_items = self.client.everything(first_page)
+
+        self.item_cache.put_many(raw_items)
+        keys = [raw_item["key"] for raw_item in raw_items]
+        logger.info(
+            f"Listed {len(keys)} Zotero items in {collection_key or 'the library'}"
+            + (f" matching {query!r}" if query else "")
         )
-        self.metadata_cache: Dict[str, DocumentMetadata] = {}
-        self.raw_item_cache: Dict[str, ZoteroItem] = {}
+        return keys
 
     def get_metadata(self, source_id: str) -> DocumentMetadata | None:
-        try:
-            if cached := self.metadata_cache.get(source_id):
-                return cached
+        return self.get_metadata_many([source_id]).get(source_id)
 
-            item = self._get_validated_item(source_id)
-            if not item:
-                return None
+    def get_metadata_many(self, source_ids: List[str]) -> Dict[str, DocumentMetadata]:
+        """Fetch metadata for many items, going to the API only for cache misses.
 
-            metadata = self._convert_to_document_metadata(item)
-            self.metadata_cache[source_id] = metadata
-            return metadata
+        Misses are requested `MAX_KEYS_PER_REQUEST` keys at a time with
+        multi-key item queries.
 
-        except Exception as e:
-            logger.error(f"Zotero metadata fetch failed: {e}")
-            return None
+        Args:
+            source_ids: Zotero item keys
 
-    def _get_validated_item(self, source_id: str) -> ZoteroItem | None:
-        """Fetch and validate raw Zotero Item"""
+        Returns:
+            Metadata keyed by item key; keys that could not be fetched are omitted
+        """
         try:
-            if cache := self.raw_item_cache.get(source_id):
-                return cache
-
-            raw_item = self.client.item(source_id)
-            if not raw_item:
-                return None
-
-            validated_item = ZoteroItem(**raw_item)
-            self.raw_item_cache[source_id] = validated_item
-            return validated_item
+            items = self._get_validated_items(source_ids)
+            return {
+                key: self._convert_to_document_metadata(item)
+                for key, item in items.items()
+            }
 
         except Exception as e:
-            logger.error(f"Zotero data validation failed: {e}")
-            raise
+            logger.error(f"Zotero metadata fetch failed: {e}")
+            return {}
+
+    def _get_validated_items(self, source_ids: List[str]) -> Dict[str, ZoteroItem]:
+        """Fetch and validate raw Zotero Items, through the shared item cache"""
+        items = self.item_cache.get_many(source_ids)
+        missing = [key for key in dict.fromkeys(source_ids) if key not in items]
+        if not missing:
+            return items
+
+        for start in range(0, len(missing), MAX_KEYS_PER_REQUEST):
+            batch = missing[start : start + MAX_KEYS_PER_REQUEST]
+            raw_items = self.client.items(itemKey=",".join(batch), limit=len(batch))
+            items.update(self.item_cache.put_many(raw_items or []))
+
+        logger.debug(
+            f"Zotero items: {len(source_ids) - len(missing)} cached, {len(missing)} fetched"
+        )
+        return items
 
     def get_source_content(self, parent_id: str) -> str | None:
-        """Retrive content of a specific attachment"""
+        """Retrive content of a specific attachment
+
+        Returns:
+            The `source.md` attachment's text, or None if the item has none
+
+        Raises:
+            Exception: If the attachment could not be fetched, so callers can
+                tell a failed fetch from an item without source content
+        """
         try:
             children_raw = self.client.children(parent_id)
             if not children_raw:
@@ -89,17 +168,66 @@ class ZoteroRepository(ILibraryManagerRepository):
             logger.error(
                 f"Encountered a problem while retriving content encountered: {e}"
             )
-            return None
+            raise
+
+    def get_sync_version(self) -> int:
+        """Library version up to which every change has been ingested."""
+        with self.session_factory() as session:
+            state = session.get(ZoteroSyncState, self.library)
+            return state.version if state else 0
+
+    def get_changes(self) -> LibraryChanges:
+        """List items modified or deleted since the stored sync watermark.
+
+        Changed attachments (e.g. an edited `source.md`) are reported under
+        their parent item, since that is the unit we ingest.
+        """
+        since = self.get_sync_version()
+        library_version = self.client.last_modified_version()
+        if library_version <= since:
+            return LibraryChanges(since_version=since, library_version=library_version)
+
+        changed_ids: Dict[str, None] = {}
+        raw_items = self.client.everything(self.client.items(since=since))
+        # Newer versions replace the cached copies, so the re-ingest needs no refetch
+        self.item_cache.put_many(raw_items)
+        for raw_item in raw_items:
+            data = raw_item.get("data", {})
+            key = raw_item["key"]
+            if parent_key := data.get("parentItem"):
+                if data.get("itemType") == "attachment":
+                    changed_ids[parent_key] = None
+            else:
+                changed_ids[key] = None
+
+        deleted_ids = self.client.deleted(since=since).get("items", [])
+        self.item_cache.invalidate(deleted_ids)
+        for key in deleted_ids:
+            changed_ids.pop(key, None)
+
+        logger.info(
+            f"Zotero changes {since} -> {library_version}: {len(changed_ids)} changed, {len(deleted_ids)} deleted"
+        )
+        return LibraryChanges(
+            since_version=since,
+            library_version=library_version,
+            changed_ids=list(changed_ids),
+            deleted_ids=deleted_ids,
+        )
+
+    def commit_sync(self, library_version: int) -> None:
+        """Advance the sync watermark once changes up to `library_version` are ingested."""
+        with self.session_factory() as session:
+            session.merge(
+                ZoteroSyncState(
+                    library=self.library,
+                    version=library_version,
+                    synced_at=datetime.now(),
+                )
+            )
+            session.commit()
+        logger.info(f"Zotero sync watermark advanced to {library_version}")
 
     def _convert_to_document_metadata(self, item: ZoteroItem) -> DocumentMetadata:
         """Map Zotero API response to DocumentMetadata"""
-        return DocumentMetadata(
-            zotero_id=item.key,
-            title=item.data.title,
-            authors="; ".join(
-                f"{c.lastName}, {c.firstName}".strip() for c in item.data.creators
-            ),
-            tags=", ".join(tag.tag for tag in item.data.tags),
-            source_version=str(item.version),
-            language=item.data.language,
-        )
+        return convert_zotero_item(item)
@@ -0,0 +1,63 @@
+import queue
+import threading
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+_POLL_INTERVAL = 0.1
+
+
+class _StageFailure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group an iterable into lists of at most `size` items."""
+    iterator = iter(iterable)
+    while window := list(islice(iterator, size)):
+        yield window
+
+
+def threaded(iterable: Iterable[T], maxsize: int) -> Iterator[T]:
+    """Consume `iterable` on a background thread, handing items over a bounded queue.
+
+    The producer blocks once `maxsize` items are waiting, which bounds the
+    memory between two pipeline stages. Exceptions raised by the producer are
+    re-raised in the consumer, and closing the consumer stops the producer.
+    """
+    handoff: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_StageFailure(e))
+
+    threading.Thread(target=produce, name="pipeline-stage", daemon=True).start()
+
+    try:
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
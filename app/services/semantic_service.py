@@ -1,16 +1,36 @@
-from typing import Optional
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from app.core.documents import ProcessedDocument
+from app.config.settings import get_settings
+from app.core.documents import (
+    ChunkDraft,
+    CollectionIngestionReport,
+    DocumentChunk,
+    DocumentMetadata,
+    IngestionResult,
+    SearchHit,
+)
 from app.core.exceptions import DocumentProcessingError
 from app.core.interfaces import (
     IDocumentRepository,
     IEmbeddedGenerator,
+    IHybridSearchRepository,
     ILibraryManagerRepository,
     IVectorStoreRepository,
 )
 from app.core.logger import logger
+from app.core.metrics import IMetrics, get_metrics
+from app.infrastructure.document_conversion.document_converter import MarkdownPage
+from app.infrastructure.embedding.query_cache import QueryEmbeddingCache
+from app.services.pipeline import batched, threaded
 from tqdm import tqdm
 
+# Tells the collection writer thread that every worker has finished
+_WRITER_DONE = object()
+
 
 class SemanticService:
     def __init__(
@@ -19,15 +39,122 @@ class SemanticService:
         embedder: IEmbeddedGenerator,
         processor: IDocumentRepository,
         library_manager: ILibraryManagerRepository,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        metrics: Optional[IMetrics] = None,
     ):
         self.vector_store = vector_store
         self.embedder = embedder
         self.processor = processor
         self.library_manager = library_manager
+        settings = get_settings()
+        self.query_cache = query_cache or QueryEmbeddingCache(
+            max_size=settings.query_cache_size, ttl=settings.query_cache_ttl
+        )
+        self._metrics = metrics
+
+    @property
+    def metrics(self) -> IMetrics:
+        """The injected metrics sink, or the process-wide one."""
+        return self._metrics or get_metrics()
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchHit]:
+        """Search the vector store with a text query.
+
+        Query embeddings are kept in an LRU keyed by the normalized query text,
+        so repeated and paginated queries skip the embedding round trip. Stores
+        with a lexical index answer with hybrid (BM25 + vector) search.
+
+        Args:
+            query: Query text
+            top_k: Number of results to return
+            filters: Optional metadata filters
+
+        Returns:
+            List of SearchHits, closest first
+        """
+        if not query.strip():
+            raise ValueError("Query cannot be empty")
+
+        embedding = self.query_cache.get(query)
+        if embedding is None:
+            with self.metrics.timer("query_embedding"):
+                embedding = self.embedder.generate(query)
+            self.query_cache.put(query, embedding)
+
+        with self.metrics.timer("search"):
+            if isinstance(self.vector_store, IHybridSearchRepository):
+                return self.vector_store.hybrid_search(
+                    query, embedding, top_k=top_k, filters=filters
+                )
+            return self.vector_store.search(embedding, top_k=top_k, filters=filters)
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchHit]]:
+        """Search for many text queries with one embedding batch and one store call.
 
-    def process_zotero_item(self, zotero_id: str) -> ProcessedDocument | None:
+        Queries missing from the query cache are embedded together (each
+        distinct normalized query once), then all queries are searched in a
+        single `search_many` call.
+
+        Args:
+            queries: Query texts
+            top_k: Number of results to return per query
+            filters: Optional metadata filters, applied to every query
+
+        Returns:
+            One list of SearchHits per query, in query order
+        """
+        if any(not query.strip() for query in queries):
+            raise ValueError("Query cannot be empty")
+
+        if not queries:
+            return []
+
+        embeddings: List[Optional[List[float]]] = [
+            self.query_cache.get(query) for query in queries
+        ]
+        missing: Dict[str, List[int]] = {}
+        for position, embedding in enumerate(embeddings):
+            if embedding is None:
+                key = QueryEmbeddingCache.normalize(queries[position])
+                missing.setdefault(key, []).append(position)
+
+        if missing:
+            positions = list(missing.values())
+            with self.metrics.timer("query_embedding"):
+                generated = self.embedder.generate_batch(
+                    [queries[group[0]] for group in positions]
+                )
+            for group, embedding in zip(positions, generated):
+                self.query_cache.put(queries[group[0]], embedding)
+                for position in group:
+                    embeddings[position] = embedding
+            logger.debug(
+                f"Embedded {len(positions)} of {len(queries)} queries, the rest came from the cache"
+            )
+
+        with self.metrics.timer("search"):
+            if isinstance(self.vector_store, IHybridSearchRepository):
+                return self.vector_store.hybrid_search_many(
+                    queries, embeddings, top_k=top_k, filters=filters
+                )
+            return self.vector_store.search_many(
+                embeddings, top_k=top_k, filters=filters
+            )
+
+    def process_zotero_item(self, zotero_id: str) -> IngestionResult | None:
         try:
-            content = self.library_manager.get_source_content(zotero_id)
+            with self.metrics.timer("fetch"):
+                content = self.library_manager.get_source_content(zotero_id)
             if content is None:
                 return None
         except Exception as e:
@@ -38,57 +165,378 @@ class SemanticService:
 
         return self.process_document(zotero_id, content)
 
-    def process_document(self, source_id, content: str) -> Optional[ProcessedDocument]:
+    def process_collection(
+        self,
+        collection_key: Optional[str] = None,
+        query: Optional[str] = None,
+        workers: Optional[int] = None,
+    ) -> CollectionIngestionReport:
+        """Ingest every item of a collection, or of the whole library, on a worker pool.
+
+        Items are listed once and their metadata fetched in bulk. Each worker
+        then fetches, chunks and embeds one item at a time through the shared
+        embedder (and so its rate limiter), handing embedded windows to a
+        single writer thread. The vector store sees one upsert at a time, and
+        workers block once `ingestion_queue_size` windows per worker are
+        waiting to be written.
+
+        Args:
+            collection_key: Zotero collection key; None ingests the whole library
+            query: Optional quick-search text to narrow the listing
+            workers: Pool size (default `ingestion_workers`)
+
+        Returns:
+            CollectionIngestionReport with every item's result, skip or failure reason
+        """
+        started = time.perf_counter()
+        workers = workers or get_settings().ingestion_workers
+        report = CollectionIngestionReport()
+
+        source_ids = self.library_manager.list_items(
+            collection_key=collection_key, query=query
+        )
+        with self.metrics.timer("metadata"):
+            metadata = self.library_manager.get_metadata_many(source_ids)
+        for source_id in source_ids:
+            if source_id not in metadata:
+                report.errors[source_id] = "Metadata not found"
+
+        results = {
+            source_id: IngestionResult(source_id=source_id) for source_id in metadata
+        }
+        lock = threading.Lock()
+        writes: queue.Queue = queue.Queue(
+            maxsize=get_settings().ingestion_queue_size * workers
+        )
+        writer = threading.Thread(
+            target=self._write_windows,
+            args=(writes, lock),
+            name="ingestion-writer",
+            daemon=True,
+        )
+        writer.start()
+
+        ingested: List[str] = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="ingestion"
+            ) as pool:
+                futures = {
+                    pool.submit(
+                        self._ingest_item,
+                        metadata[source_id],
+                        results[source_id],
+                        writes,
+                        lock,
+                    ): source_id
+                    for source_id in results
+                }
+                for future in tqdm(
+                    as_completed(futures),
+                    total=len(futures),
+                    desc="Ingesting collection",
+                    unit="item",
+                ):
+                    source_id = futures[future]
+                    try:
+                        if future.result():
+                            ingested.append(source_id)
+                        else:
+                            report.skipped.append(source_id)
+                    except Exception as e:
+                        logger.error(f"Ingestion failed for {source_id}: {e}")
+                        report.errors[source_id] = str(e)
+        finally:
+            writes.put(_WRITER_DONE)
+            writer.join()
+
+        # Windows are only counted as stored once the writer has drained
+        for source_id in ingested:
+            result = results[source_id]
+            if not result.windows:
+                report.errors[source_id] = "No chunks generated"
+            elif not result.stored_chunks:
+                report.errors[source_id] = "No chunks stored"
+            else:
+                report.results[source_id] = result
+
+        report.seconds = time.perf_counter() - started
+        self.metrics.increment(
+            "chunks_stored", sum(r.stored_chunks for r in results.values())
+        )
+        self.metrics.increment(
+            "chunks_failed", sum(r.failed_chunks for r in results.values())
+        )
+        logger.info(
+            f"Ingested {len(report.results)}/{len(source_ids)} items "
+            f"({len(report.skipped)} without content, {len(report.errors)} failed): "
+            f"{report.stored_chunks} chunks in {report.seconds:.1f}s, "
+            f"{report.items_per_second:.2f} items/s, {report.chunks_per_second:.1f} chunks/s"
+        )
+        return report
+
+    def _ingest_item(
+        self,
+        metadata: DocumentMetadata,
+        result: IngestionResult,
+        writes: queue.Queue,
+        lock: threading.Lock,
+    ) -> bool:
+        """Collection worker: fetch, chunk and embed one item, queueing its windows.
+
+        Returns:
+            False if the item has no source content, True once every window is queued
+        """
+        with self.metrics.timer("fetch"):
+            content = self.library_manager.get_source_content(result.source_id)
+        if content is None or not content.strip():
+            return False
+
+        drafts = self.metrics.timed_iter(
+            "chunking", self.processor.iter_process(content, metadata)
+        )
+        for window in batched(drafts, get_settings().ingestion_window_size):
+            chunks, failed = self._embed_window(window)
+            with lock:
+                result.windows += 1
+                result.failed_chunks += failed
+            if chunks:
+                writes.put((result, chunks))
+        return True
+
+    def _write_windows(self, writes: queue.Queue, lock: threading.Lock) -> None:
+        """Collection writer: upsert queued windows until `_WRITER_DONE` arrives."""
+        while (item := writes.get()) is not _WRITER_DONE:
+            result, chunks = item
+            try:
+                with self.metrics.timer("upsert"):
+                    self.vector_store.upsert_chunks(chunks)
+                stored, failed = len(chunks), 0
+            except Exception as e:
+                logger.error(f"Storage failed for a window of {result.source_id}: {e}")
+                stored, failed = 0, len(chunks)
+            with lock:
+                result.stored_chunks += stored
+                result.failed_chunks += failed
+                if stored:
+                    result.chunk_ids.update(chunk.chunk_id for chunk in chunks)
+
+    def sync_library(self) -> Dict[str, bool]:
+        """Ingest only the library items changed since the last sync.
+
+        Changed items are re-ingested, and their old chunks are only pruned
+        once every new chunk is stored, so a failed re-ingest leaves the
+        previous version searchable. Items that no longer have source content
+        and deleted items are removed from the vector store. The library's
+        sync watermark only advances when every item succeeded, so failures
+        are retried on the next sync.
+
+        Returns:
+            Mapping of item id to whether it was ingested (or removed) successfully
+        """
+        changes = self.library_manager.get_changes()
+        results: Dict[str, bool] = {}
+
+        for source_id in changes.deleted_ids:
+            try:
+                self.vector_store.delete_source(source_id)
+                results[source_id] = True
+            except Exception as e:
+                logger.error(f"Failed to remove deleted item {source_id}: {e}")
+                results[source_id] = False
+
+        for source_id in tqdm(changes.changed_ids, desc="Syncing library"):
+            try:
+                results[source_id] = self._resync_item(source_id)
+            except Exception as e:
+                logger.error(f"Sync failed for {source_id}: {e}")
+                results[source_id] = False
+
+        if all(results.values()):
+            self.library_manager.commit_sync(changes.library_version)
+        else:
+            logger.warning(
+                f"{list(results.values()).count(False)} items failed; keeping sync watermark at {changes.since_version}"
+            )
+
+        return results
+
+    def _resync_item(self, source_id: str) -> bool:
+        """Replace the stored chunks of one changed item; True if it fully succeeded.
+
+        An item with nothing to ingest (no or blank content, no metadata, no
+        chunks) fails the same way on every sync, so it counts as synced: its
+        chunks are removed instead of holding back the sync watermark.
+        """
+        with self.metrics.timer("fetch"):
+            content = self.library_manager.get_source_content(source_id)
+        if content is None or not content.strip():
+            return self._remove_item(source_id, "has no source content")
+
+        with self.metrics.timer("metadata"):
+            metadata = self.library_manager.get_metadata(source_id)
+        if not metadata:
+            return self._remove_item(source_id, "has no metadata")
+
+        result = self._stream(
+            source_id,
+            metadata,
+            lambda metadata: self.processor.iter_process(content, metadata),
+        )
+        if not result.windows:
+            return self._remove_item(source_id, "produced no chunks")
+        if result.failed_chunks or not result.stored_chunks:
+            logger.error(f"Re-ingest of {source_id} incomplete; keeping its old chunks")
+            return False
+
+        self.vector_store.delete_source(source_id, keep=result.chunk_ids)
+        return True
+
+    def _remove_item(self, source_id: str, reason: str) -> bool:
+        """Drop everything indexed for an item that has nothing to ingest."""
+        logger.warning(f"{source_id} {reason}; removing it from the vector store")
+        self.vector_store.delete_source(source_id)
+        return True
+
+    def process_document(self, source_id, content: str) -> Optional[IngestionResult]:
+        """Stream a document through chunk -> embed -> upsert in fixed-size windows.
+
+        Each stage runs on its own thread with bounded queues in between, so
+        peak memory depends on the window size rather than the document size,
+        and every window reaches the vector store as soon as it is embedded.
+        """
         if not content.strip():
             logger.error("Empty content provided")
             return None
 
+        return self._ingest(
+            source_id, lambda metadata: self.processor.iter_process(content, metadata)
+        )
+
+    def process_pages(
+        self, source_id, pages: Iterable[MarkdownPage]
+    ) -> Optional[IngestionResult]:
+        """Like `process_document`, for a document delivered page by page.
+
+        `pages` is consumed lazily on the chunking thread, so a streaming
+        converter such as `EpubToMarkdownConverter.iter_chapters` converts the
+        next chapter while earlier ones are being embedded and stored.
+        """
+        return self._ingest(
+            source_id,
+            lambda metadata: self.processor.iter_process_pages(pages, metadata),
+        )
+
+    def _ingest(
+        self,
+        source_id,
+        chunk: Callable[[DocumentMetadata], Iterator[ChunkDraft]],
+    ) -> Optional[IngestionResult]:
         try:
             # 1. Fetch metadata
-            metadata = self.library_manager.get_metadata(source_id)
-            if not metadata:
-                logger.error(f"Metadata not found for {source_id}")
-                return None
+            with self.metrics.timer("metadata"):
+                metadata = self.library_manager.get_metadata(source_id)
+        except Exception as e:
+            logger.error(f"Processing failed for {source_id}: {e}")
+            raise DocumentProcessingError(f"Document processing failed: {e}")
+        if not metadata:
+            logger.error(f"Metadata not found for {source_id}")
+            return None
 
-            # 2. process content
-            raw_chunks = self.processor.process(content, metadata)
-            if not raw_chunks:
-                logger.error(f"No chunks generated for {source_id}")
-                return None
+        result = self._stream(source_id, metadata, chunk)
+        if not result.windows:
+            logger.error(f"No chunks generated for {source_id}")
+            return None
 
-            # 3. Generate embedding
-            processed_chunks = []
-            for chunk in tqdm(raw_chunks, desc="Processing embedding"):
-                try:
-                    embedding = self.embedder.generate(chunk.content)
-                    if (
-                        not embedding
-                        or len(embedding) != self.embedder.get_dimensions()
-                    ):  # Add null check
-                        logger.error(
-                            f"Empty embedding for chunk: {chunk.content[:50]}..."
-                        )
-                        continue
+        if not result.stored_chunks:
+            logger.error(f"Storage failed for {source_id}")
+            return None
 
-                    chunk.embedding = embedding
-                    processed_chunks.append(chunk)
-                except Exception as e:
-                    logger.error(f"Embedding failed for chunk: {e}")
-                    continue
+        if result.failed_chunks:
+            logger.warning(
+                f"{result.failed_chunks} chunks of {source_id} were not stored"
+            )
+        return result
 
-            # 4. Validate and store
-            validate_doc = ProcessedDocument(
-                source_id=source_id, chunks=processed_chunks
+    def _stream(
+        self,
+        source_id,
+        metadata: DocumentMetadata,
+        chunk: Callable[[DocumentMetadata], Iterator[ChunkDraft]],
+    ) -> IngestionResult:
+        """Chunk, embed and upsert one document in windows; the result counts every window."""
+        try:
+            # 2. process content, 3. generate embedding, 4. store, one window at a time
+            settings = get_settings()
+            windows = threaded(
+                batched(
+                    self.metrics.timed_iter("chunking", chunk(metadata)),
+                    settings.ingestion_window_size,
+                ),
+                settings.ingestion_queue_size,
+            )
+            embedded_windows = threaded(
+                (self._embed_window(window) for window in windows),
+                settings.ingestion_queue_size,
             )
 
-            try:
-                self.vector_store.upsert_chunks(validate_doc.chunks)
-            except Exception as e:
-                logger.error(f"Storage failed for {source_id}: {e}")
-                return None
+            result = IngestionResult(source_id=source_id)
+            with tqdm(desc="Ingesting chunks", unit="chunk") as progress:
+                for chunks, failed in embedded_windows:
+                    result.windows += 1
+                    result.failed_chunks += failed
+                    progress.update(len(chunks) + failed)
+                    if not chunks:
+                        continue
+
+                    try:
+                        with self.metrics.timer("upsert"):
+                            self.vector_store.upsert_chunks(chunks)
+                        result.stored_chunks += len(chunks)
+                        result.chunk_ids.update(chunk.chunk_id for chunk in chunks)
+                    except Exception as e:
+                        logger.error(
+                            f"Storage failed for window {result.windows} of {source_id}: {e}"
+                        )
+                        result.failed_chunks += len(chunks)
 
-            return validate_doc
+            self.metrics.increment("chunks_stored", result.stored_chunks)
+            self.metrics.increment("chunks_failed", result.failed_chunks)
+            return result
 
         except Exception as e:
             logger.error(f"Processing failed for {source_id}: {e}")
             raise DocumentProcessingError(f"Document processing failed: {e}")
+
+    def _embed_window(
+        self, drafts: List[ChunkDraft]
+    ) -> Tuple[List[DocumentChunk], int]:
+        """Embed one window, returning the chunks and how many drafts failed."""
+        try:
+            with self.metrics.timer("embedding"):
+                chunks = self._embed_drafts(drafts)
+        except Exception:
+            return [], len(drafts)
+        return chunks, len(drafts) - len(chunks)
+
+    def _embed_drafts(self, drafts: List[ChunkDraft]) -> List[DocumentChunk]:
+        """Embedding stage: fill vectors for unembedded chunk drafts."""
+        try:
+            embeddings = self.embedder.generate_batch(
+                [draft.content for draft in drafts]
+            )
+        except Exception as e:
+            logger.error(f"Embedding failed for batch of {len(drafts)} chunks: {e}")
+            raise
+
+        chunks = []
+        for draft, embedding in zip(drafts, embeddings):
+            if (
+                not embedding or len(embedding) != self.embedder.get_dimensions()
+            ):  # Add null check
+                logger.error(f"Empty embedding for chunk: {draft.content[:50]}...")
+                continue
+
+            chunks.append(draft.to_chunk(embedding))
+
+        return chunks
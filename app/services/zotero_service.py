@@ -1,15 +1,15 @@
-from dataclasses import dataclass
-from typing import Dict, List, Union, cast
+from typing import Dict, Optional
 
-from pydantic import ValidationError
 from pyzotero.zotero import Zotero
-from app.config.settings import settings
+from app.config.settings import get_settings
 from app.core.logger import logger
-from app.core.zotero import DocumentMetadata, ZoteroItem
+from app.core.zotero import DocumentMetadata, ZoteroItem, convert_zotero_item
+from app.infrastructure.zotero.item_cache import ZoteroItemCache
 
 
 class ZoteroService:
-    def __init__(self) -> None:
+    def __init__(self, item_cache: Optional[ZoteroItemCache] = None) -> None:
+        settings = get_settings()
         self.library_id = settings.zotero_library_id
         self.library_type = settings.zotero_library_type
         self.api_key = settings.zotero_api_key
@@ -18,31 +18,24 @@ class ZoteroService:
             raise ValueError("Zotero library credentials are not correctly set.")
 
         self.zot = Zotero(self.library_id, self.library_type, self.api_key)
-        self.metadata_cache: Dict[str, DocumentMetadata] = {}
+        self.item_cache = item_cache or ZoteroItemCache()
 
     def get_metadata(self, source_id: str) -> DocumentMetadata | None:
         try:
             # Check cache first
-            if cached := self.metadata_cache.get(source_id):
-                return cached
+            item = self.item_cache.get_many([source_id]).get(source_id)
 
             # Fetch from Zotero API
-            try:
-                item = ZoteroItem(**cast(Dict, self.zot.item(source_id)))
-            except ValidationError as e:
-                logger.error(f"Validation of the returned zotero response failed: {e}")
-                raise ValidationError
-
-            child = self.find_source_md_child(source_id)
-
-            print(self.zot.children(source_id))
-            # print(self.zot.item(source_id))
+            if item is None:
+                item = self.item_cache.put_many([self.zot.item(source_id)]).get(
+                    source_id
+                )
+                if item is None:
+                    logger.error("Validation of the returned zotero response failed")
+                    return None
 
             logger.debug(f"Item retrived: {item}")
-            # Convert and cache
-            metadata = self.convert_zotero_item(item)
-            self.metadata_cache[source_id] = metadata
-            return metadata
+            return self.convert_zotero_item(item)
 
         except Exception as e:
             logger.error(f"Zotero metadata fetch failed: {e}")
@@ -65,13 +58,4 @@ class ZoteroService:
 
     def convert_zotero_item(self, item: ZoteroItem) -> DocumentMetadata:
         """Convert Zotero API response to our metadata format"""
-
-        data = item.data
-        return DocumentMetadata(
-            zotero_id=item.key,
-            title=data.title,
-            authors="; ".join(author.get("name", "") for author in data.creators),
-            tags=", ".join(tag.get("tag", "") for tag in data.tags),
-            source_version=str(item.version),  # Ensure version is a string
-            language=data.language,
-        )
+        return convert_zotero_item(item)
@@ -0,0 +1,103 @@
+"""Microbenchmark: DocumentChunk construction time and retained bytes per chunk.
+
+Compares the previous pydantic model (reproduced below as `LegacyDocumentChunk`)
+with the array-backed DocumentChunk, through both its validating constructor
+and the trusted path.
+
+The gain is memory: a 1024-d chunk retains ~4.7 KB instead of ~33.7 KB.
+Construction time is dominated by packing the floats, so the three variants
+land within a few microseconds of each other; `trusted` only saves the
+validation checks.
+
+    python -m benchmarks.chunk_construction --chunks 2000 --dimension 1024
+"""
+
+import argparse
+import gc
+import random
+import timeit
+import tracemalloc
+from datetime import datetime
+from hashlib import sha256
+from typing import Callable, List
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from app.core.documents import DocumentChunk, DocumentMetadata
+
+
+class LegacyDocumentChunk(BaseModel):
+    """DocumentChunk as it was before the array-backed rewrite."""
+
+    content: str = Field(..., min_length=1)
+    embedding: List[float] = Field(..., min_length=500)
+    metadata: DocumentMetadata
+    source_id: str = Field(..., pattern=r"[A-Za-z0-9_-]+")
+    created_at: datetime = Field(default_factory=datetime.now)
+
+    _content_hash: str = PrivateAttr()
+
+    model_config = ConfigDict(
+        extra="forbid", validate_default=True, arbitrary_types_allowed=True
+    )
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        self._content_hash = sha256(self.content.encode()).hexdigest()
+
+
+def _retained_bytes(
+    build: Callable[[List[float], str], object], count: int, dimension: int
+) -> float:
+    """Bytes still allocated per chunk once the embedder's input lists are gone."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    chunks = [
+        build([random.random() for _ in range(dimension)], f"chunk {i}")
+        for i in range(count)
+    ]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del chunks
+    return (after - before) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    metadata = DocumentMetadata(zotero_id="BENCH001", title="Bench", authors="Doe, J")
+    embedding = [random.random() for _ in range(args.dimension)]
+
+    variants = {
+        "legacy pydantic": lambda emb, text: LegacyDocumentChunk(
+            content=text, embedding=emb, metadata=metadata, source_id="BENCH001"
+        ),
+        "array, validated": lambda emb, text: DocumentChunk(
+            content=text, embedding=emb, metadata=metadata, source_id="BENCH001"
+        ),
+        "array, trusted": lambda emb, text: DocumentChunk.trusted(
+            content=text, embedding=emb, metadata=metadata, source_id="BENCH001"
+        ),
+    }
+
+    print(f"{args.chunks} chunks, {args.dimension} dimensions")
+    print(f"{'variant':<18} {'us/chunk':>10} {'bytes/chunk':>12}")
+    for name, build in variants.items():
+        seconds = min(
+            timeit.repeat(
+                lambda: build(embedding, "chunk text"),
+                number=args.chunks,
+                repeat=args.repeat,
+            )
+        )
+        retained = _retained_bytes(build, args.chunks, args.dimension)
+        print(f"{name:<18} {seconds / args.chunks * 1e6:>10.1f} {retained:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
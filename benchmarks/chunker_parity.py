@@ -0,0 +1,113 @@
+"""Throughput of the native sentence-boundary chunker against langchain.
+
+Both chunkers run over the same book-sized Markdown: synthetic books by
+default, plus any Markdown files passed with `--markdown`. Throughput is
+reported for the bare splitters and for the whole MarkdownProcessor.process
+path (chunking plus metadata conversion), along with the share of native
+chunks that end at a sentence or line end. Section, budget and coverage
+parity with langchain are asserted in tests/test_chunker_parity.py.
+
+    python -m benchmarks.chunker_parity --books 2 --chapters 40
+    python -m benchmarks.chunker_parity --markdown data/book.md
+"""
+
+import argparse
+import time
+from typing import Callable, Tuple
+
+from app.config.settings import get_settings
+from app.core.documents import DocumentMetadata
+from app.infrastructure.document_conversion.sentence_boundary_chunking import (
+    SentenceBoundaryChunker,
+)
+from app.infrastructure.markdown.processor import MarkdownProcessor
+from benchmarks.synthetic import generate_book
+
+SENTENCE_ENDINGS = ".!?\"'”’)]"
+
+
+def best_of(repeat: int, run: Callable[[], int]) -> Tuple[float, int]:
+    """Fastest of `repeat` runs, with the item count `run` returned."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = run()
+        timings.append(time.perf_counter() - started)
+    return min(timings), items
+
+
+def sentence_cut_ratio(chunker: SentenceBoundaryChunker, text: str) -> float:
+    """Share of chunks that end at a sentence end, a line end or the text end."""
+    spans = list(chunker.iter_spans(text))
+    sentence_cuts = sum(
+        text[span.end - 1] in SENTENCE_ENDINGS
+        or text.startswith("\n", span.end)
+        or span.end == len(text)
+        for span in spans
+    )
+    return round(sentence_cuts / len(spans), 3) if spans else 1.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=2)
+    parser.add_argument("--chapters", type=int, default=40)
+    parser.add_argument("--sections", type=int, default=6)
+    parser.add_argument("--paragraphs", type=int, default=10)
+    parser.add_argument("--markdown", nargs="*", default=[])
+    parser.add_argument("--chunk-size", type=int, default=get_settings().chunk_size)
+    parser.add_argument(
+        "--chunk-overlap", type=int, default=get_settings().chunk_overlap
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    documents = [
+        (
+            f"synthetic-{i}",
+            generate_book(args.chapters, args.sections, args.paragraphs, seed=i),
+        )
+        for i in range(args.books)
+    ]
+    for path in args.markdown:
+        with open(path, encoding="utf-8") as f:
+            documents.append((path, f.read()))
+
+    options = dict(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    recursive = MarkdownProcessor(chunker="recursive", **options)
+    sentence = MarkdownProcessor(chunker="sentence", **options)
+    chunker = sentence.sentence_chunker
+    source = DocumentMetadata(
+        zotero_id="BENCH001", title="Synthetic", authors="Doe, J", tags="bench"
+    )
+
+    print(
+        f"{'document':<24} {'MB':>6} {'path':<22} {'seconds':>8} {'MB/s':>7} {'chunks':>7}"
+    )
+    for name, text in documents:
+        megabytes = len(text) / 1e6
+
+        def langchain_split() -> int:
+            sections = recursive.header_splitter.split_text(text)
+            return len(recursive.text_splitter.split_documents(sections))
+
+        def native_split() -> int:
+            return len(chunker.split_text(text))
+
+        runs = {
+            "langchain split": langchain_split,
+            "native split": native_split,
+            "process recursive": lambda: len(recursive.process(text, source)),
+            "process sentence": lambda: len(sentence.process(text, source)),
+        }
+        for label, run in runs.items():
+            seconds, chunks = best_of(args.repeat, run)
+            print(
+                f"{name[-24:]:<24} {megabytes:>6.2f} {label:<22} {seconds:>8.3f} {megabytes / seconds:>7.2f} {chunks:>7}"
+            )
+
+        print(f"{'':<24} sentence cuts: {sentence_cut_ratio(chunker, text)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Per-stage ingestion benchmark over a synthetic corpus.
+
+Runs each stage of the ingestion path in isolation and records its wall time,
+throughput and peak traced memory:
+
+    header_split       MarkdownHeaderTextSplitter over each book
+    recursive_split    RecursiveCharacterTextSplitter over the header sections
+    metadata           DocumentMetadata conversion for every chunk
+    embedding          fake embedder batches plus DocumentChunk construction
+    chroma_upsert      ChromaAdaptor.upsert_chunks into a temporary collection
+    chroma_search      one ChromaAdaptor.search per query
+
+Every stage runs twice: once for timing and once under tracemalloc for peak
+memory, since tracing distorts timings. tracemalloc only sees allocations
+made through Python, so memory held natively by Chroma is not counted.
+Results are written as JSON so runs from two versions can be diffed.
+
+    python -m benchmarks.ingestion_stages --books 4 --chapters 20 --output before.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from importlib import metadata as package_metadata
+from typing import Any, Callable, Dict, Tuple
+
+from app.config.settings import get_settings
+from app.core.documents import ChunkDraft, DocumentMetadata
+from app.infrastructure.markdown.processor import MarkdownProcessor
+from app.infrastructure.vector_store.chroma_adaptor import ChromaAdaptor
+from app.services.pipeline import batched
+from benchmarks.synthetic import FakeEmbeddingGenerator, generate_book
+
+PACKAGES = ("chromadb", "langchain-text-splitters", "numpy", "pydantic")
+
+
+def measure(stage: Callable[[], Tuple[Any, int]]) -> Tuple[Any, Dict[str, float]]:
+    """Run `stage` once timed and once traced.
+
+    `stage` returns its output and the number of items it processed.
+    """
+    started = time.perf_counter()
+    output, items = stage()
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return output, {
+        "seconds": round(seconds, 6),
+        "items": items,
+        "items_per_second": round(items / seconds, 2) if seconds else None,
+        "peak_bytes": peak,
+    }
+
+
+def package_versions() -> Dict[str, str]:
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = package_metadata.version(name)
+        except package_metadata.PackageNotFoundError:
+            versions[name] = "missing"
+    return versions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=4)
+    parser.add_argument("--chapters", type=int, default=20)
+    parser.add_argument("--sections", type=int, default=5)
+    parser.add_argument("--paragraphs", type=int, default=8)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="ingestion-stages.json")
+    args = parser.parse_args()
+
+    books = [
+        generate_book(args.chapters, args.sections, args.paragraphs, seed=args.seed + i)
+        for i in range(args.books)
+    ]
+    source = DocumentMetadata(
+        zotero_id="BENCH001", title="Synthetic", authors="Doe, J", tags="bench"
+    )
+    source_dict = asdict(source)
+    # The split stages time langchain's splitters, whatever CHUNKER is set to
+    processor = MarkdownProcessor(chunker="recursive")
+    embedder = FakeEmbeddingGenerator(args.dimension)
+    results: Dict[str, Dict[str, float]] = {}
+
+    def header_split():
+        sections = [
+            s for book in books for s in processor.header_splitter.split_text(book)
+        ]
+        return sections, len(sections)
+
+    sections, results["header_split"] = measure(header_split)
+
+    def recursive_split():
+        splits = processor.text_splitter.split_documents(sections)
+        return splits, len(splits)
+
+    splits, results["recursive_split"] = measure(recursive_split)
+
+    def metadata():
+        converted = [
+            processor._convert_metadata({**source_dict, **split.metadata})
+            for split in splits
+        ]
+        return converted, len(converted)
+
+    metadatas, results["metadata"] = measure(metadata)
+
+    def embedding():
+        chunks = []
+        pairs = list(zip(splits, metadatas))
+        for window in batched(pairs, get_settings().embedding_batch_size):
+            vectors = embedder.generate_batch(
+                [split.page_content for split, _ in window]
+            )
+            for (split, chunk_metadata), vector in zip(window, vectors):
+                draft = ChunkDraft(
+                    content=split.page_content,
+                    metadata=chunk_metadata,
+                    source_id=source.zotero_id,
+                )
+                chunks.append(draft.to_chunk(vector))
+        return chunks, len(chunks)
+
+    chunks, results["embedding"] = measure(embedding)
+
+    with tempfile.TemporaryDirectory() as persist_dir:
+        collections = iter(range(2))
+
+        def chroma_upsert():
+            store = ChromaAdaptor(f"bench_{next(collections)}", persist_dir)
+            store.upsert_chunks(chunks)
+            return store, len(chunks)
+
+        store, results["chroma_upsert"] = measure(chroma_upsert)
+
+        queries = embedder.generate_batch(
+            [f"query {i} about reform and empire" for i in range(args.queries)]
+        )
+
+        def chroma_search():
+            hits = [store.search(query, top_k=args.top_k) for query in queries]
+            return hits, len(hits)
+
+        _, results["chroma_search"] = measure(chroma_search)
+
+    report = {
+        "config": vars(args),
+        "corpus": {
+            "characters": sum(len(book) for book in books),
+            "chunks": len(chunks),
+        },
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "packages": package_versions(),
+        },
+        "stages": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'stage':<16} {'seconds':>9} {'items/s':>11} {'peak MB':>9}")
+    for name, stage in results.items():
+        print(
+            f"{name:<16} {stage['seconds']:>9.3f} {stage['items_per_second']:>11.1f} {stage['peak_bytes'] / 1e6:>9.1f}"
+        )
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Recall@k and query latency of quantized NumPy stores against exact search.
+
+Builds one store per mode over the same synthetic clustered vectors, takes
+the unquantized store's results as ground truth, and reports recall@k and
+mean query latency for each quantization / rescore multiplier pair.
+
+    python -m benchmarks.quantization_recall --vectors 50000 --top-k 10
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.documents import DocumentChunk, DocumentMetadata
+from app.infrastructure.vector_store.numpy_adaptor import NumpyAdaptor
+
+
+def synthetic_vectors(
+    count: int, dimension: int, clusters: int, seed: int
+) -> np.ndarray:
+    """Gaussian clusters, closer to real embedding geometry than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    labels = rng.integers(0, clusters, count)
+    noise = rng.standard_normal((count, dimension)).astype(np.float32)
+    return centers[labels] + 0.8 * noise
+
+
+def build_store(
+    directory: str, vectors: np.ndarray, quantization: Optional[str], multiplier: int
+) -> NumpyAdaptor:
+    store = NumpyAdaptor(
+        f"bench_{quantization or 'exact'}",
+        directory,
+        quantization=quantization,
+        rescore_multiplier=multiplier,
+    )
+    metadata = DocumentMetadata(zotero_id="BENCH001", title="Bench", authors="Doe, J")
+    batch = 5000
+    for start in range(0, len(vectors), batch):
+        store.upsert_chunks(
+            [
+                DocumentChunk.trusted(
+                    content=f"chunk {start + i}",
+                    embedding=vector,
+                    metadata=metadata,
+                    source_id="BENCH001",
+                )
+                for i, vector in enumerate(vectors[start : start + batch])
+            ]
+        )
+    return store
+
+
+def run_queries(
+    store: NumpyAdaptor, queries: np.ndarray, top_k: int
+) -> Tuple[List[List[str]], float]:
+    results = []
+    started = time.perf_counter()
+    for query in queries:
+        results.append([hit.id for hit in store.search(query, top_k=top_k)])
+    return results, (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--multipliers", type=int, nargs="+", default=[4, 10, 30])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Optional path for a JSON report")
+    args = parser.parse_args()
+
+    vectors = synthetic_vectors(args.vectors, args.dimension, 256, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    queries = vectors[rng.integers(0, args.vectors, args.queries)]
+    queries = queries + 0.5 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    report: List[Dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        exact = build_store(directory, vectors, None, 1)
+        truth, exact_ms = run_queries(exact, queries, args.top_k)
+        report.append(
+            {"mode": "float32", "multiplier": None, "recall": 1.0, "ms": exact_ms}
+        )
+
+        for quantization in ("int8", "binary"):
+            store = build_store(directory, vectors, quantization, 1)
+            for multiplier in args.multipliers:
+                store.rescore_multiplier = multiplier
+                results, ms = run_queries(store, queries, args.top_k)
+                recall = np.mean(
+                    [
+                        len(set(found) & set(expected)) / len(expected)
+                        for found, expected in zip(results, truth)
+                    ]
+                )
+                report.append(
+                    {
+                        "mode": quantization,
+                        "multiplier": multiplier,
+                        "recall": float(recall),
+                        "ms": ms,
+                    }
+                )
+
+    print(
+        f"{args.vectors} vectors x {args.dimension} dims, {args.queries} queries, recall@{args.top_k}"
+    )
+    print(f"{'mode':<8} {'rescore':>8} {'recall':>8} {'ms/query':>10}")
+    for row in report:
+        multiplier = "-" if row["multiplier"] is None else f"x{row['multiplier']}"
+        print(
+            f"{row['mode']:<8} {multiplier:>8} {row['recall']:>8.3f} {row['ms']:>10.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Deterministic inputs for the benchmarks: synthetic markdown books and a fake embedder."""
+
+import random
+from hashlib import sha256
+from typing import List
+
+import numpy as np
+
+from app.core.interfaces import IEmbeddedGenerator
+
+VOCABULARY = (
+    "empire reform dynasty treaty parliament revolution merchant railway oil "
+    "constitution clergy army tribe province capital crown ministry press "
+    "modernization nationalism concession bazaar peasant court decree war "
+    "history society culture economy politics religion education law trade"
+).split()
+
+
+def generate_book(
+    chapters: int = 20,
+    sections_per_chapter: int = 5,
+    paragraphs_per_section: int = 8,
+    words_per_paragraph: int = 120,
+    seed: int = 0,
+) -> str:
+    """Markdown book with `#` title, `##` chapters and `###` sections.
+
+    The same arguments always produce the same text.
+    """
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        words = rng.choices(VOCABULARY, k=rng.randint(8, 24))
+        return " ".join(words).capitalize() + "."
+
+    def paragraph() -> str:
+        text: List[str] = []
+        while sum(len(s.split()) for s in text) < words_per_paragraph:
+            text.append(sentence())
+        return " ".join(text)
+
+    lines = [f"# Synthetic Book {seed}", ""]
+    for chapter in range(1, chapters + 1):
+        lines += [f"## Chapter {chapter}", ""]
+        for section in range(1, sections_per_chapter + 1):
+            lines += [f"### Section {chapter}.{section}", ""]
+            for _ in range(paragraphs_per_section):
+                lines += [paragraph(), ""]
+    return "\n".join(lines)
+
+
+class FakeEmbeddingGenerator(IEmbeddedGenerator):
+    """Embeds text as a unit vector seeded from its sha256; no network, fully repeatable."""
+
+    def __init__(self, dimension: int = 1024):
+        self.dimension = dimension
+        self.model = f"fake-{dimension}"
+
+    def generate(self, text: str) -> List[float]:
+        return self.generate_batch([text])[0]
+
+    def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        embeddings = []
+        for text in texts:
+            seed = int.from_bytes(sha256(text.encode()).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(
+                self.dimension, dtype=np.float32
+            )
+            embeddings.append((vector / np.linalg.norm(vector)).tolist())
+        return embeddings
+
+    def get_dimensions(self) -> int:
+        return self.dimension
@@ -1,3 +1,4 @@
+from app.core.logger import logger
 from app.infrastructure.document_conversion.pdf_to_markdown_converter import (
     PdfToMarkdownConverter,
 )
@@ -46,7 +47,7 @@ def main():
     # Initialize dependencies
     vector_store = VectorStoreFactory.create_store()
     embedder = EmbeddingFactory.create_embedder()
-    processor = MarkdownDocumentRepository(embedder=embedder)
+    processor = MarkdownDocumentRepository()
     library_manager = ZoteroRepository()
 
     semantic_service = SemanticService(
@@ -57,18 +58,16 @@ def main():
     )
 
     # example search
-    # test_embedding = embedder.generate("who was Reza Shah?")
-    # results = vector_store.search(test_embedding, top_k=10)
+    # results = semantic_service.search("who was Reza Shah?", top_k=10)
     # logger.info(f"Search result: {results}")
 
     processed_doc = semantic_service.process_zotero_item("5LDRFEH2")
 
     if processed_doc:
-        logger.info(f"Processed document with {len(processed_doc.chunks)} chunks")
+        logger.info(f"Processed document with {processed_doc.stored_chunks} chunks")
 
         # example search
-        test_embedding = embedder.generate("who was Reza Shah?")
-        results = vector_store.search(test_embedding, top_k=10)
+        results = semantic_service.search("who was Reza Shah?", top_k=10)
         logger.info(f"Search result: {results}")
     else:
         logger.error("Document processing failed")
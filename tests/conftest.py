@@ -0,0 +1,21 @@
+"""Test configuration: dummy credentials and a throwaway database.
+
+Settings are read from the environment on first access, so the variables
+are set here before any test imports the application.
+"""
+
+import os
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix="semantics-tests-")
+
+for name in (
+    "QWEN_API_KEY",
+    "DEEPSEEK_API_KEY",
+    "GEMINI_API_KEY",
+    "ZOTERO_API_KEY",
+    "ZOTERO_LIBRARY_ID",
+):
+    os.environ.setdefault(name, "test")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATA_DIR}/app.db"
+os.environ["NUMPY_STORE_DIR"] = os.path.join(DATA_DIR, "numpy_store")
@@ -0,0 +1,188 @@
+"""In-memory stand-ins for the embedder, vector store and library manager."""
+
+from collections import Counter
+from hashlib import sha256
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.documents import (
+    DocumentChunk,
+    DocumentMetadata,
+    LibraryChanges,
+    SearchHit,
+)
+from app.core.interfaces import (
+    IEmbeddedGenerator,
+    ILibraryManagerRepository,
+    IVectorStoreRepository,
+)
+
+
+class CountingEmbedder(IEmbeddedGenerator):
+    """Deterministic unit vectors from each text's sha256, counting every call."""
+
+    def __init__(self, dimension: int = 1024):
+        self.dimension = dimension
+        self.model = f"counting-{dimension}"
+        self.generate_calls = 0
+        self.batch_calls = 0
+        self.texts: Counter = Counter()
+
+    def generate(self, text: str) -> List[float]:
+        self.generate_calls += 1
+        self.texts[text] += 1
+        return self._embed(text)
+
+    def generate_batch(self, texts: List[str]) -> List[List[float]]:
+        self.batch_calls += 1
+        self.texts.update(texts)
+        return [self._embed(text) for text in texts]
+
+    def get_dimensions(self) -> int:
+        return self.dimension
+
+    def _embed(self, text: str) -> List[float]:
+        seed = int.from_bytes(sha256(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimension)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+
+class InMemoryStore(IVectorStoreRepository):
+    """Chunks kept in a dict by content hash; `fail_upserts` makes every write raise."""
+
+    def __init__(self, fail_upserts: bool = False):
+        self.chunks: Dict[str, DocumentChunk] = {}
+        self.fail_upserts = fail_upserts
+
+    def upsert_chunk(self, chunk: DocumentChunk) -> None:
+        self.upsert_chunks([chunk])
+
+    def upsert_chunks(self, chunks: List[DocumentChunk]) -> None:
+        if self.fail_upserts:
+            raise RuntimeError("store unavailable")
+        for chunk in chunks:
+            self.chunks[chunk.chunk_id] = chunk
+
+    def delete_source(
+        self, source_id: str, keep: Optional[Iterable[str]] = None
+    ) -> None:
+        keep = set(keep or ())
+        self.chunks = {
+            chunk_id: chunk
+            for chunk_id, chunk in self.chunks.items()
+            if chunk.source_id != source_id or chunk_id in keep
+        }
+
+    def ids_of(self, source_id: str) -> set:
+        return {
+            chunk_id
+            for chunk_id, chunk in self.chunks.items()
+            if chunk.source_id == source_id
+        }
+
+    def search(
+        self,
+        embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[SearchHit]:
+        return []
+
+    def search_many(
+        self,
+        embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_embeddings: bool = False,
+    ) -> List[List[SearchHit]]:
+        return [[] for _ in embeddings]
+
+
+class FakeLibrary(ILibraryManagerRepository):
+    """Library of items with fixed content; `None` content means nothing to ingest.
+
+    Fetching an item listed in `unreachable` raises, like a failed download,
+    and items listed in `no_metadata` have no metadata.
+    """
+
+    def __init__(
+        self,
+        contents: Dict[str, Optional[str]],
+        changes: Optional[LibraryChanges] = None,
+        unreachable: Iterable[str] = (),
+        no_metadata: Iterable[str] = (),
+    ):
+        self.contents = contents
+        self.unreachable = set(unreachable)
+        self.no_metadata = set(no_metadata)
+        self.changes = changes or LibraryChanges(since_version=0, library_version=0)
+        self.committed: List[int] = []
+
+    def list_items(
+        self, collection_key: Optional[str] = None, query: Optional[str] = None
+    ) -> List[str]:
+        return list(self.contents)
+
+    def get_metadata(self, source_id: str) -> DocumentMetadata | None:
+        return self.get_metadata_many([source_id]).get(source_id)
+
+    def get_metadata_many(self, source_ids: List[str]) -> Dict[str, DocumentMetadata]:
+        return {
+            source_id: DocumentMetadata(
+                zotero_id=source_id, title=f"Title {source_id}", authors="Doe, J"
+            )
+            for source_id in source_ids
+            if source_id in self.contents and source_id not in self.no_metadata
+        }
+
+    def get_source_content(self, parent_id: str) -> str | None:
+        if parent_id in self.unreachable:
+            raise ConnectionError(f"could not fetch {parent_id}")
+        return self.contents.get(parent_id)
+
+    def get_changes(self) -> LibraryChanges:
+        return self.changes
+
+    def commit_sync(self, library_version: int) -> None:
+        self.committed.append(library_version)
+
+
+def make_book(chapters: int = 3, paragraphs: int = 6) -> str:
+    """Markdown with unique sentences, long enough to split into many chunks."""
+    parts = ["# Book"]
+    for chapter in range(chapters):
+        parts.append(f"## Chapter {chapter}")
+        for paragraph in range(paragraphs):
+            parts.append(
+                " ".join(
+                    f"Sentence {chapter}.{paragraph}.{i} about the history of the region."
+                    for i in range(8)
+                )
+            )
+    return "\n\n".join(parts)
+
+
+def make_chunks(count: int, start: int = 0, seed: int = 0, dimension: int = 512):
+    """Random-vector chunks spread over 7 sources, 5 titles, 3 tags and 2 languages."""
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for i in range(start, start + count):
+        source_id = f"SRC{i % 7}"
+        metadata = DocumentMetadata(
+            zotero_id=source_id,
+            title=f"Title {i % 5}",
+            authors="Doe, J",
+            tags=("history", "politics", "economy")[i % 3],
+            language="en" if i % 4 else "fa",
+        )
+        chunks.append(
+            DocumentChunk(
+                content=f"chunk {i}",
+                embedding=rng.standard_normal(dimension).tolist(),
+                metadata=metadata,
+                source_id=source_id,
+            )
+        )
+    return chunks
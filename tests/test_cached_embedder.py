@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.sql_models import EmbeddingCacheEntry
+from app.infrastructure.embedding.cached_embedder import CachedEmbeddingGenerator
+from tests.fakes import CountingEmbedder
+
+
+def make_cache(tmp_path, embedder, max_bytes=None):
+    engine = create_engine(f"sqlite:///{tmp_path}/cache.db")
+    return CachedEmbeddingGenerator(
+        embedder,
+        model=embedder.model,
+        max_bytes=max_bytes,
+        session_factory=sessionmaker(bind=engine),
+    )
+
+
+def test_repeated_texts_are_served_from_the_cache(tmp_path):
+    embedder = CountingEmbedder()
+    cache = make_cache(tmp_path, embedder)
+    texts = [f"text {i}" for i in range(50)]
+
+    first = cache.generate_batch(texts)
+    second = cache.generate_batch(texts)
+
+    assert embedder.batch_calls == 1
+    assert np.allclose(first, second, atol=1e-6)
+    assert cache.stats() == {"hits": 50, "misses": 50, "hit_rate": 0.5}
+
+
+def test_concurrent_batches_count_every_lookup(tmp_path):
+    embedder = CountingEmbedder()
+    cache = make_cache(tmp_path, embedder)
+    # Overlapping batches, so threads race to insert the same entries
+    batches = [[f"text {j}" for j in range(i, i + 20)] for i in range(0, 80, 5)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(cache.generate_batch, batches))
+
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == sum(len(batch) for batch in batches)
+    for batch, embeddings in zip(batches, results):
+        expected = [embedder._embed(text) for text in batch]
+        assert np.allclose(embeddings, expected, atol=1e-6)
+
+
+def test_eviction_keeps_the_cache_under_max_bytes_without_summing_every_batch(
+    tmp_path,
+):
+    embedder = CountingEmbedder()
+    entry_bytes = embedder.get_dimensions() * 4
+    cache = make_cache(tmp_path, embedder, max_bytes=30 * entry_bytes)
+    sums = []
+    event.listen(
+        cache.session_factory.kw["bind"],
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: (
+            sums.append(statement) if "sum(" in statement.lower() else None
+        ),
+    )
+
+    for batch in range(10):
+        cache.generate_batch([f"text {batch}.{i}" for i in range(10)])
+
+    # Once at start, then once per batch that pushes the cache past the limit
+    assert len(sums) == 1 + 7
+    with cache.session_factory() as session:
+        stored = session.scalar(select(func.sum(EmbeddingCacheEntry.size_bytes)))
+    assert stored == 30 * entry_bytes
+
+    # Least recently used entries went first
+    cache.generate_batch([f"text 9.{i}" for i in range(10)])
+    assert cache.stats()["hits"] == 10
+    cache.generate_batch([f"text 0.{i}" for i in range(10)])
+    assert cache.stats()["hits"] == 10
@@ -0,0 +1,101 @@
+"""Parity of the native sentence-boundary chunker with the langchain path.
+
+Chunk texts differ by design (sentence ends versus paragraph, line or word
+breaks), so the checks cover what the two must agree on: the header
+sections, the chunk_size budget and coverage of every non-whitespace
+character.
+"""
+
+from typing import Dict, List, Tuple
+
+import pytest
+
+from app.infrastructure.markdown.processor import MarkdownProcessor
+from benchmarks.synthetic import generate_book
+
+CHUNK_SIZE = 400
+CHUNK_OVERLAP = 50
+
+HeaderPath = Tuple[Tuple[str, str], ...]
+
+DOCUMENTS = {
+    "synthetic": generate_book(4, 3, 4, seed=1),
+    "synthetic-long-paragraphs": generate_book(2, 2, 3, words_per_paragraph=400),
+    "no-headers": " ".join(f"Sentence {i} without any header." for i in range(200)),
+    "run-on": "# Title\n\n" + " ".join(["unpunctuated"] * 300),
+    "empty-sections": "\n\n".join(
+        f"# Part {i}\n\n## Chapter\n\n### Section\n\nBody of part {i}."
+        for i in range(20)
+    ),
+    "code-fence": "# Code\n\n```\n# not a header\nprint(1)\n```\n\nAfter the fence.",
+}
+
+
+@pytest.fixture(scope="module")
+def processors() -> Dict[str, MarkdownProcessor]:
+    options = dict(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    return {
+        "recursive": MarkdownProcessor(chunker="recursive", **options),
+        "sentence": MarkdownProcessor(chunker="sentence", **options),
+    }
+
+
+def header_path(metadata: Dict[str, str]) -> HeaderPath:
+    return tuple(sorted(metadata.items()))
+
+
+def langchain_sections(
+    processor: MarkdownProcessor, text: str
+) -> List[Tuple[HeaderPath, List[str]]]:
+    return [
+        (header_path(section.metadata), section.page_content.split())
+        for section in processor.header_splitter.split_text(text)
+        if section.page_content.strip()
+    ]
+
+
+def native_sections(
+    processor: MarkdownProcessor, text: str
+) -> List[Tuple[HeaderPath, List[str]]]:
+    """Consecutive spans with the same headers, merged back into one section.
+
+    langchain also merges consecutive sections whose headers are identical.
+    """
+    sections: List[Tuple[HeaderPath, int, int]] = []
+    for span in processor.sentence_chunker.iter_spans(text):
+        path = header_path(dict(span.headers))
+        if sections and sections[-1][0] == path:
+            sections[-1] = (path, sections[-1][1], span.end)
+        else:
+            sections.append((path, span.start, span.end))
+    return [(path, text[start:end].split()) for path, start, end in sections]
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_sections_match_langchain(processors, name):
+    text = DOCUMENTS[name]
+
+    assert native_sections(processors["sentence"], text) == langchain_sections(
+        processors["recursive"], text
+    )
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_chunks_stay_within_budget(processors, name):
+    spans = list(processors["sentence"].sentence_chunker.iter_spans(DOCUMENTS[name]))
+
+    assert spans
+    assert max(span.end - span.start for span in spans) <= CHUNK_SIZE
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_chunks_cover_all_text(processors, name):
+    text = DOCUMENTS[name]
+    covered = bytearray(len(text))
+    for span in processors["sentence"].sentence_chunker.iter_spans(text):
+        covered[span.start : span.end] = b"\x01" * (span.end - span.start)
+
+    uncovered = [
+        i for i, char in enumerate(text) if not covered[i] and not char.isspace()
+    ]
+    assert not uncovered
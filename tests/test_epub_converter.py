@@ -0,0 +1,67 @@
+import zipfile
+from typing import Dict, Optional, Tuple
+
+from app.infrastructure.document_conversion.epub_to_markdown_converter import (
+    EpubToMarkdownConverter,
+)
+
+CONTAINER = """<?xml version="1.0"?>
+<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container" version="1.0">
+  <rootfiles><rootfile full-path="OEBPS/content.opf"/></rootfiles>
+</container>"""
+
+
+class DictCache:
+    """ConversionCache stand-in that records every write."""
+
+    def __init__(self):
+        self.entries: Dict[Tuple[str, str], str] = {}
+        self.puts = 0
+
+    def get(self, content_hash: str, extract_method: str) -> Optional[str]:
+        return self.entries.get((content_hash, extract_method))
+
+    def put(self, content_hash: str, extract_method: str, markdown: str) -> None:
+        self.entries[(content_hash, extract_method)] = markdown
+        self.puts += 1
+
+
+def make_epub(path, chapters: int = 3) -> str:
+    manifest = "".join(
+        f'<item id="c{i}" href="c{i}.xhtml" media-type="application/xhtml+xml"/>'
+        for i in range(chapters)
+    )
+    spine = "".join(f'<itemref idref="c{i}"/>' for i in range(chapters))
+    with zipfile.ZipFile(path, "w") as book:
+        book.writestr("META-INF/container.xml", CONTAINER)
+        book.writestr(
+            "OEBPS/content.opf",
+            f'<package xmlns="http://www.idpf.org/2007/opf"><manifest>{manifest}'
+            f"</manifest><spine>{spine}</spine></package>",
+        )
+        for i in range(chapters):
+            book.writestr(
+                f"OEBPS/c{i}.xhtml",
+                f"<html><body><h2>Chapter {i}</h2><p>Text of chapter {i}.</p></body></html>",
+            )
+    return str(path)
+
+
+def test_use_cache_false_disables_the_default_cache():
+    assert EpubToMarkdownConverter(use_cache=False).cache is None
+    assert EpubToMarkdownConverter(cache=DictCache(), use_cache=False).cache is None
+
+
+def test_streaming_a_cache_miss_does_not_cache(tmp_path):
+    epub = make_epub(tmp_path / "book.epub")
+    cache = DictCache()
+    converter = EpubToMarkdownConverter(cache=cache)
+
+    streamed = [chapter.chapter for chapter in converter.iter_chapters(epub)]
+    assert streamed == ["Chapter 0", "Chapter 1", "Chapter 2"]
+    assert cache.puts == 0
+
+    converter.convert(epub)
+    replayed = [chapter.chapter for chapter in converter.iter_chapters(epub)]
+    assert replayed == streamed
+    assert cache.puts == 1
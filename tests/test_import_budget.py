@@ -0,0 +1,76 @@
+"""Import-time budgets for the modules a CLI or query invocation loads first.
+
+Each module is imported in a fresh interpreter under `python -X importtime`,
+with no credentials in the environment, so importing must neither build
+`Settings` nor load a backend (chromadb, qdrant_client, openai, pymupdf,
+langchain) that is only needed once it is selected. Most of the remaining
+time is pydantic, which `app.config.settings` pays for everyone.
+
+Set IMPORT_BUDGET_SCALE (e.g. 2) to loosen the budgets on a slow machine.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+# Budgets in milliseconds of cumulative import time, best of REPEAT runs
+BUDGETS_MS: Dict[str, float] = {
+    "app.config.settings": 350,
+    "app.infrastructure.vector_store.factory": 450,
+    "app.infrastructure.embedding.factory": 450,
+    "app.infrastructure.embedding.async_qwen_embedder": 500,
+    "app.services.semantic_service": 500,
+    "app.infrastructure.markdown.document_repository": 500,
+    "app.infrastructure.document_conversion.pdf_to_markdown_converter": 450,
+}
+REPEAT = 3
+
+DEFERRED_MODULES = (
+    "chromadb",
+    "qdrant_client",
+    "openai",
+    "pymupdf",
+    "pymupdf4llm",
+    "langchain_text_splitters",
+)
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def measure_import(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module loaded by `import module`."""
+    env = {"PATH": os.environ.get("PATH", ""), "PYTHONPATH": str(PROJECT_ROOT)}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=PROJECT_ROOT,
+    )
+    assert completed.returncode == 0, f"import {module} failed:\n{completed.stderr}"
+
+    cumulative: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(3)] = int(match.group(2))
+    return cumulative
+
+
+@pytest.mark.parametrize("module", BUDGETS_MS)
+def test_import_stays_within_budget(module):
+    runs = [measure_import(module) for _ in range(REPEAT)]
+
+    leaked = [name for name in DEFERRED_MODULES if name in runs[0]]
+    assert not leaked, f"{module} imports {', '.join(leaked)} eagerly"
+
+    budget_ms = BUDGETS_MS[module] * float(os.environ.get("IMPORT_BUDGET_SCALE", 1))
+    best_ms = min(run[module] for run in runs) / 1000
+    assert best_ms <= budget_ms, f"{module}: {best_ms:.1f} ms > {budget_ms:.0f} ms"
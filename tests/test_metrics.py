@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.metrics.in_memory import InMemoryMetrics
+from app.infrastructure.metrics.prometheus import render_prometheus
+
+
+def test_counters_and_timings_accumulate_per_label_set():
+    metrics = InMemoryMetrics()
+    metrics.increment("chunks", 3, backend="chroma")
+    metrics.increment("chunks", backend="chroma")
+    metrics.increment("chunks", backend="qdrant")
+    metrics.observe("fetch", 0.5, outcome="ok")
+    metrics.observe("fetch", 1.5, outcome="ok")
+
+    counters, timings = metrics.snapshot()
+    assert counters == {
+        ("chunks", (("backend", "chroma"),)): 4,
+        ("chunks", (("backend", "qdrant"),)): 1,
+    }
+    stats = timings[("fetch", (("outcome", "ok"),))]
+    assert (stats.count, stats.total, stats.min, stats.max) == (2, 2.0, 0.5, 1.5)
+    assert stats.mean == 1.0
+    assert metrics.stage_totals() == {"fetch": 2.0}
+
+
+def test_concurrent_updates_are_not_lost():
+    metrics = InMemoryMetrics()
+    threads, per_thread = 8, 2000
+
+    def work():
+        for _ in range(per_thread):
+            metrics.increment("items")
+            metrics.observe("embedding", 0.001)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    counters, timings = metrics.snapshot()
+    assert counters[("items", ())] == threads * per_thread
+    assert timings[("embedding", ())].count == threads * per_thread
+
+
+def test_timer_labels_the_outcome():
+    metrics = InMemoryMetrics()
+    with metrics.timer("store"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.timer("store"):
+            raise ValueError("boom")
+
+    _, timings = metrics.snapshot()
+    assert timings[("store", (("outcome", "ok"),))].count == 1
+    assert timings[("store", (("outcome", "error"),))].count == 1
+
+
+def test_timed_iter_excludes_consumer_time():
+    metrics = InMemoryMetrics()
+
+    for _ in metrics.timed_iter("chunking", range(3), chunker="sentence"):
+        time.sleep(0.05)
+
+    _, timings = metrics.snapshot()
+    stats = timings[("chunking", (("chunker", "sentence"), ("outcome", "ok")))]
+    assert stats.count == 1
+    assert stats.total < 0.05
+
+
+def test_timed_iter_records_an_error_when_the_producer_fails():
+    metrics = InMemoryMetrics()
+
+    def failing():
+        yield 1
+        raise RuntimeError("broken")
+
+    with pytest.raises(RuntimeError):
+        list(metrics.timed_iter("chunking", failing()))
+
+    _, timings = metrics.snapshot()
+    assert list(timings) == [("chunking", (("outcome", "error"),))]
+
+
+def test_render_prometheus_text():
+    metrics = InMemoryMetrics()
+    metrics.increment("items", 1_234_567)
+    metrics.increment("errors", source='say "hi"\\\n')
+    metrics.increment("tokens", 0.1)
+    metrics.increment("tokens", 0.2)
+    metrics.observe("fetch", 0.25, outcome="ok")
+    metrics.observe("fetch", 0.5, outcome="ok")
+
+    assert render_prometheus(metrics) == (
+        "# TYPE semantics_errors_total counter\n"
+        'semantics_errors_total{source="say \\"hi\\"\\\\\\n"} 1\n'
+        "# TYPE semantics_items_total counter\n"
+        "semantics_items_total 1234567\n"
+        "# TYPE semantics_tokens_total counter\n"
+        "semantics_tokens_total 0.30000000000000004\n"
+        "# TYPE semantics_fetch_seconds summary\n"
+        'semantics_fetch_seconds_count{outcome="ok"} 2\n'
+        'semantics_fetch_seconds_sum{outcome="ok"} 0.75\n'
+    )
+
+
+def test_render_prometheus_without_series_is_empty():
+    assert render_prometheus(InMemoryMetrics()) == ""
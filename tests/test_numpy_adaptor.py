@@ -0,0 +1,126 @@
+import pytest
+
+from app.infrastructure.vector_store import numpy_adaptor
+from app.infrastructure.vector_store.numpy_adaptor import NumpyAdaptor
+from app.infrastructure.vector_store.serialization import (
+    matches_filter,
+    serialize_metadata,
+)
+from tests.fakes import make_chunks
+
+
+def open_store(tmp_path):
+    return NumpyAdaptor("test", str(tmp_path))
+
+
+def results(store, query, filters=None, top_k=500):
+    return [
+        (hit.id, hit.content, hit.metadata.zotero_id)
+        for hit in store.search(query, top_k=top_k, filters=filters)
+    ]
+
+
+def test_reopened_store_returns_the_same_hits(tmp_path):
+    chunks = make_chunks(300)
+    store = open_store(tmp_path)
+    store.upsert_chunks(chunks)
+    query = chunks[10].embedding.tolist()
+    before = results(store, query, top_k=20)
+    store.close()
+
+    reopened = open_store(tmp_path)
+    assert len(reopened) == 300
+    assert results(reopened, query, top_k=20) == before
+    assert before[0][1] == "chunk 10"
+    hit = reopened.search(query, top_k=1)[0]
+    assert hit.metadata == chunks[10].metadata
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"zotero_id": "SRC3"},
+        {"tags": {"$in": ["history", "economy"]}},
+        {"language": {"$ne": "en"}},
+        {"zotero_id": {"$nin": ["SRC1", "SRC2"]}, "tags": "politics"},
+        {"$or": [{"zotero_id": "SRC0"}, {"language": "fa"}]},
+        {"$and": [{"tags": "history"}, {"title": "Title 2"}]},
+        {"title": {"$in": ["Title 1", "Title 4"]}},
+        {"zotero_id": "MISSING"},
+        {"unknown": {"$ne": "x"}},
+        {"unknown": "x"},
+        {"ingestion_data": {"$ne": "2000-01-01T00:00:00"}},
+    ],
+)
+def test_filters_match_the_reference_semantics(tmp_path, filters):
+    chunks = make_chunks(200)
+    store = open_store(tmp_path)
+    store.upsert_chunks(chunks)
+
+    expected = {
+        chunk.chunk_id
+        for chunk in chunks
+        if matches_filter(serialize_metadata(chunk.metadata), filters)
+    }
+    hits = store.search(chunks[0].embedding.tolist(), top_k=500, filters=filters)
+    assert {hit.id for hit in hits} == expected
+
+
+def test_open_replays_only_records_after_the_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(numpy_adaptor, "SNAPSHOT_MIN_RECORDS", 100)
+    chunks = make_chunks(250)
+    store = open_store(tmp_path)
+    store.upsert_chunks(chunks[:150])
+    assert (tmp_path / "test" / "table.npz").exists()
+    store.upsert_chunks(chunks[150:])  # 100 records since the snapshot: another one
+    store.upsert_chunks(make_chunks(20, start=250))  # left in the log tail
+    store.delete_source("SRC1")
+
+    reopened = open_store(tmp_path)
+    assert 0 < reopened._unsnapshotted < 100
+    query = chunks[5].embedding.tolist()
+    assert results(reopened, query) == results(store, query)
+
+
+def test_delete_source_keeps_requested_chunks_and_compaction_preserves_hits(tmp_path):
+    chunks = make_chunks(140)
+    store = open_store(tmp_path)
+    store.upsert_chunks(chunks)
+    source_chunks = [chunk for chunk in chunks if chunk.source_id == "SRC2"]
+    keep = {source_chunks[0].chunk_id}
+
+    store.delete_source("SRC2", keep=keep)
+    assert len(store) == 140 - len(source_chunks) + 1
+    query = chunks[0].embedding.tolist()
+    before = results(store, query)
+
+    store.compact()
+    assert results(store, query) == before
+    assert results(open_store(tmp_path), query) == before
+    remaining = store.search(query, top_k=500, filters={"zotero_id": "SRC2"})
+    assert [hit.id for hit in remaining] == list(keep)
+
+
+def test_upsert_of_a_stored_chunk_overwrites_its_row(tmp_path):
+    chunks = make_chunks(30)
+    store = open_store(tmp_path)
+    store.upsert_chunks(chunks)
+    store.close()
+
+    reopened = open_store(tmp_path)
+    reopened.upsert_chunks(chunks[:10])
+    assert len(reopened) == 30
+    assert reopened._count == 30
+
+
+def test_partial_trailing_record_is_dropped_on_open(tmp_path):
+    chunks = make_chunks(20)
+    store = open_store(tmp_path)
+    store.upsert_chunks(chunks)
+    with open(tmp_path / "test" / "rows.jsonl", "ab") as f:
+        f.write(b'{"row": 20, "id": "ab')
+
+    reopened = open_store(tmp_path)
+    assert len(reopened) == 20
+    reopened.upsert_chunks(make_chunks(5, start=20))
+    assert len(open_store(tmp_path)) == 25
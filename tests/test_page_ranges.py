@@ -0,0 +1,50 @@
+import re
+
+import pytest
+
+from app.core.documents import DocumentMetadata
+from app.infrastructure.document_conversion.page_index import (
+    ChunkLocator,
+    join_pages,
+)
+from app.infrastructure.markdown.processor import MarkdownProcessor
+
+SOURCE = DocumentMetadata(zotero_id="PAGED", title="Paged", authors="Doe, J", tags="")
+
+
+def make_paged_book(pages: int = 8) -> str:
+    """Pages whose every word names the page it is on, with rewrapped lines."""
+    texts = []
+    for page in range(1, pages + 1):
+        heading = f"## Chapter {page}\n\n" if page % 3 == 1 else ""
+        body = "\n".join(
+            f"  p{page}w{i} p{page}x{i}   p{page}y{i}.  " for i in range(40)
+        )
+        texts.append(f"{heading}{body}\n\n- p{page}item")
+    return "# Book\n\n" + join_pages(texts)
+
+
+def expected_range(content: str) -> str:
+    pages = [int(page) for page in re.findall(r"\bp(\d+)[a-z]", content)]
+    first, last = min(pages), max(pages)
+    return str(first) if first == last else f"{first}-{last}"
+
+
+@pytest.mark.parametrize("chunker", ["recursive", "sentence"])
+def test_chunks_carry_page_ranges_and_no_page_breaks(chunker):
+    processor = MarkdownProcessor(chunker=chunker, chunk_size=300, chunk_overlap=40)
+    drafts = processor.process(make_paged_book(), SOURCE)
+
+    assert any("-" in draft.metadata.page_range for draft in drafts)
+    for draft in drafts:
+        assert "\f" not in draft.content
+        if re.search(r"\bp\d+[a-z]", draft.content):
+            assert draft.metadata.page_range == expected_range(draft.content)
+
+
+def test_locator_skips_text_that_is_not_in_the_buffer():
+    locator = ChunkLocator(join_pages(["alpha beta", "gamma delta"]))
+
+    assert locator.page_range("beta\ngamma") == "1-2"
+    assert locator.page_range("epsilon") is None
+    assert locator.page_range("  delta ") == "2"
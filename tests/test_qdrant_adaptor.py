@@ -0,0 +1,111 @@
+import pytest
+
+from app.config.settings import get_settings
+from app.infrastructure.vector_store.factory import VectorStoreFactory
+from app.infrastructure.vector_store.qdrant_adaptor import QdrantAdaptor
+from app.infrastructure.vector_store.serialization import (
+    matches_filter,
+    serialize_metadata,
+)
+from tests.fakes import make_chunks
+
+
+@pytest.fixture
+def store(tmp_path):
+    adaptor = QdrantAdaptor("test", path=str(tmp_path / "qdrant"))
+    yield adaptor
+    adaptor.client.close()
+
+
+def expected_ids(chunks, filters):
+    return {
+        chunk.chunk_id
+        for chunk in chunks
+        if matches_filter(serialize_metadata(chunk.metadata), filters)
+    }
+
+
+def test_upsert_then_search_returns_the_chunk_first(store):
+    chunks = make_chunks(60)
+    store.upsert_chunks(chunks)
+    store.upsert_chunks(chunks[:10])  # same points, overwritten
+
+    hits = store.search(chunks[7].embedding.tolist(), top_k=3)
+    assert len(hits) == 3
+    assert hits[0].id == chunks[7].chunk_id
+    assert hits[0].content == "chunk 7"
+    assert hits[0].metadata == chunks[7].metadata
+    assert hits[0].distance == pytest.approx(0.0, abs=1e-5)
+    assert store.client.count("test").count == 60
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"zotero_id": "SRC3"},
+        {"tags": {"$in": ["history", "economy"]}, "language": {"$ne": "en"}},
+        {"$or": [{"zotero_id": "SRC0"}, {"language": "fa"}]},
+    ],
+)
+def test_filters_match_the_reference_semantics(store, filters):
+    chunks = make_chunks(100)
+    store.upsert_chunks(chunks)
+
+    hits = store.search(chunks[0].embedding.tolist(), top_k=500, filters=filters)
+    assert {hit.id for hit in hits} == expected_ids(chunks, filters)
+
+
+def test_delete_source_keeps_requested_chunks(store):
+    chunks = make_chunks(70)
+    store.upsert_chunks(chunks)
+    source_chunks = [chunk for chunk in chunks if chunk.source_id == "SRC2"]
+    keep = {source_chunks[0].chunk_id}
+
+    store.delete_source("SRC2", keep=keep)
+    store.delete_source("SRC4")
+
+    query = chunks[0].embedding.tolist()
+    remaining = store.search(query, top_k=500, filters={"zotero_id": "SRC2"})
+    assert [hit.id for hit in remaining] == list(keep)
+    assert store.search(query, top_k=500, filters={"zotero_id": "SRC4"}) == []
+    assert store.client.count("test").count == 70 - len(source_chunks) + 1 - 10
+
+
+def test_search_many_answers_each_query_in_order(store):
+    chunks = make_chunks(40)
+    store.upsert_chunks(chunks)
+    queries = [chunks[i].embedding.tolist() for i in (3, 21, 35)]
+
+    batched = store.search_many(queries, top_k=4, filters={"language": "en"})
+    assert batched == [
+        store.search(query, top_k=4, filters={"language": "en"}) for query in queries
+    ]
+    assert [hits[0].id for hits in batched] == [chunks[i].chunk_id for i in (3, 21, 35)]
+
+
+def test_search_before_the_first_upsert_is_empty(store):
+    assert store.search_many([[1.0, 0.0], [0.0, 1.0]]) == [[], []]
+    store.delete_source("SRC0")
+
+
+@pytest.fixture
+def qdrant_settings(tmp_path, monkeypatch):
+    monkeypatch.setenv("VECTOR_STORE_TYPE", "qdrant")
+    monkeypatch.setenv("QDRANT_PATH", str(tmp_path / "factory"))
+    monkeypatch.delenv("QDRANT_URL", raising=False)
+    monkeypatch.delenv("HYBRID_SEARCH_ENABLED", raising=False)
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def test_factory_builds_an_embedded_qdrant_store(qdrant_settings, tmp_path):
+    store = VectorStoreFactory.create_store()
+    try:
+        assert isinstance(store, QdrantAdaptor)
+        assert store.collection_name == get_settings().chroma_collection
+        store.upsert_chunks(make_chunks(5))
+        assert (tmp_path / "factory").is_dir()
+        assert store.client.count(store.collection_name).count == 5
+    finally:
+        store.client.close()
@@ -0,0 +1,131 @@
+from types import SimpleNamespace
+from typing import List
+
+import httpx
+import openai
+import pytest
+
+from app.config.settings import get_settings
+from app.infrastructure.embedding import qwen_embedder
+from app.infrastructure.embedding.qwen_embedder import QwenEmbeddingGenerator
+from app.infrastructure.embedding.rate_limiter import RateLimiter, retry_after_seconds
+
+REQUEST = httpx.Request("POST", "https://example.invalid/embeddings")
+
+
+def rate_limit_error(headers) -> openai.RateLimitError:
+    response = httpx.Response(429, headers=headers, request=REQUEST)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class RecordingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__(requests_per_minute=10_000, tokens_per_minute=10_000_000)
+        self.backoffs: List[float] = []
+
+    def backoff(self, seconds: float) -> None:
+        self.backoffs.append(seconds)
+
+
+class FlakyEmbeddings:
+    """`client.embeddings` that fails with queued errors before answering."""
+
+    def __init__(self, errors, dimension: int):
+        self.errors = list(errors)
+        self.dimension = dimension
+        self.calls = 0
+
+    def create(self, input, model):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        texts = input if isinstance(input, list) else [input]
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[0.0] * self.dimension)
+                for i in range(len(texts))
+            ]
+        )
+
+
+def make_embedder(errors):
+    limiter = RecordingLimiter()
+    embedder = QwenEmbeddingGenerator(rate_limiter=limiter)
+    embeddings = FlakyEmbeddings(errors, embedder.get_dimensions())
+    embedder._client = SimpleNamespace(embeddings=embeddings)
+    return embedder, limiter, embeddings
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept: List[float] = []
+    monkeypatch.setattr(qwen_embedder.time, "sleep", slept.append)
+    return slept
+
+
+def test_rate_limit_backs_off_the_shared_limiter(sleeps):
+    embedder, limiter, embeddings = make_embedder(
+        [rate_limit_error({"retry-after": "0.01"})]
+    )
+
+    assert len(embedder.generate_batch(["a", "b"])) == 2
+    assert embeddings.calls == 2
+    assert limiter.backoffs == [0.01]
+    assert sleeps == []
+
+
+def test_rate_limit_without_header_uses_the_default_backoff(sleeps):
+    embedder, limiter, _ = make_embedder([rate_limit_error({})])
+
+    embedder.generate("a")
+    assert limiter.backoffs == [qwen_embedder.DEFAULT_RATE_LIMIT_BACKOFF]
+
+
+@pytest.fixture
+def max_retries(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_MAX_RETRIES", "5")
+    get_settings.cache_clear()
+    yield 5
+    get_settings.cache_clear()
+
+
+def test_rate_limit_is_raised_after_the_last_attempt(sleeps, max_retries):
+    errors = [rate_limit_error({"retry-after": "0"})] * max_retries
+    embedder, limiter, embeddings = make_embedder(errors)
+
+    with pytest.raises(openai.RateLimitError):
+        embedder.generate("a")
+    assert embeddings.calls == max_retries
+    assert len(limiter.backoffs) == max_retries - 1
+
+
+def test_client_leaves_retries_to_the_limiter():
+    client = QwenEmbeddingGenerator().client
+
+    # SDK retries would bypass rate_limiter.acquire() and backoff()
+    assert client.max_retries == 0
+    assert client.timeout == get_settings().embedding_timeout
+    assert str(client.base_url).rstrip("/") == get_settings().qwen_api_endpoint
+
+
+def test_other_api_errors_retry_with_exponential_delay(sleeps):
+    errors = [openai.APIConnectionError(request=REQUEST)] * 2
+    embedder, limiter, _ = make_embedder(errors)
+
+    embedder.generate("a")
+    assert sleeps == [qwen_embedder.RETRY_DELAY, qwen_embedder.RETRY_DELAY * 2]
+    assert limiter.backoffs == []
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"retry-after": "3"}, 3.0),
+        ({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),
+        ({"retry-after": "soon"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after_seconds(headers, expected):
+    assert retry_after_seconds(rate_limit_error(headers)) == expected
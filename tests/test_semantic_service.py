@@ -0,0 +1,191 @@
+import threading
+
+import pytest
+
+from app.config.settings import get_settings
+from app.core.documents import LibraryChanges
+from app.infrastructure.markdown.document_repository import MarkdownDocumentRepository
+from app.services.semantic_service import SemanticService
+from tests.fakes import CountingEmbedder, FakeLibrary, InMemoryStore, make_book
+
+
+def make_service(library, store=None, embedder=None):
+    return SemanticService(
+        vector_store=store or InMemoryStore(),
+        embedder=embedder or CountingEmbedder(),
+        processor=MarkdownDocumentRepository(),
+        library_manager=library,
+    )
+
+
+def test_each_chunk_is_embedded_exactly_once():
+    embedder = CountingEmbedder()
+    store = InMemoryStore()
+    service = make_service(FakeLibrary({"ITEM0001": make_book()}), store, embedder)
+
+    result = service.process_zotero_item("ITEM0001")
+
+    assert result is not None and result.stored_chunks > 1
+    assert embedder.generate_calls == 0
+    assert embedder.batch_calls == result.windows
+    stored = [chunk.content for chunk in store.chunks.values()]
+    assert sorted(embedder.texts) == sorted(stored)
+    assert set(embedder.texts.values()) == {1}
+
+
+def ingested_library(contents, **library_options):
+    """A service whose store already holds every item of `contents`."""
+    library = FakeLibrary(dict(contents), **library_options)
+    store = InMemoryStore()
+    service = make_service(library, store)
+    for source_id in contents:
+        assert service.process_zotero_item(source_id) is not None
+    library.changes = LibraryChanges(
+        since_version=1, library_version=2, changed_ids=list(contents)
+    )
+    return service, library, store
+
+
+def test_sync_keeps_old_chunks_and_watermark_when_storage_fails():
+    service, library, store = ingested_library(
+        {"ITEM0001": make_book(), "ITEM0002": make_book(chapters=2)}
+    )
+    before = dict(store.chunks)
+    library.contents["ITEM0001"] = make_book(chapters=4)
+    store.fail_upserts = True
+
+    results = service.sync_library()
+
+    assert results == {"ITEM0001": False, "ITEM0002": False}
+    assert library.committed == []
+    assert store.chunks == before
+
+
+def test_sync_treats_a_failed_fetch_as_failure():
+    service, library, store = ingested_library({"ITEM0001": make_book()})
+    before = dict(store.chunks)
+    library.unreachable.add("ITEM0001")
+
+    assert service.sync_library() == {"ITEM0001": False}
+    assert library.committed == []
+    assert store.chunks == before
+
+
+def test_sync_replaces_changed_chunks_and_advances_the_watermark():
+    service, library, store = ingested_library(
+        {"ITEM0001": make_book(chapters=3), "ITEM0002": make_book(chapters=2)}
+    )
+    old_ids = store.ids_of("ITEM0001")
+    library.contents["ITEM0001"] = make_book(chapters=2)
+    library.contents["ITEM0002"] = None  # source.md removed
+
+    assert service.sync_library() == {"ITEM0001": True, "ITEM0002": True}
+    assert library.committed == [2]
+
+    new_ids = {
+        chunk.chunk_id
+        for chunk in service.processor.process(
+            make_book(chapters=2), library.get_metadata("ITEM0001")
+        )
+    }
+    assert store.ids_of("ITEM0001") == new_ids
+    assert old_ids - new_ids  # stale chunks existed and were pruned
+    assert store.ids_of("ITEM0002") == set()
+
+
+def test_items_sharing_text_keep_their_own_chunks():
+    # make_book(chapters=2) is a prefix of make_book(), so most chunks overlap
+    service, library, store = ingested_library(
+        {"ITEM0001": make_book(), "ITEM0002": make_book(chapters=2)}
+    )
+    shared = {chunk.content for chunk in store.chunks.values()}
+    for source_id in ("ITEM0001", "ITEM0002"):
+        texts = [store.chunks[i].content for i in store.ids_of(source_id)]
+        assert len(texts) == len(set(texts))
+    assert len(store.chunks) > len(shared)
+
+    ids_before = store.ids_of("ITEM0001")
+    library.contents["ITEM0002"] = None
+    library.contents["ITEM0001"] = make_book(chapters=3)
+
+    assert service.sync_library() == {"ITEM0001": True, "ITEM0002": True}
+    assert store.ids_of("ITEM0001") == ids_before
+    assert store.ids_of("ITEM0002") == set()
+
+
+@pytest.mark.parametrize("blank", ["whitespace", "no-metadata"])
+def test_sync_removes_items_with_nothing_to_ingest_and_advances(blank):
+    service, library, store = ingested_library(
+        {"ITEM0001": make_book(), "ITEM0002": make_book(chapters=2)}
+    )
+    if blank == "whitespace":
+        library.contents["ITEM0002"] = "  \n\t "
+    else:
+        library.no_metadata.add("ITEM0002")
+
+    assert service.sync_library() == {"ITEM0001": True, "ITEM0002": True}
+    assert library.committed == [2]
+    assert store.ids_of("ITEM0002") == set()
+    assert store.ids_of("ITEM0001")
+
+
+def test_process_collection_reports_every_item():
+    library = FakeLibrary(
+        {
+            "ITEM0001": make_book(),
+            "ITEM0002": make_book(chapters=2),
+            "ITEM0003": None,
+            "ITEM0004": "   ",
+            "ITEM0005": make_book(),
+            "ITEM0006": make_book(),
+        },
+        unreachable=["ITEM0005"],
+        no_metadata=["ITEM0006"],
+    )
+    store = InMemoryStore()
+
+    report = make_service(library, store).process_collection(workers=3)
+
+    assert sorted(report.succeeded) == ["ITEM0001", "ITEM0002"]
+    assert sorted(report.skipped) == ["ITEM0003", "ITEM0004"]
+    assert report.errors == {
+        "ITEM0005": "could not fetch ITEM0005",
+        "ITEM0006": "Metadata not found",
+    }
+    for source_id, result in report.results.items():
+        assert result.failed_chunks == 0
+        assert result.chunk_ids == store.ids_of(source_id)
+    assert report.stored_chunks == len(store.chunks)
+    assert report.failed_chunks == 0
+    assert report.seconds > 0 and report.items_per_second > 0
+
+
+@pytest.fixture
+def small_windows(monkeypatch):
+    """One-chunk windows and a one-window queue, so workers block on the writer."""
+    monkeypatch.setenv("INGESTION_WINDOW_SIZE", "1")
+    monkeypatch.setenv("INGESTION_QUEUE_SIZE", "1")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+def test_process_collection_survives_a_failing_store(small_windows):
+    library = FakeLibrary({f"ITEM000{i}": make_book() for i in range(4)})
+    service = make_service(library, InMemoryStore(fail_upserts=True))
+    reports = []
+
+    run = threading.Thread(
+        target=lambda: reports.append(service.process_collection(workers=2)),
+        daemon=True,
+    )
+    run.start()
+    run.join(timeout=30)
+
+    assert not run.is_alive(), "process_collection hung on a failing writer"
+    (report,) = reports
+    assert report.results == {} and report.skipped == []
+    assert report.errors == {
+        source_id: "No chunks stored" for source_id in library.contents
+    }
+    assert report.stored_chunks == 0